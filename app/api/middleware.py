@@ -0,0 +1,213 @@
+import asyncio
+import hmac
+import logging
+import random
+import time
+from typing import Optional
+from app.utils.metrics import http_request_duration
+from app.utils.profiling import RequestProfile, write_profile
+from app.utils.timing import format_server_timing, start_request_timings
+from app.utils.tracing import start_root_span
+
+logger = logging.getLogger(__name__)
+
+# Probes and scrapes are not traced
+UNTRACED_PATHS = {"/health", "/health/live", "/health/ready", "/metrics"}
+
+# Route label for requests that matched no route (404s, probes for random
+# paths), so unknown URLs cannot create new time series
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording request latency by method, route
+    template and status code. The route template comes from the route the
+    router matched (FastAPI stores it in the scope), never the raw path.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start = time.perf_counter()
+        status_code = 500
+        
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            route_label = getattr(route, "path", None) or UNMATCHED_ROUTE
+            http_request_duration.observe(
+                time.perf_counter() - start, scope["method"], route_label, str(status_code)
+            )
+
+
+class ServerTimingMiddleware:
+    """
+    Pure ASGI middleware collecting the timed service, repository and auth
+    phases of each request and returning them in a Server-Timing header.
+    Phases that finish after the response has started (streamed bodies)
+    are not included.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start = time.perf_counter()
+        timings = start_request_timings()
+        
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                header = format_server_timing(timings, time.perf_counter() - start)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", header.encode("latin-1"))
+                ]
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
+
+
+class TracingMiddleware:
+    """
+    Pure ASGI middleware starting the server span of each sampled request,
+    continuing the trace of an incoming W3C traceparent header. The span
+    is named after the matched route template once routing is done.
+    """
+    
+    def __init__(self, app, sample_rate: float):
+        self.app = app
+        self.sample_rate = sample_rate
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in UNTRACED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        
+        traceparent = None
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+        
+        with start_root_span(scope["method"], traceparent, self.sample_rate) as span:
+            if span is None:
+                await self.app(scope, receive, send)
+                return
+            
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_error(f"HTTP {message['status']}")
+                await send(message)
+            
+            span.set_attribute("http.request.method", scope["method"])
+            span.set_attribute("url.path", scope["path"])
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    span.name = f"{scope['method']} {route}"
+                    span.set_attribute("http.route", route)
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware profiling single requests: those that send an
+    X-Profile-Token header matching the configured token, plus a random
+    sample_rate fraction of all requests. One request is profiled at a
+    time per process; others run normally meanwhile. The profile ID is
+    returned in an X-Profile-Id response header.
+    """
+    
+    def __init__(
+        self,
+        app,
+        token: str,
+        sample_rate: float,
+        interval_seconds: float,
+        trace_memory: bool,
+        output_dir: str
+    ):
+        self.app = app
+        self.token = token.encode("latin-1")
+        self.sample_rate = sample_rate
+        self.interval_seconds = interval_seconds
+        self.trace_memory = trace_memory
+        self.output_dir = output_dir
+        self._active = False
+    
+    def _trigger(self, scope) -> Optional[str]:
+        if self.token:
+            for name, value in scope["headers"]:
+                if name == b"x-profile-token":
+                    if hmac.compare_digest(value, self.token):
+                        return "header"
+                    break
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "sample"
+        return None
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._active:
+            await self.app(scope, receive, send)
+            return
+        trigger = self._trigger(scope)
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+        
+        profile = RequestProfile(self.interval_seconds, self.trace_memory)
+        status_code = 500
+        
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile.id.encode("latin-1"))
+                ]
+            await send(message)
+        
+        start = time.perf_counter()
+        profile.start()
+        self._active = True
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile.stop()
+            duration_ms = (time.perf_counter() - start) * 1000
+            metadata = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": getattr(scope.get("route"), "path", None),
+                "status": status_code,
+                "duration_ms": round(duration_ms, 3),
+                "trigger": trigger
+            }
+            # Joining the sampler and processing the tracemalloc snapshot
+            # happen on a worker thread; the next profile waits for them so
+            # it does not share tracemalloc with this one
+            try:
+                await asyncio.to_thread(write_profile, self.output_dir, profile, metadata)
+            except OSError as e:
+                logger.error(f"Writing profile {profile.id} failed: {e}")
+            finally:
+                self._active = False
@@ -1,15 +1,24 @@
 from fastapi import APIRouter, HTTPException, status
 from app.models.schemas import LoginRequest, TokenResponse, ErrorResponse
 from app.services.org_service import OrgService
+from app.utils.admission import AdmissionRejected
 from app.auth.jwt_handler import create_access_token
+from app.api.tracing import TracedRoute
 from datetime import timedelta
 
-router = APIRouter(prefix="/admin", tags=["authentication"])
+router = APIRouter(prefix="/admin", tags=["authentication"], route_class=TracedRoute)
 
 
 @router.post("/login", response_model=TokenResponse, status_code=status.HTTP_200_OK)
 async def login(request: LoginRequest):
-    admin_data = await OrgService.authenticate_admin(request.email, request.password)
+    try:
+        admin_data = await OrgService.authenticate_admin(request.email, request.password)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many login attempts in progress, please retry",
+            headers={"Retry-After": str(e.retry_after_seconds)}
+        )
     
     if not admin_data:
         raise HTTPException(
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+from app.services.health_service import HealthService
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/health", status_code=status.HTTP_200_OK)
+async def health_check():
+    return {"status": "healthy"}
+
+
+@router.get("/health/live", status_code=status.HTTP_200_OK)
+async def liveness():
+    """The process is up and serving requests; does not touch dependencies."""
+    return {"status": "alive"}
+
+
+@router.get("/health/ready", status_code=status.HTTP_200_OK)
+async def readiness():
+    """Dependencies are reachable within the latency threshold."""
+    result = await HealthService.check_readiness()
+    if result["status"] != "ready":
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=result)
+    return result
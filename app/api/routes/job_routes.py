@@ -0,0 +1,33 @@
+from fastapi import APIRouter, HTTPException, status, Depends
+from app.models.schemas import JobResponse
+from app.services.job_service import JobService
+from app.api.routes.org_routes import get_current_admin
+from app.api.tracing import TracedRoute
+
+router = APIRouter(prefix="/jobs", tags=["jobs"], route_class=TracedRoute)
+
+
+@router.get("/{job_id}", response_model=JobResponse, status_code=status.HTTP_200_OK)
+async def get_job(job_id: str, admin_payload: dict = Depends(get_current_admin)):
+    """Status and progress of a job submitted by the calling admin."""
+    try:
+        job = await JobService.get_job(job_id, admin_payload.get("admin_id"))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    
+    return JobResponse(
+        job_id=job["_id"],
+        type=job["type"],
+        status=job["status"],
+        organization_name=job["organization_name"],
+        attempts=job["attempts"],
+        progress=job.get("progress") or {},
+        result=job.get("result"),
+        error=job.get("error"),
+        created_at=job["created_at"],
+        updated_at=job["updated_at"],
+        completed_at=job.get("completed_at")
+    )
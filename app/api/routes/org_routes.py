@@ -1,17 +1,24 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Header
+import hmac
+from fastapi import APIRouter, HTTPException, status, Depends, Header, Query, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import Optional
 from app.models.schemas import (
     OrgCreateRequest, OrgCreateResponse,
+    OrgBulkCreateRequest, OrgBulkCreateResponse, OrgBulkCreateResult,
     OrgGetRequest, OrgGetResponse,
     OrgUpdateRequest, OrgUpdateResponse,
     OrgDeleteRequest, OrgDeleteResponse,
-    OrgMetadata, AdminInfo, ErrorResponse
+    OrgListItem, OrgListResponse,
+    OrgMetadata, AdminInfo, ErrorResponse, JobAcceptedResponse
 )
 from app.services.org_service import OrgService
+from app.services.job_service import JobService, JobConflict
 from app.auth.jwt_handler import verify_token
 from app.repositories.master_repo import MasterRepository
+from app.core.config import settings
+from app.api.tracing import TracedRoute
 
-router = APIRouter(prefix="/org", tags=["organizations"])
+router = APIRouter(prefix="/org", tags=["organizations"], route_class=TracedRoute)
 
 
 async def get_current_admin(authorization: Optional[str] = Header(None)):
@@ -44,7 +51,27 @@ async def get_current_admin(authorization: Optional[str] = Header(None)):
     return payload
 
 
-def verify_org_access(organization_name: str, admin_payload: dict):
+async def require_operator(x_operator_token: Optional[str] = Header(None)):
+    if not settings.operator_token:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Operator endpoints are disabled"
+        )
+    
+    if not x_operator_token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="X-Operator-Token header missing"
+        )
+    
+    if not hmac.compare_digest(x_operator_token.encode("utf-8"), settings.operator_token.encode("utf-8")):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid operator token"
+        )
+
+
+async def verify_org_access(organization_name: str, admin_payload: dict):
     admin_org = admin_payload.get("organization_name", "").lower()
     requested_org = organization_name.lower()
     
@@ -54,6 +81,15 @@ def verify_org_access(organization_name: str, admin_payload: dict):
             detail="You do not have permission to access this organization"
         )
     
+    # Tokens issued to the admin of a deleted organization must not work
+    # on a new organization that reuses its name
+    org = await MasterRepository.find_organization_by_name_cached(organization_name)
+    if org and org["admin"]["admin_id"] != admin_payload.get("admin_id"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to access this organization"
+        )
+    
     return admin_payload
 
 
@@ -92,6 +128,63 @@ async def create_organization(request: OrgCreateRequest):
         )
 
 
+@router.post("/bulk-create", response_model=OrgBulkCreateResponse, status_code=status.HTTP_201_CREATED)
+async def bulk_create_organizations(request: OrgBulkCreateRequest, response: Response):
+    """
+    Create many organizations in one request. Items succeed or fail
+    independently; the response is 201 if all were created and 207 with
+    per-item errors otherwise.
+    """
+    try:
+        results = await OrgService.bulk_create_organizations(
+            [item.model_dump() for item in request.organizations]
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create organizations: {str(e)}"
+        )
+    
+    items = []
+    for result in results:
+        org_metadata = None
+        if result["status"] == "created":
+            org_data = result["organization"]
+            org_metadata = OrgMetadata(
+                organization_name=org_data["organization_name"],
+                collection_name=org_data["collection_name"],
+                admin=AdminInfo(
+                    admin_id=org_data["admin"]["admin_id"],
+                    email=org_data["admin"]["email"]
+                ),
+                created_at=org_data["created_at"]
+            )
+        items.append(OrgBulkCreateResult(
+            index=result["index"],
+            organization_name=result["organization_name"],
+            status=result["status"],
+            organization=org_metadata,
+            error=result.get("error")
+        ))
+    
+    created = sum(1 for item in items if item.status == "created")
+    failed = len(items) - created
+    if failed:
+        response.status_code = status.HTTP_207_MULTI_STATUS
+    
+    return OrgBulkCreateResponse(
+        message=f"{created} organization(s) created, {failed} failed",
+        created=created,
+        failed=failed,
+        results=items
+    )
+
+
 @router.get("/get", response_model=OrgGetResponse, status_code=status.HTTP_200_OK)
 async def get_organization(organization_name: str):
     try:
@@ -120,13 +213,89 @@ async def get_organization(organization_name: str):
         )
 
 
-@router.put("/update", response_model=OrgUpdateResponse, status_code=status.HTTP_200_OK)
+@router.get(
+    "/list",
+    response_model=OrgListResponse,
+    response_model_exclude_none=True,
+    status_code=status.HTTP_200_OK
+)
+async def list_organizations(
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.org_list_default_page_size, ge=1, le=settings.org_list_max_page_size),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    _: None = Depends(require_operator)
+):
+    """
+    Walk organizations in name order with keyset pagination. Pass the
+    returned next_cursor to get the following page; it is omitted on the
+    last page. format=ndjson streams every organization after cursor, one
+    JSON object per line, ignoring limit. Operators only, since every
+    tenant's admin is listed.
+    """
+    field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    try:
+        if format == "ndjson":
+            orgs = OrgService.stream_organizations(cursor, field_list)
+            
+            async def ndjson_lines():
+                async for org in orgs:
+                    yield OrgListItem(**org).model_dump_json(exclude_none=True) + "\n"
+            
+            return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+        
+        page = await OrgService.list_organizations(cursor, limit, field_list)
+        return OrgListResponse(
+            organizations=[OrgListItem(**org) for org in page["organizations"]],
+            next_cursor=page["next_cursor"]
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to list organizations: {str(e)}"
+        )
+
+
+def _job_accepted(job: dict, message: str) -> JSONResponse:
+    """202 response pointing at the job that will do the work."""
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=JobAcceptedResponse(
+            message=message,
+            job_id=job["_id"],
+            status_url=f"/jobs/{job['_id']}"
+        ).model_dump()
+    )
+
+
+@router.put(
+    "/update",
+    response_model=OrgUpdateResponse,
+    status_code=status.HTTP_200_OK,
+    responses={202: {"model": JobAcceptedResponse}}
+)
 async def update_organization(
     request: OrgUpdateRequest,
     admin_payload: dict = Depends(get_current_admin)
 ):
     try:
-        verify_org_access(request.organization_name, admin_payload)
+        await verify_org_access(request.organization_name, admin_payload)
+        
+        # Renames can move a whole tenant collection; run them as a job
+        if settings.jobs_async_enabled and request.new_organization_name:
+            job = await JobService.submit_update_organization(
+                request.organization_name,
+                admin_payload.get("admin_id"),
+                request.new_organization_name,
+                request.email,
+                request.password
+            )
+            return _job_accepted(job, "Organization update accepted")
         
         org_data = await OrgService.update_organization(
             request.organization_name,
@@ -149,6 +318,11 @@ async def update_organization(
             message="Organization updated successfully",
             organization=org_metadata
         )
+    except JobConflict as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -163,13 +337,25 @@ async def update_organization(
         )
 
 
-@router.delete("/delete", response_model=OrgDeleteResponse, status_code=status.HTTP_200_OK)
+@router.delete(
+    "/delete",
+    response_model=OrgDeleteResponse,
+    status_code=status.HTTP_200_OK,
+    responses={202: {"model": JobAcceptedResponse}}
+)
 async def delete_organization(
     request: OrgDeleteRequest,
     admin_payload: dict = Depends(get_current_admin)
 ):
     try:
-        verify_org_access(request.organization_name, admin_payload)
+        await verify_org_access(request.organization_name, admin_payload)
+        
+        if settings.jobs_async_enabled:
+            job = await JobService.submit_delete_organization(
+                request.organization_name,
+                admin_payload.get("admin_id")
+            )
+            return _job_accepted(job, "Organization delete accepted")
         
         deleted = await OrgService.delete_organization(request.organization_name)
         
@@ -182,6 +368,11 @@ async def delete_organization(
         return OrgDeleteResponse(
             message=f"Organization '{request.organization_name}' deleted successfully"
         )
+    except JobConflict as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
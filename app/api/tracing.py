@@ -0,0 +1,24 @@
+from typing import Callable
+from fastapi.routing import APIRoute
+from app.utils.tracing import current_span, start_span
+
+
+class TracedRoute(APIRoute):
+    """
+    Route class wrapping each handler (request parsing, dependencies, the
+    endpoint and response serialization) in a span when the request is
+    sampled. Routers opt in with APIRouter(route_class=TracedRoute).
+    """
+    
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        span_name = f"route {self.endpoint.__name__}"
+        
+        async def traced_handler(request):
+            if current_span() is None:
+                return await handler(request)
+            with start_span(span_name) as span:
+                span.set_attribute("http.route", self.path)
+                return await handler(request)
+        
+        return traced_handler
@@ -1,7 +1,16 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
 from typing import Optional, Dict
 from jose import JWTError, jwt
 from app.core.config import settings
+from app.utils.cache import TTLCache, MISSING
+from app.utils.metrics import jwt_verify_duration
+from app.utils.timing import timed
+
+# Verified claims keyed by a SHA-256 digest of the token, so raw tokens are
+# never held in memory. Each entry expires at the token's exp at the latest.
+token_cache = TTLCache(settings.jwt_cache_max_size, settings.jwt_cache_ttl_seconds)
 
 
 def create_access_token(data: Dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -18,11 +27,38 @@ def create_access_token(data: Dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def verify_token(token: str) -> Optional[Dict]:
-    """Verify and decode a JWT token."""
+def decode_token(token: str) -> Optional[Dict]:
+    """Verify and decode a JWT token without consulting the cache."""
     try:
-        payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+        payload = jwt.decode(
+            token,
+            settings.jwt_secret_key,
+            algorithms=[settings.jwt_algorithm],
+            options={"leeway": settings.jwt_leeway_seconds}
+        )
         return payload
     except JWTError:
         return None
 
+
+@timed("verify_token")
+def verify_token(token: str) -> Optional[Dict]:
+    """Verify and decode a JWT token, reusing earlier verifications of the same token."""
+    start = time.perf_counter()
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    cached = token_cache.get(key)
+    if cached is not MISSING:
+        jwt_verify_duration.observe(time.perf_counter() - start, "hit")
+        return dict(cached)
+    
+    payload = decode_token(token)
+    jwt_verify_duration.observe(time.perf_counter() - start, "miss")
+    if payload is None:
+        return None
+    
+    # Never serve a cached token past its own expiry; jose applies the
+    # leeway itself once the entry has expired and the token is re-verified
+    exp = payload.get("exp")
+    ttl_seconds = float(exp) - time.time() if exp is not None else None
+    token_cache.set(key, dict(payload), ttl_seconds=ttl_seconds)
+    return payload
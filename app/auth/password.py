@@ -1,4 +1,36 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 import bcrypt
+from app.core.config import settings
+from app.utils.metrics import Timer, password_hash_duration
+from app.utils.timing import timed
+
+# bcrypt releases the GIL while hashing, so a thread pool sized to the core
+# count runs hashes in parallel without blocking the event loop.
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def password_hash_workers() -> int:
+    """Number of threads used for password hashing."""
+    return settings.password_hash_workers or os.cpu_count() or 1
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get or create the password hashing executor."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=password_hash_workers(), thread_name_prefix="bcrypt")
+    return _executor
+
+
+def shutdown_password_executor():
+    """Shut down the password hashing executor."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
 
 
 def hash_password(password: str) -> str:
@@ -6,8 +38,9 @@ def hash_password(password: str) -> str:
     password_bytes = password.encode('utf-8')
     if len(password_bytes) > 72:
         password_bytes = password_bytes[:72]
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password_bytes, salt)
+    with Timer(password_hash_duration, "hash"):
+        salt = bcrypt.gensalt()
+        hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
 
@@ -18,7 +51,21 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         if len(password_bytes) > 72:
             password_bytes = password_bytes[:72]
         hashed_bytes = hashed_password.encode('utf-8')
-        return bcrypt.checkpw(password_bytes, hashed_bytes)
+        with Timer(password_hash_duration, "verify"):
+            return bcrypt.checkpw(password_bytes, hashed_bytes)
     except Exception:
         return False
 
+
+@timed("hash_password")
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the password executor instead of the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), hash_password, password)
+
+
+@timed("verify_password")
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password executor instead of the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), verify_password, plain_password, hashed_password)
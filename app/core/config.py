@@ -8,11 +8,138 @@ class Settings(BaseSettings):
     # MongoDB settings
     mongodb_url: str = "mongodb://localhost:27017"
     mongodb_db_name: str = "org_master"
+    # "motor" or "pymongo" (PyMongo's native asyncio AsyncMongoClient)
+    mongodb_driver: str = "motor"
+    
+    # MongoDB connection pool (None = driver default)
+    mongodb_min_pool_size: int = 0
+    mongodb_max_pool_size: int = 100
+    mongodb_max_idle_time_ms: Optional[int] = None
+    mongodb_wait_queue_timeout_ms: Optional[int] = None
+    mongodb_server_selection_timeout_ms: int = 30000
+    # Comma-separated wire compressors in order of preference, e.g. "zstd,snappy,zlib"
+    # (zstd needs the zstandard package, snappy needs python-snappy)
+    mongodb_compressors: str = ""
+    # Group multi-document writes in transactions where the deployment
+    # supports them (replica sets, sharded clusters)
+    mongodb_transactions_enabled: bool = True
     
     # JWT settings
     jwt_secret_key: str = "your-secret-key-change-in-production"
     jwt_algorithm: str = "HS256"
     jwt_expiration_hours: int = 24
+    # Clock skew tolerated when checking exp
+    jwt_leeway_seconds: int = 0
+    # Cache of verified token claims (max_size 0 disables it)
+    jwt_cache_max_size: int = 10000
+    jwt_cache_ttl_seconds: float = 300.0
+    
+    # Threads for bcrypt hashing/verification (0 = one per CPU core)
+    password_hash_workers: int = 0
+    
+    # Admission control for password checks on /admin/login
+    # (max concurrency 0 = one per password hash worker)
+    login_max_concurrency: int = 0
+    login_max_queue: int = 64
+    login_queue_timeout_seconds: float = 2.0
+    login_retry_after_seconds: int = 1
+    
+    # Organization metadata cache (per process; other workers may serve
+    # stale data for up to the TTL after a write). max_size 0 disables it.
+    org_cache_max_size: int = 10000
+    org_cache_ttl_seconds: float = 30.0
+    # Names with no organization are cached only this long, since an
+    # organization created through another worker cannot invalidate the
+    # miss here (0 stops caching misses)
+    org_cache_negative_ttl_seconds: float = 2.0
+    
+    # Documents per batch when tenant data is copied through the API process
+    migration_batch_size: int = 1000
+    
+    # /org/list returns every tenant, so it takes an operator credential
+    # (X-Operator-Token equal to operator_token), not a tenant admin's
+    # token; empty disables the endpoint
+    operator_token: str = ""
+    
+    # /org/list page sizes
+    org_list_default_page_size: int = 100
+    org_list_max_page_size: int = 500
+    
+    # /org/bulk-create limits
+    org_bulk_create_max_items: int = 500
+    org_bulk_create_concurrency: int = 16
+    
+    # Tenant collection naming for new organizations: "name" derives the
+    # collection from the organization name, "id" keys it by an immutable
+    # tenant ID so renames only touch master metadata
+    tenant_collection_naming: str = "name"
+    
+    # Pre-created tenant collections; 0 disables the pool
+    tenant_pool_size: int = 0
+    tenant_pool_refill_interval_seconds: float = 5.0
+    
+    # Background jobs: with jobs_async_enabled, renames and deletes return
+    # 202 and run on a worker; job_workers run inside each API process
+    # when jobs are enabled (0 leaves them to `manage.py worker`)
+    jobs_async_enabled: bool = False
+    job_workers: int = 1
+    job_lease_seconds: float = 60.0
+    job_poll_interval_seconds: float = 1.0
+    job_max_attempts: int = 3
+    
+    # Soft delete: deleted organizations can be undeleted for
+    # org_delete_retention_seconds, then the reclaimer drops their
+    # collections, at most org_reclaim_batch_size per interval
+    org_delete_retention_seconds: float = 0.0
+    org_reclaimer_enabled: bool = True
+    org_reclaim_interval_seconds: float = 30.0
+    org_reclaim_batch_size: int = 10
+    org_reclaim_pause_seconds: float = 1.0
+    
+    # Prometheus metrics at /metrics (per worker process)
+    metrics_enabled: bool = True
+    
+    # Return per-phase service/repository/bcrypt/JWT timings in a
+    # Server-Timing response header (exposes internals; off by default)
+    server_timing_enabled: bool = False
+    
+    # Slow-query log: MongoDB commands slower than the threshold (0 disables
+    # it) are recorded with their redacted query shape and calling repository
+    # method, to slow_query_log_path (JSONL) if set, else to the capped
+    # slow_queries collection. Each shape is explained at most once per interval.
+    slow_query_threshold_ms: float = 0.0
+    slow_query_log_path: str = ""
+    slow_query_collection_size_bytes: int = 16 * 1024 * 1024
+    slow_query_explain_enabled: bool = True
+    slow_query_explain_interval_seconds: float = 300.0
+    
+    # Tracing: spans for routes, OrgService and repository calls, continuing
+    # incoming W3C traceparent headers. Requests without one are sampled at
+    # tracing_sample_rate; spans are exported in OTLP JSON batches, one
+    # request per line, to tracing_export_path
+    tracing_enabled: bool = False
+    tracing_sample_rate: float = 0.01
+    tracing_export_path: str = "traces.otlp.jsonl"
+    tracing_export_batch_size: int = 512
+    tracing_export_interval_seconds: float = 5.0
+    tracing_max_queue_size: int = 2048
+    
+    # Per-request profiling (the middleware is only installed when enabled):
+    # requests sending X-Profile-Token equal to profiling_token, plus a
+    # profiling_sample_rate fraction of all requests, are sampled every
+    # profiling_interval_ms. Collapsed stacks and a JSON summary go to
+    # profiling_output_dir; list them with `manage.py profiles`.
+    profiling_enabled: bool = False
+    profiling_token: str = ""
+    profiling_sample_rate: float = 0.0
+    profiling_interval_ms: float = 5.0
+    profiling_tracemalloc: bool = False
+    profiling_output_dir: str = "profiles"
+    
+    # Readiness probe (/health/ready)
+    readiness_timeout_seconds: float = 2.0
+    readiness_latency_threshold_ms: float = 500.0
+    readiness_cache_seconds: float = 2.0
     
     # Application settings
     app_name: str = "Organization Management Service"
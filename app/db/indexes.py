@@ -0,0 +1,159 @@
+import logging
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
+from app.db.mongo import get_master_database
+
+logger = logging.getLogger(__name__)
+
+
+# Records written before organization_key existed have no key until
+# `manage.py backfill-org-keys` runs, so the unique constraint only
+# covers documents that carry the field.
+_HAS_ORGANIZATION_KEY = {"organization_key": {"$exists": True}}
+
+# Declarative index registry for the master database: collection -> indexes.
+MASTER_INDEXES: Dict[str, List[IndexModel]] = {
+    "organizations": [
+        IndexModel(
+            [("organization_key", ASCENDING)],
+            name="organization_key_unique",
+            unique=True,
+            partialFilterExpression=_HAS_ORGANIZATION_KEY
+        ),
+        # Only tombstones carry purge_after
+        IndexModel(
+            [("purge_after", ASCENDING)],
+            name="purge_after",
+            partialFilterExpression={"purge_after": {"$exists": True}}
+        ),
+    ],
+    "admins": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel(
+            [("organization_key", ASCENDING)],
+            name="organization_key_unique",
+            unique=True,
+            partialFilterExpression=_HAS_ORGANIZATION_KEY
+        ),
+    ],
+    "jobs": [
+        IndexModel([("status", ASCENDING), ("created_at", ASCENDING)], name="status_created_at"),
+        IndexModel([("status", ASCENDING), ("lease_expires_at", ASCENDING)], name="status_lease_expires_at"),
+        # At most one queued or running job per organization
+        IndexModel(
+            [("active_key", ASCENDING)],
+            name="active_key_unique",
+            unique=True,
+            partialFilterExpression={"active_key": {"$exists": True}}
+        ),
+    ],
+    "collection_pool": [
+        IndexModel([("created_at", ASCENDING)], name="created_at"),
+    ],
+}
+
+
+# Indexes every tenant collection is created with, whether inline or ahead
+# of time by the collection pool. Add tenant data access patterns here.
+TENANT_INDEXES: List[IndexModel] = []
+
+
+class QueryShape(NamedTuple):
+    """A repository query, with sample values, whose plan must use an index."""
+    name: str
+    collection: str
+    filter: Dict
+    sort: Optional[Dict] = None
+
+
+# Every filter the master DB repositories send on the request path. Maintenance scans
+# such as backfill_organization_keys are intentionally not listed.
+QUERY_SHAPES: List[QueryShape] = [
+    QueryShape("find_organization_by_name", "organizations", {"organization_key": "sample"}),
+    QueryShape("find_admin_by_email", "admins", {"email": "admin@example.com"}),
+    QueryShape("find_admin_by_org", "admins", {"organization_key": "sample"}),
+    QueryShape("update_admin", "admins", {"_id": ObjectId()}),
+    QueryShape(
+        "list_organizations_page",
+        "organizations",
+        {"organization_key": {"$gt": "sample"}},
+        sort={"organization_key": 1}
+    ),
+    QueryShape("claim_pooled_collection", "collection_pool", {}, sort={"created_at": 1}),
+    QueryShape(
+        "claim_job",
+        "jobs",
+        {"$or": [
+            {"status": "queued"},
+            {"status": "running", "lease_expires_at": {"$lt": datetime(2000, 1, 1)}}
+        ]},
+        sort={"created_at": 1}
+    ),
+]
+
+
+async def ensure_master_indexes() -> None:
+    """
+    Create every index in MASTER_INDEXES. create_indexes is a no-op for
+    indexes that already exist with the same definition, so this is safe
+    to call on every boot. Failures are logged rather than raised so a
+    conflicting legacy index does not keep the service from starting.
+    """
+    db = await get_master_database()
+    for collection_name, indexes in MASTER_INDEXES.items():
+        try:
+            created = await db[collection_name].create_indexes(indexes)
+            logger.info(f"Indexes ensured on {collection_name}: {', '.join(created)}")
+        except Exception as e:
+            logger.error(f"Failed to ensure indexes on {collection_name}: {e}")
+
+
+async def missing_master_indexes() -> List[str]:
+    """Return "collection.index" for every registered index not present on the server."""
+    db = await get_master_database()
+    missing = []
+    for collection_name, indexes in MASTER_INDEXES.items():
+        existing = await db[collection_name].index_information()
+        for index in indexes:
+            name = index.document["name"]
+            if name not in existing:
+                missing.append(f"{collection_name}.{name}")
+    return missing
+
+
+def plan_stages(plan: Dict) -> List[str]:
+    """Collect every stage name in an explain plan tree."""
+    stages = []
+    if "stage" in plan:
+        stages.append(plan["stage"])
+    for key in ("inputStage", "queryPlan"):
+        if isinstance(plan.get(key), dict):
+            stages.extend(plan_stages(plan[key]))
+    for child in plan.get("inputStages", []):
+        stages.extend(plan_stages(child))
+    return stages
+
+
+async def explain_query_shapes() -> List[Dict]:
+    """
+    Run explain on every registered query shape.
+    Returns one result per shape with the winning plan's stages and
+    whether it falls back to a collection scan.
+    """
+    db = await get_master_database()
+    results = []
+    for shape in QUERY_SHAPES:
+        find = {"find": shape.collection, "filter": shape.filter, "limit": 1}
+        if shape.sort:
+            find["sort"] = shape.sort
+        explain = await db.command({"explain": find, "verbosity": "queryPlanner"})
+        stages = plan_stages(explain["queryPlanner"]["winningPlan"])
+        results.append({
+            "name": shape.name,
+            "collection": shape.collection,
+            "stages": stages,
+            "collscan": "COLLSCAN" in stages
+        })
+    return results
@@ -1,21 +1,94 @@
+import asyncio
+import inspect
+import logging
+import time
+from contextlib import asynccontextmanager
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from typing import Optional
+from pymongo import AsyncMongoClient
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import OperationFailure
+from pymongo.monitoring import CommandListener, ConnectionPoolListener
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+# settings.mongodb_driver selects Motor ("motor") or PyMongo's native
+# asyncio client ("pymongo"); both expose the same collection API apart
+# from the differences smoothed over by resolve_cursor.
+MongoClient = Union[AsyncIOMotorClient, AsyncMongoClient]
+MongoDatabase = Union[AsyncIOMotorDatabase, AsyncDatabase]
+
 # Singleton MongoDB client
-_client: Optional[AsyncIOMotorClient] = None
-_database: Optional[AsyncIOMotorDatabase] = None
+_client: Optional[MongoClient] = None
+_database: Optional[MongoDatabase] = None
+_transactions_supported: Optional[bool] = None
+
+# Command and connection pool listeners handed to the client when it is created
+EventListener = Union[CommandListener, ConnectionPoolListener]
+_event_listeners: List[EventListener] = []
+
+
+def register_event_listener(listener: EventListener) -> None:
+    """
+    Attach a pymongo CommandListener or ConnectionPoolListener to the
+    MongoDB client. Listeners are passed to the client when it is created,
+    so register them before the first database call (or after
+    close_mongo_connection).
+    """
+    if listener not in _event_listeners:
+        _event_listeners.append(listener)
+
 
+def unregister_event_listener(listener: EventListener) -> None:
+    """Detach a listener from clients created from now on."""
+    if listener in _event_listeners:
+        _event_listeners.remove(listener)
 
-async def get_mongo_client() -> AsyncIOMotorClient:
+
+def get_client_options() -> Dict[str, Any]:
+    """Build MongoDB client options from settings."""
+    options: Dict[str, Any] = {
+        "minPoolSize": settings.mongodb_min_pool_size,
+        "maxPoolSize": settings.mongodb_max_pool_size,
+        "serverSelectionTimeoutMS": settings.mongodb_server_selection_timeout_ms,
+    }
+    if settings.mongodb_max_idle_time_ms is not None:
+        options["maxIdleTimeMS"] = settings.mongodb_max_idle_time_ms
+    if settings.mongodb_wait_queue_timeout_ms is not None:
+        options["waitQueueTimeoutMS"] = settings.mongodb_wait_queue_timeout_ms
+    if settings.mongodb_compressors:
+        options["compressors"] = settings.mongodb_compressors
+    if _event_listeners:
+        options["event_listeners"] = list(_event_listeners)
+    return options
+
+
+async def get_mongo_client() -> MongoClient:
     """Get or create MongoDB client singleton."""
     global _client
     if _client is None:
-        _client = AsyncIOMotorClient(settings.mongodb_url)
+        if settings.mongodb_driver == "pymongo":
+            _client = AsyncMongoClient(settings.mongodb_url, **get_client_options())
+        elif settings.mongodb_driver == "motor":
+            _client = AsyncIOMotorClient(settings.mongodb_url, **get_client_options())
+        else:
+            raise ValueError(f"Unknown MongoDB driver: {settings.mongodb_driver}")
     return _client
 
 
-async def get_master_database() -> AsyncIOMotorDatabase:
+async def resolve_cursor(cursor_or_awaitable: Any) -> Any:
+    """
+    Return the cursor or change stream produced by aggregate(), watch() or
+    list_indexes(). Motor returns these directly while the native async
+    driver returns a coroutine that resolves to them.
+    """
+    if inspect.isawaitable(cursor_or_awaitable):
+        return await cursor_or_awaitable
+    return cursor_or_awaitable
+
+
+async def get_master_database() -> MongoDatabase:
     """Get master database instance."""
     global _database
     if _database is None:
@@ -24,17 +97,87 @@ async def get_master_database() -> AsyncIOMotorDatabase:
     return _database
 
 
-async def get_org_database(org_collection_name: str) -> AsyncIOMotorDatabase:
+async def get_org_database(org_collection_name: str) -> MongoDatabase:
     """Get organization-specific database (uses same DB, different collection)."""
     client = await get_mongo_client()
     return client[settings.mongodb_db_name]
 
 
+async def transactions_supported() -> bool:
+    """
+    Whether multi-document transactions can be used: replica sets and
+    sharded clusters support them, standalone servers do not. Checked
+    once per client; settings.mongodb_transactions_enabled turns them off.
+    """
+    global _transactions_supported
+    if not settings.mongodb_transactions_enabled:
+        return False
+    if _transactions_supported is None:
+        client = await get_mongo_client()
+        try:
+            hello = await client.admin.command("hello")
+        except OperationFailure as e:
+            logger.warning(f"Cannot detect transaction support, not using transactions: {e}")
+            hello = {}
+        _transactions_supported = bool(hello.get("setName")) or hello.get("msg") == "isdbgrid"
+    return _transactions_supported
+
+
+@asynccontextmanager
+async def start_transaction() -> AsyncIterator[Optional[Any]]:
+    """
+    Run the block in one session and multi-document transaction when the
+    deployment supports it, committing on success and aborting on error.
+    Yields the session to pass to each operation, or None when transactions
+    are unavailable, in which case the operations apply one by one.
+    """
+    if not await transactions_supported():
+        yield None
+        return
+    
+    client = await get_mongo_client()
+    # Motor's start_session and the native driver's start_transaction are coroutines
+    session = client.start_session()
+    if inspect.isawaitable(session):
+        session = await session
+    async with session:
+        transaction = session.start_transaction()
+        if inspect.isawaitable(transaction):
+            transaction = await transaction
+        async with transaction:
+            yield session
+
+
+async def connect_mongo() -> bool:
+    """
+    Connect to MongoDB and open minPoolSize connections up front, so the
+    first requests do not pay for DNS/SRV resolution, TLS and auth.
+    Concurrent pings each check out their own connection, which fills the
+    pool. Returns False (and logs) if the server is unreachable.
+    """
+    client = await get_mongo_client()
+    start = time.perf_counter()
+    try:
+        await client.admin.command("ping")
+        connections = max(settings.mongodb_min_pool_size, 1)
+        await asyncio.gather(*(client.admin.command("ping") for _ in range(connections)))
+    except Exception as e:
+        logger.error(f"MongoDB warm-up failed: {e}")
+        return False
+    
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    logger.info(f"MongoDB connected; warmed {connections} connection(s) in {elapsed_ms:.0f} ms")
+    return True
+
+
 async def close_mongo_connection():
     """Close MongoDB connection."""
-    global _client, _database
+    global _client, _database, _transactions_supported
     if _client:
-        _client.close()
+        # Motor's close() is synchronous, AsyncMongoClient's is a coroutine
+        result = _client.close()
+        if inspect.isawaitable(result):
+            await result
         _client = None
         _database = None
-
+        _transactions_supported = None
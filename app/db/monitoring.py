@@ -0,0 +1,237 @@
+import re
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Optional, Tuple
+from bson.regex import Regex
+from pymongo.monitoring import CommandListener, ConnectionPoolListener
+from app.core.config import settings
+from app.utils.metrics import (
+    mongodb_command_duration,
+    mongodb_command_failures,
+    mongodb_pool_checkout_duration,
+    mongodb_pool_checkout_failures
+)
+from app.utils.timing import current_operation
+
+# Tenant collections are reported under one label so per-tenant names do
+# not turn every tenant into its own time series
+TENANT_COLLECTION_LABEL = "<tenant>"
+
+# Collections of the master database, reported under their own names
+_MASTER_COLLECTIONS = {"organizations", "admins", "jobs", "collection_pool", "slow_queries"}
+
+
+def collection_label(collection: str) -> str:
+    """Metric label for a collection name."""
+    if not collection or collection in _MASTER_COLLECTIONS:
+        return collection
+    return TENANT_COLLECTION_LABEL
+
+
+def _command_collection(command_name: str, command: Dict) -> str:
+    """The collection a command targets, or "" for database/admin commands."""
+    if command_name == "getMore":
+        target = command.get("collection")
+    else:
+        target = command.get(command_name)
+    return target if isinstance(target, str) else ""
+
+
+class MetricsCommandListener(CommandListener):
+    """
+    Records the latency of every MongoDB command by command and collection.
+    Started events are matched to their outcome by request and connection
+    id; the driver calls listeners from whichever thread runs the command.
+    """
+    
+    def __init__(self):
+        self._pending: Dict[Tuple, Tuple[str, str]] = {}
+        self._lock = threading.Lock()
+    
+    def started(self, event):
+        labels = (event.command_name, collection_label(_command_collection(event.command_name, event.command)))
+        with self._lock:
+            self._pending[(event.request_id, event.connection_id)] = labels
+    
+    def _finish(self, event) -> Tuple[str, str]:
+        with self._lock:
+            labels = self._pending.pop((event.request_id, event.connection_id), None)
+        if labels is None:
+            labels = (event.command_name, "")
+        mongodb_command_duration.observe(event.duration_micros / 1_000_000, *labels)
+        return labels
+    
+    def succeeded(self, event):
+        self._finish(event)
+    
+    def failed(self, event):
+        mongodb_command_failures.inc(*self._finish(event))
+
+
+class MetricsPoolListener(ConnectionPoolListener):
+    """Records how long operations wait to check a connection out of the pool."""
+    
+    def connection_checked_out(self, event):
+        duration = getattr(event, "duration", None)
+        if duration is not None:
+            mongodb_pool_checkout_duration.observe(duration)
+    
+    def connection_check_out_failed(self, event):
+        mongodb_pool_checkout_failures.inc(str(event.reason))
+        duration = getattr(event, "duration", None)
+        if duration is not None:
+            mongodb_pool_checkout_duration.observe(duration)
+    
+    def pool_created(self, event):
+        pass
+    
+    def pool_ready(self, event):
+        pass
+    
+    def pool_cleared(self, event):
+        pass
+    
+    def pool_closed(self, event):
+        pass
+    
+    def connection_created(self, event):
+        pass
+    
+    def connection_ready(self, event):
+        pass
+    
+    def connection_closed(self, event):
+        pass
+    
+    def connection_check_out_started(self, event):
+        pass
+    
+    def connection_checked_in(self, event):
+        pass
+
+
+# Fields describing the query of each command the slow-query log can
+# explain; the ones in _VERBATIM_FIELDS carry no user data and are kept as is
+EXPLAINABLE_FIELDS = {
+    "find": ("filter", "sort", "projection", "hint", "limit", "skip", "collation"),
+    "aggregate": ("pipeline", "hint", "collation"),
+    "count": ("query", "hint", "limit", "skip", "collation"),
+    "distinct": ("key", "query", "collation"),
+    "findAndModify": ("query", "sort", "fields", "update", "remove", "new", "upsert", "hint", "collation"),
+    "update": ("updates",),
+    "delete": ("deletes",),
+}
+_VERBATIM_FIELDS = {"sort", "projection", "fields", "hint", "key", "remove", "new", "upsert"}
+
+# Commands never recorded: handshakes, the explain calls the slow-query
+# log issues itself, and cursor/session housekeeping
+_IGNORED_COMMANDS = {"hello", "isMaster", "ismaster", "ping", "explain", "endSessions", "killCursors"}
+
+SLOW_QUERY_COLLECTION = "slow_queries"
+
+
+def redact(value: Any) -> Any:
+    """
+    Replace every value in a filter or pipeline with "?", keeping field
+    names and operators. Lists keep one entry per distinct shape, so a
+    large $in collapses to ["?"]. Regexes become {"$regex": "?"}.
+    """
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        shapes = []
+        for item in value:
+            shape = redact(item)
+            if shape not in shapes:
+                shapes.append(shape)
+        return shapes
+    if isinstance(value, (re.Pattern, Regex)):
+        return {"$regex": "?"}
+    return "?"
+
+
+def query_shape(command_name: str, command: Dict) -> Dict:
+    """The redacted query fields of an explainable command ({} for others)."""
+    shape = {}
+    for field in EXPLAINABLE_FIELDS.get(command_name, ()):
+        if field in command:
+            shape[field] = command[field] if field in _VERBATIM_FIELDS else redact(command[field])
+    return shape
+
+
+def explain_command(command_name: str, command: Dict) -> Optional[Dict]:
+    """
+    The command to pass to explain, without session, transaction and
+    cluster-time fields. None for commands that cannot be explained, and
+    for pipelines that write ($out/$merge).
+    """
+    fields = EXPLAINABLE_FIELDS.get(command_name)
+    if fields is None:
+        return None
+    explain = {command_name: command[command_name]}
+    for field in fields:
+        if field in command:
+            explain[field] = command[field]
+    if command_name == "aggregate":
+        if any("$out" in stage or "$merge" in stage for stage in explain.get("pipeline", [])):
+            return None
+        explain["cursor"] = {}
+    return explain
+
+
+class SlowQueryListener(CommandListener):
+    """
+    Queues a record for every command slower than slow_query_threshold_ms,
+    with its redacted query shape and the timed repository method that
+    issued it. Writing the records (and explaining them) is left to
+    SlowQueryService, so the driver threads only append to a bounded deque;
+    when it is full the oldest records are dropped.
+    """
+    
+    def __init__(self, max_pending: int = 1000):
+        self.records: Deque[Dict] = deque(maxlen=max_pending)
+        self._started: Dict[Tuple, Tuple[Dict, Optional[str]]] = {}
+        self._lock = threading.Lock()
+    
+    def started(self, event):
+        if event.command_name in _IGNORED_COMMANDS:
+            return
+        if _command_collection(event.command_name, event.command) == SLOW_QUERY_COLLECTION:
+            return
+        with self._lock:
+            self._started[(event.request_id, event.connection_id)] = (event.command, current_operation())
+    
+    def _finish(self, event, failure: Optional[str] = None) -> None:
+        with self._lock:
+            started = self._started.pop((event.request_id, event.connection_id), None)
+        if started is None:
+            return
+        duration_ms = event.duration_micros / 1000
+        if duration_ms < settings.slow_query_threshold_ms:
+            return
+        
+        command, operation = started
+        self.records.append({
+            "ts": datetime.utcnow(),
+            "database": event.database_name,
+            "collection": _command_collection(event.command_name, command),
+            "command": event.command_name,
+            "operation": operation,
+            "duration_ms": round(duration_ms, 3),
+            "shape": query_shape(event.command_name, command),
+            "error": failure,
+            # Dropped before the record is written
+            "_explain": explain_command(event.command_name, command)
+        })
+    
+    def succeeded(self, event):
+        self._finish(event)
+    
+    def failed(self, event):
+        self._finish(event, failure=str(event.failure.get("errmsg", event.failure)))
+
+
+command_metrics_listener = MetricsCommandListener()
+pool_metrics_listener = MetricsPoolListener()
+slow_query_listener = SlowQueryListener()
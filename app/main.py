@@ -1,8 +1,22 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.api.routes import org_routes, auth_routes
-from app.db.mongo import close_mongo_connection
+from app.api.middleware import MetricsMiddleware, ProfilingMiddleware, ServerTimingMiddleware, TracingMiddleware
+from app.api.routes import org_routes, auth_routes, health_routes, job_routes, metrics_routes
+from app.db.mongo import close_mongo_connection, connect_mongo, register_event_listener
+from app.db.monitoring import command_metrics_listener, pool_metrics_listener, slow_query_listener
+from app.db.indexes import ensure_master_indexes
+from app.auth.password import shutdown_password_executor
+from app.repositories.master_repo import organization_cache
+from app.services.org_service import login_admission
+from app.services.pool_service import CollectionPoolService
+from app.services.job_service import JobService
+from app.services.reclaim_service import ReclaimService
+from app.services.slow_query_service import SlowQueryService
+from app.auth.jwt_handler import token_cache
+from app.utils.metrics import register_admission_controller, register_cache
+from app.utils.timing import enable_operation_tracking
+from app.utils.tracing import span_exporter
 import logging
 
 # Configure logging
@@ -32,17 +46,71 @@ def create_app() -> FastAPI:
     
     app.include_router(org_routes.router)
     app.include_router(auth_routes.router)
+    app.include_router(health_routes.router)
+    app.include_router(job_routes.router)
+    
+    if settings.profiling_enabled:
+        app.add_middleware(
+            ProfilingMiddleware,
+            token=settings.profiling_token,
+            sample_rate=settings.profiling_sample_rate,
+            interval_seconds=settings.profiling_interval_ms / 1000,
+            trace_memory=settings.profiling_tracemalloc,
+            output_dir=settings.profiling_output_dir
+        )
+    
+    if settings.server_timing_enabled:
+        app.add_middleware(ServerTimingMiddleware)
+    
+    if settings.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(metrics_routes.router)
+        # Listeners are handed to the MongoDB client when it is created
+        register_event_listener(command_metrics_listener)
+        register_event_listener(pool_metrics_listener)
+        register_cache("organization", organization_cache)
+        register_cache("token", token_cache)
+        register_admission_controller("login", login_admission)
+    
+    if settings.tracing_enabled:
+        # Added last so it is the outermost middleware
+        app.add_middleware(TracingMiddleware, sample_rate=settings.tracing_sample_rate)
+        span_exporter.configure(
+            path=settings.tracing_export_path,
+            service_name=settings.app_name,
+            batch_size=settings.tracing_export_batch_size,
+            interval_seconds=settings.tracing_export_interval_seconds,
+            max_queue_size=settings.tracing_max_queue_size
+        )
+    
+    if SlowQueryService.enabled():
+        register_event_listener(slow_query_listener)
+        enable_operation_tracking()
     
     @app.on_event("startup")
     async def startup_event():
         logger.info("Starting up Organization Management Service...")
         logger.info(f"MongoDB URL: {settings.mongodb_url}")
         logger.info(f"Master DB: {settings.mongodb_db_name}")
+        await connect_mongo()
+        await ensure_master_indexes()
+        CollectionPoolService.start()
+        JobService.start_workers()
+        ReclaimService.start()
+        SlowQueryService.start()
+        if settings.tracing_enabled:
+            span_exporter.start()
     
     @app.on_event("shutdown")
     async def shutdown_event():
         logger.info("Shutting down...")
+        await CollectionPoolService.stop()
+        await JobService.stop_workers()
+        await ReclaimService.stop()
+        await SlowQueryService.stop()
+        await span_exporter.stop()
         await close_mongo_connection()
+        shutdown_password_executor()
     
     @app.get("/", tags=["root"])
     async def root():
@@ -52,9 +120,14 @@ def create_app() -> FastAPI:
             "docs": "/docs"
         }
     
-    @app.get("/health", tags=["health"])
-    async def health_check():
-        return {"status": "healthy"}
+    @app.get("/stats", tags=["health"])
+    async def runtime_stats():
+        """In-process counters for this worker."""
+        return {
+            "organization_cache": organization_cache.stats(),
+            "login_admission": login_admission.stats(),
+            "token_cache": token_cache.stats()
+        }
     
     return app
 
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 
@@ -10,6 +10,10 @@ class OrgCreateRequest(BaseModel):
     password: str = Field(..., min_length=8)
 
 
+class OrgBulkCreateRequest(BaseModel):
+    organizations: List[OrgCreateRequest] = Field(..., min_length=1)
+
+
 class OrgGetRequest(BaseModel):
     organization_name: str
 
@@ -48,10 +52,38 @@ class OrgCreateResponse(BaseModel):
     organization: OrgMetadata
 
 
+class OrgBulkCreateResult(BaseModel):
+    index: int
+    organization_name: str
+    status: str
+    organization: Optional[OrgMetadata] = None
+    error: Optional[str] = None
+
+
+class OrgBulkCreateResponse(BaseModel):
+    message: str
+    created: int
+    failed: int
+    results: List[OrgBulkCreateResult]
+
+
 class OrgGetResponse(BaseModel):
     organization: OrgMetadata
 
 
+class OrgListItem(BaseModel):
+    # Fields are optional because the caller picks them with `fields`
+    organization_name: Optional[str] = None
+    collection_name: Optional[str] = None
+    admin: Optional[AdminInfo] = None
+    created_at: Optional[datetime] = None
+
+
+class OrgListResponse(BaseModel):
+    organizations: List[OrgListItem]
+    next_cursor: Optional[str] = None
+
+
 class OrgUpdateResponse(BaseModel):
     message: str
     organization: OrgMetadata
@@ -61,6 +93,26 @@ class OrgDeleteResponse(BaseModel):
     message: str
 
 
+class JobAcceptedResponse(BaseModel):
+    message: str
+    job_id: str
+    status_url: str
+
+
+class JobResponse(BaseModel):
+    job_id: str
+    type: str
+    status: str
+    organization_name: str
+    attempts: int
+    progress: Dict[str, Any] = {}
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    completed_at: Optional[datetime] = None
+
+
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
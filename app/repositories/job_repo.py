@@ -0,0 +1,140 @@
+from typing import Any, Dict, Optional
+from datetime import datetime, timedelta
+from bson import ObjectId
+from bson.errors import InvalidId
+from app.db.mongo import get_master_database
+from app.utils.helpers import normalize_organization_name
+from app.utils.timing import timed_methods
+
+
+@timed_methods
+class JobRepository:
+    """Repository for background jobs in the master DB."""
+    
+    @staticmethod
+    async def get_jobs_collection():
+        """Get the jobs collection from master DB."""
+        db = await get_master_database()
+        return db.jobs
+    
+    @staticmethod
+    async def create_job(job_type: str, params: Dict, organization_name: str, admin_id: str) -> Dict:
+        """
+        Queue a job. active_key is unique among queued and running jobs, so
+        a second job for the same organization raises DuplicateKeyError.
+        """
+        collection = await JobRepository.get_jobs_collection()
+        now = datetime.utcnow()
+        job = {
+            "type": job_type,
+            "params": params,
+            "organization_name": organization_name,
+            "admin_id": admin_id,
+            "active_key": normalize_organization_name(organization_name),
+            "status": "queued",
+            "attempts": 0,
+            "progress": {},
+            "created_at": now,
+            "updated_at": now
+        }
+        result = await collection.insert_one(job)
+        job["_id"] = str(result.inserted_id)
+        return job
+    
+    @staticmethod
+    async def get_job(job_id: str) -> Optional[Dict]:
+        """Find a job by ID; None for unknown or malformed IDs."""
+        try:
+            object_id = ObjectId(job_id)
+        except (InvalidId, TypeError):
+            return None
+        collection = await JobRepository.get_jobs_collection()
+        job = await collection.find_one({"_id": object_id})
+        if job:
+            job["_id"] = str(job["_id"])
+        return job
+    
+    @staticmethod
+    async def claim_job(worker_id: str, lease_seconds: float) -> Optional[Dict]:
+        """
+        Atomically lease the oldest queued job, or a running job whose
+        worker let its lease expire. Returns the claimed job or None.
+        """
+        collection = await JobRepository.get_jobs_collection()
+        now = datetime.utcnow()
+        job = await collection.find_one_and_update(
+            {"$or": [
+                {"status": "queued"},
+                {"status": "running", "lease_expires_at": {"$lt": now}}
+            ]},
+            {
+                "$set": {
+                    "status": "running",
+                    "worker_id": worker_id,
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                    "started_at": now,
+                    "updated_at": now
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("created_at", 1)],
+            return_document=True
+        )
+        if job:
+            job["_id"] = str(job["_id"])
+        return job
+    
+    @staticmethod
+    async def renew_lease(
+        job_id: str,
+        worker_id: str,
+        lease_seconds: float,
+        progress: Optional[Dict] = None
+    ) -> bool:
+        """
+        Extend the lease of a job this worker holds, saving its progress.
+        Returns False if the lease was lost to another worker.
+        """
+        collection = await JobRepository.get_jobs_collection()
+        now = datetime.utcnow()
+        update = {"lease_expires_at": now + timedelta(seconds=lease_seconds), "updated_at": now}
+        if progress is not None:
+            update["progress"] = progress
+        result = await collection.update_one(
+            {"_id": ObjectId(job_id), "worker_id": worker_id, "status": "running"},
+            {"$set": update}
+        )
+        return result.matched_count > 0
+    
+    @staticmethod
+    async def finish_job(
+        job_id: str,
+        worker_id: str,
+        status: str,
+        result: Optional[Any] = None,
+        error: Optional[str] = None,
+        progress: Optional[Dict] = None
+    ) -> bool:
+        """
+        Record the outcome of a job this worker holds. "queued" hands it back
+        for a retry; "completed" and "failed" are final and release the
+        organization for new jobs. Returns False if the lease was lost.
+        """
+        collection = await JobRepository.get_jobs_collection()
+        now = datetime.utcnow()
+        update: Dict[str, Any] = {"$set": {"status": status, "updated_at": now}}
+        if progress is not None:
+            update["$set"]["progress"] = progress
+        if error is not None:
+            update["$set"]["error"] = error
+        if status == "queued":
+            update["$unset"] = {"worker_id": "", "lease_expires_at": ""}
+        else:
+            update["$set"]["result"] = result
+            update["$set"]["completed_at"] = now
+            update["$unset"] = {"active_key": "", "lease_expires_at": ""}
+        write_result = await collection.update_one(
+            {"_id": ObjectId(job_id), "worker_id": worker_id, "status": "running"},
+            update
+        )
+        return write_result.matched_count > 0
@@ -1,10 +1,24 @@
-from typing import Optional, Dict, List
-from datetime import datetime
+import copy
+from typing import AsyncIterator, Optional, Dict, List
+from datetime import datetime, timedelta
 from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from app.core.config import settings
 from app.db.mongo import get_master_database
 from app.models.schemas import AdminInfo, OrgMetadata
+from app.utils.helpers import normalize_organization_name
+from app.utils.cache import TTLCache, MISSING
+from app.utils.timing import timed_methods
 
+# Read-through cache of organization records keyed by organization_key.
+# Misses are cached too (as None) so unknown names stay off Mongo, but only
+# for org_cache_negative_ttl_seconds: a name created through another worker
+# must not keep returning 404 here for the full TTL.
+organization_cache = TTLCache(settings.org_cache_max_size, settings.org_cache_ttl_seconds)
 
+
+@timed_methods
 class MasterRepository:
     """Repository for master database operations."""
     
@@ -25,29 +39,66 @@ class MasterRepository:
         """Find organization by name (case-insensitive)."""
         collection = await MasterRepository.get_organizations_collection()
         org = await collection.find_one(
-            {"organization_name": {"$regex": f"^{organization_name}$", "$options": "i"}}
+            {"organization_key": normalize_organization_name(organization_name)}
         )
         if org:
             org["_id"] = str(org["_id"])
         return org
     
     @staticmethod
-    async def create_organization(org_data: Dict) -> Dict:
+    async def find_organization_by_id(org_id: str) -> Optional[Dict]:
+        """Find organization by its record ID."""
+        collection = await MasterRepository.get_organizations_collection()
+        org = await collection.find_one({"_id": ObjectId(org_id)})
+        if org:
+            org["_id"] = str(org["_id"])
+        return org
+    
+    @staticmethod
+    async def find_organization_by_name_cached(organization_name: str) -> Optional[Dict]:
+        """
+        Find organization by name through the organization cache.
+        Callers that write organization metadata must invalidate the
+        affected names with invalidate_organization_cache.
+        """
+        key = normalize_organization_name(organization_name)
+        cached = organization_cache.get(key)
+        if cached is not MISSING:
+            return copy.deepcopy(cached)
+        
+        generation = organization_cache.generation
+        org = await MasterRepository.find_organization_by_name(organization_name)
+        ttl_seconds = None if org is not None else settings.org_cache_negative_ttl_seconds
+        organization_cache.set(key, copy.deepcopy(org), generation=generation, ttl_seconds=ttl_seconds)
+        return org
+    
+    @staticmethod
+    def invalidate_organization_cache(*organization_names: str) -> None:
+        """Drop cached records for the given organization names."""
+        for organization_name in organization_names:
+            organization_cache.invalidate(normalize_organization_name(organization_name))
+    
+    @staticmethod
+    async def create_organization(org_data: Dict, session=None) -> Dict:
         """Create a new organization record in master DB."""
         collection = await MasterRepository.get_organizations_collection()
+        org_data["organization_key"] = normalize_organization_name(org_data["organization_name"])
         org_data["created_at"] = datetime.utcnow()
-        result = await collection.insert_one(org_data)
+        result = await collection.insert_one(org_data, session=session)
         org_data["_id"] = str(result.inserted_id)
         return org_data
     
     @staticmethod
-    async def update_organization(organization_name: str, update_data: Dict) -> Optional[Dict]:
+    async def update_organization(organization_name: str, update_data: Dict, session=None) -> Optional[Dict]:
         """Update organization metadata."""
         collection = await MasterRepository.get_organizations_collection()
+        if "organization_name" in update_data:
+            update_data["organization_key"] = normalize_organization_name(update_data["organization_name"])
         result = await collection.find_one_and_update(
-            {"organization_name": {"$regex": f"^{organization_name}$", "$options": "i"}},
+            {"organization_key": normalize_organization_name(organization_name)},
             {"$set": update_data},
-            return_document=True
+            return_document=True,
+            session=session
         )
         if result:
             result["_id"] = str(result["_id"])
@@ -58,15 +109,23 @@ class MasterRepository:
         """Delete organization from master DB."""
         collection = await MasterRepository.get_organizations_collection()
         result = await collection.delete_one(
-            {"organization_name": {"$regex": f"^{organization_name}$", "$options": "i"}}
+            {"organization_key": normalize_organization_name(organization_name)}
         )
         return result.deleted_count > 0
     
     @staticmethod
-    async def create_admin(admin_data: Dict) -> Dict:
+    async def delete_organization_by_id(org_id: str, session=None) -> bool:
+        """Delete organization by its record ID."""
+        collection = await MasterRepository.get_organizations_collection()
+        result = await collection.delete_one({"_id": ObjectId(org_id)}, session=session)
+        return result.deleted_count > 0
+    
+    @staticmethod
+    async def create_admin(admin_data: Dict, session=None) -> Dict:
         """Create a new admin user."""
         collection = await MasterRepository.get_admins_collection()
-        result = await collection.insert_one(admin_data)
+        admin_data["organization_key"] = normalize_organization_name(admin_data["organization_name"])
+        result = await collection.insert_one(admin_data, session=session)
         admin_data["_id"] = str(result.inserted_id)
         return admin_data
     
@@ -84,42 +143,378 @@ class MasterRepository:
         """Find admin by organization name."""
         collection = await MasterRepository.get_admins_collection()
         admin = await collection.find_one(
-            {"organization_name": {"$regex": f"^{organization_name}$", "$options": "i"}}
+            {"organization_key": normalize_organization_name(organization_name)}
         )
         if admin:
             admin["_id"] = str(admin["_id"])
         return admin
     
     @staticmethod
-    async def update_admin(admin_id: str, update_data: Dict) -> Optional[Dict]:
+    async def update_admin(admin_id: str, update_data: Dict, session=None) -> Optional[Dict]:
         """Update admin user."""
         collection = await MasterRepository.get_admins_collection()
+        if "organization_name" in update_data:
+            update_data["organization_key"] = normalize_organization_name(update_data["organization_name"])
         result = await collection.find_one_and_update(
             {"_id": ObjectId(admin_id)},
             {"$set": update_data},
-            return_document=True
+            return_document=True,
+            session=session
         )
         if result:
             result["_id"] = str(result["_id"])
         return result
     
+    @staticmethod
+    async def delete_admin(admin_id: str, session=None) -> bool:
+        """Delete admin by ID."""
+        collection = await MasterRepository.get_admins_collection()
+        result = await collection.delete_one({"_id": ObjectId(admin_id)}, session=session)
+        return result.deleted_count > 0
+    
     @staticmethod
     async def delete_admin_by_org(organization_name: str) -> bool:
         """Delete admin by organization name."""
         collection = await MasterRepository.get_admins_collection()
         result = await collection.delete_one(
-            {"organization_name": {"$regex": f"^{organization_name}$", "$options": "i"}}
+            {"organization_key": normalize_organization_name(organization_name)}
         )
         return result.deleted_count > 0
     
     @staticmethod
-    async def list_all_organizations() -> List[Dict]:
-        """List all organizations (for management)."""
+    async def find_existing_organization_keys(organization_names: List[str]) -> List[str]:
+        """Return the organization_keys among the given names that are already taken."""
+        collection = await MasterRepository.get_organizations_collection()
+        keys = [normalize_organization_name(name) for name in organization_names]
+        cursor = collection.find({"organization_key": {"$in": keys}}, {"organization_key": 1, "_id": 0})
+        return [doc["organization_key"] async for doc in cursor]
+    
+    @staticmethod
+    async def find_existing_admin_emails(emails: List[str]) -> List[str]:
+        """Return the emails among the given ones that already belong to an admin."""
+        collection = await MasterRepository.get_admins_collection()
+        cursor = collection.find(
+            {"email": {"$in": [email.lower() for email in emails]}},
+            {"email": 1, "_id": 0}
+        )
+        return [doc["email"] async for doc in cursor]
+    
+    @staticmethod
+    async def _insert_many(collection, documents: List[Dict]) -> Dict[int, str]:
+        """
+        Insert documents unordered. Returns {position: error message} for
+        the documents that were rejected; the others are inserted.
+        """
+        if not documents:
+            return {}
+        try:
+            await collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            return {error["index"]: error.get("errmsg", "write error") for error in e.details.get("writeErrors", [])}
+        return {}
+    
+    @staticmethod
+    async def create_admins(admins: List[Dict]) -> Dict[int, str]:
+        """Create many admin users in one round trip. Returns failures by position."""
+        collection = await MasterRepository.get_admins_collection()
+        for admin_data in admins:
+            admin_data["organization_key"] = normalize_organization_name(admin_data["organization_name"])
+        return await MasterRepository._insert_many(collection, admins)
+    
+    @staticmethod
+    async def create_organizations(orgs: List[Dict]) -> Dict[int, str]:
+        """Create many organization records in one round trip. Returns failures by position."""
         collection = await MasterRepository.get_organizations_collection()
-        cursor = collection.find({})
+        now = datetime.utcnow()
+        for org_data in orgs:
+            org_data["organization_key"] = normalize_organization_name(org_data["organization_name"])
+            org_data["created_at"] = now
+        failures = await MasterRepository._insert_many(collection, orgs)
+        for org_data in orgs:
+            org_data["_id"] = str(org_data["_id"])
+        return failures
+    
+    @staticmethod
+    async def delete_admins(admin_ids: List[str]) -> int:
+        """Delete admins by ID."""
+        if not admin_ids:
+            return 0
+        collection = await MasterRepository.get_admins_collection()
+        result = await collection.delete_many({"_id": {"$in": [ObjectId(a) for a in admin_ids]}})
+        return result.deleted_count
+    
+    @staticmethod
+    async def delete_organizations_by_ids(org_ids: List[str]) -> int:
+        """Delete organizations by record ID."""
+        if not org_ids:
+            return 0
+        collection = await MasterRepository.get_organizations_collection()
+        result = await collection.delete_many({"_id": {"$in": [ObjectId(o) for o in org_ids]}})
+        return result.deleted_count
+    
+    @staticmethod
+    def _organization_key_range(after_key: Optional[str]) -> Dict:
+        """Filter for organizations ordered after a key, served by the organization_key index."""
+        # Every key is a string and "" sorts first, so $gte "" matches all keyed records
+        if after_key is None:
+            return {"organization_key": {"$gte": ""}}
+        return {"organization_key": {"$gt": after_key}}
+    
+    @staticmethod
+    async def list_organizations_page(
+        after_key: Optional[str],
+        limit: int,
+        projection: Optional[Dict] = None
+    ) -> List[Dict]:
+        """List one page of organizations in organization_key order (keyset pagination)."""
+        collection = await MasterRepository.get_organizations_collection()
+        cursor = collection.find(
+            MasterRepository._organization_key_range(after_key),
+            projection
+        ).sort("organization_key", 1).limit(limit)
         orgs = []
         async for org in cursor:
             org["_id"] = str(org["_id"])
             orgs.append(org)
         return orgs
-
+    
+    @staticmethod
+    async def iter_organizations(
+        after_key: Optional[str] = None,
+        projection: Optional[Dict] = None,
+        batch_size: int = 500
+    ) -> AsyncIterator[Dict]:
+        """Stream organizations in organization_key order without materializing them."""
+        collection = await MasterRepository.get_organizations_collection()
+        cursor = collection.find(
+            MasterRepository._organization_key_range(after_key),
+            projection
+        ).sort("organization_key", 1).batch_size(batch_size)
+        async for org in cursor:
+            org["_id"] = str(org["_id"])
+            yield org
+    
+    @staticmethod
+    async def backfill_organization_keys(batch_size: int = 500) -> Dict[str, int]:
+        """
+        Populate organization_key on organization and admin records created
+        before the normalized key existed. Safe to run repeatedly.
+        Returns the number of updated records per collection.
+        """
+        updated = {}
+        collections = {
+            "organizations": await MasterRepository.get_organizations_collection(),
+            "admins": await MasterRepository.get_admins_collection()
+        }
+        for name, collection in collections.items():
+            updated[name] = 0
+            cursor = collection.find(
+                # Tombstoned organizations have no key on purpose
+                {"organization_key": {"$exists": False}, "deleted_at": {"$exists": False}},
+                {"organization_name": 1}
+            )
+            operations = []
+            async for doc in cursor:
+                if not doc.get("organization_name"):
+                    continue
+                operations.append(UpdateOne(
+                    {"_id": doc["_id"]},
+                    {"$set": {"organization_key": normalize_organization_name(doc["organization_name"])}}
+                ))
+                if len(operations) >= batch_size:
+                    result = await collection.bulk_write(operations, ordered=False)
+                    updated[name] += result.modified_count
+                    operations = []
+            if operations:
+                result = await collection.bulk_write(operations, ordered=False)
+                updated[name] += result.modified_count
+        return updated
+    
+    @staticmethod
+    async def iter_organizations_without_tenant_id() -> AsyncIterator[Dict]:
+        """Stream organizations whose collection is still derived from their name."""
+        collection = await MasterRepository.get_organizations_collection()
+        cursor = collection.find(
+            {"tenant_id": {"$exists": False}, "deleted_at": {"$exists": False}},
+            {"organization_name": 1, "collection_name": 1, "pending_tenant_id": 1}
+        )
+        async for org in cursor:
+            org["_id"] = str(org["_id"])
+            yield org
+    
+    @staticmethod
+    async def reserve_tenant_id(org_id: str, tenant_id: str) -> Optional[str]:
+        """
+        Record tenant_id as the pending tenant ID of an organization unless
+        one is already reserved. Returns the reserved ID, or None if the
+        organization no longer exists.
+        """
+        collection = await MasterRepository.get_organizations_collection()
+        await collection.update_one(
+            {"_id": ObjectId(org_id), "pending_tenant_id": {"$exists": False}},
+            {"$set": {"pending_tenant_id": tenant_id}}
+        )
+        org = await collection.find_one({"_id": ObjectId(org_id)}, {"pending_tenant_id": 1})
+        return org["pending_tenant_id"] if org else None
+    
+    @staticmethod
+    async def set_tenant_id(
+        org_id: str,
+        old_collection_name: str,
+        tenant_id: str,
+        new_collection_name: str
+    ) -> Optional[Dict]:
+        """
+        Point an organization at its ID-keyed collection, provided it still
+        uses old_collection_name. Returns the updated record or None.
+        """
+        collection = await MasterRepository.get_organizations_collection()
+        result = await collection.find_one_and_update(
+            {"_id": ObjectId(org_id), "collection_name": old_collection_name},
+            {
+                "$set": {"tenant_id": tenant_id, "collection_name": new_collection_name},
+                "$unset": {"pending_tenant_id": ""}
+            },
+            return_document=True
+        )
+        if result:
+            result["_id"] = str(result["_id"])
+        return result
+    
+    @staticmethod
+    async def tombstone_organization(
+        org_id: str,
+        organization_name: str,
+        collection_name: str,
+        purge_after: datetime,
+        session=None
+    ) -> Optional[Dict]:
+        """
+        Soft-delete a live organization in one write. Unsetting organization_key
+        hides it from every lookup and frees the name; the key is kept as
+        deleted_organization_key for undelete. Returns the tombstone or None.
+        """
+        collection = await MasterRepository.get_organizations_collection()
+        result = await collection.find_one_and_update(
+            {"_id": ObjectId(org_id), "organization_key": {"$exists": True}},
+            {
+                "$set": {
+                    "deleted_organization_key": normalize_organization_name(organization_name),
+                    "collection_name": collection_name,
+                    "deleted_at": datetime.utcnow(),
+                    "purge_after": purge_after
+                },
+                "$unset": {"organization_key": ""}
+            },
+            return_document=True,
+            session=session
+        )
+        if result:
+            result["_id"] = str(result["_id"])
+        return result
+    
+    @staticmethod
+    async def detach_admin(admin_id: str, organization_name: str, session=None) -> bool:
+        """Detach the admin of a deleted organization so its name can be reused."""
+        collection = await MasterRepository.get_admins_collection()
+        result = await collection.update_one(
+            {"_id": ObjectId(admin_id)},
+            {
+                "$set": {"deleted_organization_key": normalize_organization_name(organization_name)},
+                "$unset": {"organization_key": ""}
+            },
+            session=session
+        )
+        return result.modified_count > 0
+    
+    @staticmethod
+    async def find_deleted_organizations(organization_name: Optional[str] = None) -> List[Dict]:
+        """List tombstoned organizations, newest first, optionally for one name."""
+        collection = await MasterRepository.get_organizations_collection()
+        query: Dict = {"deleted_at": {"$exists": True}}
+        if organization_name:
+            query["deleted_organization_key"] = normalize_organization_name(organization_name)
+        orgs = []
+        async for org in collection.find(query).sort("deleted_at", -1):
+            org["_id"] = str(org["_id"])
+            orgs.append(org)
+        return orgs
+    
+    @staticmethod
+    async def restore_organization(org_id: str, collection_name: str) -> Optional[Dict]:
+        """
+        Undo tombstone_organization unless the reclaimer is purging it.
+        Raises DuplicateKeyError if the name has been taken since.
+        Returns the restored record or None.
+        """
+        collection = await MasterRepository.get_organizations_collection()
+        tombstone = await collection.find_one({"_id": ObjectId(org_id), "deleted_at": {"$exists": True}})
+        if not tombstone:
+            return None
+        result = await collection.find_one_and_update(
+            {
+                "_id": ObjectId(org_id),
+                "deleted_at": {"$exists": True},
+                "$or": [
+                    {"reclaim_lease_expires_at": {"$exists": False}},
+                    {"reclaim_lease_expires_at": {"$lt": datetime.utcnow()}}
+                ]
+            },
+            {
+                "$set": {
+                    "organization_key": tombstone["deleted_organization_key"],
+                    "collection_name": collection_name
+                },
+                "$unset": {
+                    "deleted_organization_key": "",
+                    "deleted_at": "",
+                    "purge_after": "",
+                    "reclaim_lease_expires_at": ""
+                }
+            },
+            return_document=True
+        )
+        if result:
+            result["_id"] = str(result["_id"])
+        return result
+    
+    @staticmethod
+    async def reattach_admin(admin_id: str) -> bool:
+        """Undo detach_admin."""
+        collection = await MasterRepository.get_admins_collection()
+        admin = await collection.find_one({"_id": ObjectId(admin_id)})
+        if not admin or "deleted_organization_key" not in admin:
+            return False
+        result = await collection.update_one(
+            {"_id": ObjectId(admin_id)},
+            {
+                "$set": {"organization_key": admin["deleted_organization_key"]},
+                "$unset": {"deleted_organization_key": ""}
+            }
+        )
+        return result.modified_count > 0
+    
+    @staticmethod
+    async def claim_expired_tombstone(lease_seconds: float) -> Optional[Dict]:
+        """
+        Lease the tombstone that has been past its retention window the
+        longest, so concurrent reclaimers never purge the same organization.
+        Returns the tombstone or None.
+        """
+        collection = await MasterRepository.get_organizations_collection()
+        now = datetime.utcnow()
+        result = await collection.find_one_and_update(
+            {
+                "purge_after": {"$lte": now},
+                "$or": [
+                    {"reclaim_lease_expires_at": {"$exists": False}},
+                    {"reclaim_lease_expires_at": {"$lt": now}}
+                ]
+            },
+            {"$set": {"reclaim_lease_expires_at": now + timedelta(seconds=lease_seconds)}},
+            sort=[("purge_after", 1)],
+            return_document=True
+        )
+        if result:
+            result["_id"] = str(result["_id"])
+        return result
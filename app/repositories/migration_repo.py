@@ -0,0 +1,291 @@
+import logging
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from pymongo import DeleteOne, IndexModel, ReplaceOne
+from pymongo.errors import OperationFailure
+from app.core.config import settings
+from app.db.mongo import get_master_database, resolve_cursor
+from app.utils.timing import timed_methods
+
+logger = logging.getLogger(__name__)
+
+# Server error code for "The $changeStream stage is only supported on replica sets"
+_CHANGE_STREAMS_UNSUPPORTED = 40573
+
+
+async def copy_indexes(source, target) -> None:
+    """Recreate the secondary indexes of the source collection on the target."""
+    indexes = []
+    async for spec in await resolve_cursor(source.list_indexes()):
+        if spec["name"] == "_id_":
+            continue
+        spec = dict(spec)
+        spec.pop("v", None)
+        spec.pop("ns", None)
+        indexes.append(IndexModel(list(spec.pop("key").items()), **spec))
+    
+    if indexes:
+        await target.create_indexes(indexes)
+
+
+@timed_methods
+class MigrationRepository:
+    """Repository for tenant migration checkpoints in the master DB."""
+    
+    @staticmethod
+    async def get_migrations_collection():
+        """Get the migrations collection from master DB."""
+        db = await get_master_database()
+        return db.migrations
+    
+    @staticmethod
+    async def get_checkpoint(migration_id: str) -> Optional[Dict]:
+        """Find the checkpoint of a migration."""
+        collection = await MigrationRepository.get_migrations_collection()
+        return await collection.find_one({"_id": migration_id})
+    
+    @staticmethod
+    async def save_checkpoint(migration_id: str, checkpoint: Dict) -> None:
+        """Create or update the checkpoint of a migration."""
+        collection = await MigrationRepository.get_migrations_collection()
+        checkpoint["updated_at"] = datetime.utcnow()
+        await collection.update_one({"_id": migration_id}, {"$set": checkpoint}, upsert=True)
+    
+    @staticmethod
+    async def delete_checkpoint(migration_id: str) -> bool:
+        """Delete the checkpoint of a migration."""
+        collection = await MigrationRepository.get_migrations_collection()
+        result = await collection.delete_one({"_id": migration_id})
+        return result.deleted_count > 0
+    
+    @staticmethod
+    async def list_migrations() -> List[Dict]:
+        """List all migration checkpoints, newest first."""
+        collection = await MigrationRepository.get_migrations_collection()
+        cursor = collection.find({}, {"resume_token": 0}).sort("updated_at", -1)
+        return [doc async for doc in cursor]
+
+
+class TenantMigrator:
+    """
+    Online, resumable copy of one tenant collection into another.
+    
+    A change stream on the source is opened before the copy starts. The copy
+    walks the source in _id order, writing batches as idempotent upserts.
+    Between batches, writes that landed on the source are replayed from the
+    change stream. Progress and the stream's resume token are checkpointed in
+    the master DB after each batch, so re-running the same migration after a
+    crash continues from the last checkpoint instead of starting over.
+    
+    Resuming relies on `_id > last_id`, which only matches _ids of the same
+    BSON type as last_id; collections with mixed _id types should be
+    migrated in one run.
+    
+    On standalone servers, which have no change streams, the copy still works.
+    Writes made during the copy are not replayed, and a warning is logged.
+    
+    snapshot, if given, is tried instead of the batched copy when nothing
+    has been copied yet: a server-side copy (such as $out) that replaces
+    the target with the source's documents and returns False when the
+    deployment cannot run it. It runs after the change stream is open, so
+    writes made while it runs are replayed like any others.
+    """
+    
+    def __init__(
+        self,
+        source,
+        target,
+        batch_size: Optional[int] = None,
+        progress_callback: Optional[Callable[[Dict], Awaitable[None]]] = None,
+        snapshot: Optional[Callable[[], Awaitable[bool]]] = None
+    ):
+        self.source = source
+        self.target = target
+        self.batch_size = batch_size or settings.migration_batch_size
+        self.progress_callback = progress_callback
+        self.snapshot = snapshot
+        self.migration_id = (
+            f"{source.database.name}.{source.name}->{target.database.name}.{target.name}"
+        )
+        self._stream = None
+        self._checkpoint: Dict[str, Any] = {}
+        self._run_started = 0.0
+        self._run_copied = 0
+    
+    async def run(self, cutover: Optional[Callable[[], Awaitable[None]]] = None) -> Dict:
+        """
+        Copy the source into the target and replay concurrent writes.
+        If cutover is given, it is awaited once the target has caught up,
+        and writes that landed before it switched traffic are replayed
+        afterwards. Returns the final checkpoint.
+        """
+        await self._load_checkpoint()
+        try:
+            await self._open_change_stream()
+            await self._copy()
+            
+            await self._save(status="catching_up")
+            await self._replay_changes()
+            if cutover is not None:
+                await cutover()
+                await self._replay_changes()
+            
+            await self._save(status="completed", completed_at=datetime.utcnow(), eta_seconds=0)
+            return self._checkpoint
+        except Exception as e:
+            await self._save(status="failed", error=str(e))
+            raise
+        finally:
+            if self._stream is not None:
+                await self._stream.close()
+                self._stream = None
+    
+    async def _load_checkpoint(self) -> None:
+        checkpoint = await MigrationRepository.get_checkpoint(self.migration_id)
+        if checkpoint and checkpoint.get("status") != "completed":
+            logger.info(
+                f"Resuming migration {self.migration_id} after {checkpoint.get('copied', 0)} documents"
+            )
+            self._checkpoint = checkpoint
+        else:
+            self._checkpoint = {
+                "source": self.source.name,
+                "target": self.target.name,
+                "last_id": None,
+                "copied": 0,
+                "replayed": 0,
+                "resume_token": None,
+                "started_at": datetime.utcnow()
+            }
+        self._checkpoint["total_estimate"] = await self.source.estimated_document_count()
+        self._checkpoint.pop("error", None)
+        await self._save(status="copying")
+    
+    async def _open_change_stream(self) -> None:
+        """Open the source change stream, resuming from the checkpoint when possible."""
+        options = {"full_document": "updateLookup", "max_await_time_ms": 200}
+        resume_token = self._checkpoint.get("resume_token")
+        try:
+            try:
+                self._stream = await resolve_cursor(self.source.watch(resume_after=resume_token, **options))
+                # Streams open lazily; the first poll starts the server cursor
+                # before any document is copied
+                change = await self._stream.try_next()
+            except OperationFailure as e:
+                if resume_token is None or e.code == _CHANGE_STREAMS_UNSUPPORTED:
+                    raise
+                # The resume point fell off the oplog: restart the copy from
+                # scratch, which is safe because every write is an upsert
+                logger.warning(f"Cannot resume change stream for {self.migration_id}: {e}")
+                self._checkpoint.update({"last_id": None, "copied": 0, "resume_token": None})
+                self._stream = await resolve_cursor(self.source.watch(**options))
+                change = await self._stream.try_next()
+        except OperationFailure as e:
+            if e.code != _CHANGE_STREAMS_UNSUPPORTED:
+                raise
+            logger.warning(
+                f"Change streams unavailable; writes to {self.source.name} during "
+                f"migration {self.migration_id} will not be replayed"
+            )
+            self._stream = None
+            return
+        
+        if change is not None:
+            await self._apply_changes([change])
+        self._checkpoint["resume_token"] = self._stream.resume_token
+    
+    async def _copy(self) -> None:
+        """Copy the source in _id order, one bounded batch at a time."""
+        self._run_started = time.monotonic()
+        self._run_copied = 0
+        
+        if self.snapshot is not None and self._checkpoint.get("last_id") is None:
+            if await self.snapshot():
+                copied = await self.target.count_documents({})
+                self._checkpoint["copied"] = copied
+                self._run_copied = copied
+                await self._replay_changes()
+                await self._save()
+                return
+        
+        query = {}
+        if self._checkpoint.get("last_id") is not None:
+            query = {"_id": {"$gt": self._checkpoint["last_id"]}}
+        
+        cursor = self.source.find(query).sort("_id", 1).batch_size(self.batch_size)
+        batch = []
+        async for doc in cursor:
+            batch.append(doc)
+            if len(batch) >= self.batch_size:
+                await self._write_batch(batch)
+                batch = []
+        if batch:
+            await self._write_batch(batch)
+    
+    async def _write_batch(self, batch: List[Dict]) -> None:
+        await self.target.bulk_write(
+            [ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in batch],
+            ordered=False
+        )
+        self._checkpoint["last_id"] = batch[-1]["_id"]
+        self._checkpoint["copied"] += len(batch)
+        self._run_copied += len(batch)
+        
+        # Keep the change stream moving so its resume point stays in the oplog
+        await self._replay_changes()
+        await self._save()
+    
+    async def _replay_changes(self) -> None:
+        """Apply every change currently pending on the source change stream."""
+        if self._stream is None:
+            return
+        
+        changes = []
+        while True:
+            change = await self._stream.try_next()
+            if change is None:
+                break
+            changes.append(change)
+            if len(changes) >= self.batch_size:
+                await self._apply_changes(changes)
+                changes = []
+        if changes:
+            await self._apply_changes(changes)
+        self._checkpoint["resume_token"] = self._stream.resume_token
+    
+    async def _apply_changes(self, changes: List[Dict]) -> None:
+        operations = []
+        for change in changes:
+            operation_type = change["operationType"]
+            if operation_type == "delete":
+                operations.append(DeleteOne({"_id": change["documentKey"]["_id"]}))
+            elif operation_type in ("insert", "update", "replace"):
+                # updateLookup returns the current document; None means it was
+                # deleted since, and that delete event follows in the stream
+                document = change.get("fullDocument")
+                if document is not None:
+                    operations.append(ReplaceOne({"_id": document["_id"]}, document, upsert=True))
+            elif operation_type in ("drop", "rename", "dropDatabase", "invalidate"):
+                raise RuntimeError(
+                    f"Source collection {self.source.name} was {operation_type} during migration"
+                )
+        
+        if operations:
+            await self.target.bulk_write(operations, ordered=False)
+            self._checkpoint["replayed"] = self._checkpoint.get("replayed", 0) + len(operations)
+    
+    async def _save(self, **fields) -> None:
+        self._checkpoint.update(fields)
+        
+        elapsed = time.monotonic() - self._run_started if self._run_started else 0
+        if elapsed > 0:
+            rate = self._run_copied / elapsed
+            remaining = max(self._checkpoint["total_estimate"] - self._checkpoint["copied"], 0)
+            self._checkpoint["docs_per_sec"] = round(rate, 1)
+            self._checkpoint["eta_seconds"] = round(remaining / rate, 1) if rate else None
+        
+        checkpoint = {k: v for k, v in self._checkpoint.items() if k != "_id"}
+        await MigrationRepository.save_checkpoint(self.migration_id, checkpoint)
+        if self.progress_callback is not None:
+            await self.progress_callback(dict(self._checkpoint))
@@ -1,7 +1,17 @@
-from typing import List, Dict, Optional
-from app.db.mongo import get_org_database
+import logging
+from typing import Awaitable, Callable, List, Dict, Optional
+from pymongo.errors import OperationFailure
+from app.db.mongo import get_org_database, resolve_cursor
+from app.db.indexes import TENANT_INDEXES
+from app.repositories.migration_repo import MigrationRepository, TenantMigrator, copy_indexes
+from app.repositories.pool_repo import CollectionPoolRepository
+from app.utils.helpers import trash_collection_name
+from app.utils.timing import timed_methods
 
+logger = logging.getLogger(__name__)
 
+
+@timed_methods
 class OrgRepository:
     """Repository for organization-specific collection operations."""
     
@@ -13,9 +23,9 @@ class OrgRepository:
         """
         try:
             db = await get_org_database(collection_name)
-            # Create collection by inserting and deleting a dummy document
-            await db[collection_name].insert_one({"_temp": True})
-            await db[collection_name].delete_one({"_temp": True})
+            await db.create_collection(collection_name)
+            if TENANT_INDEXES:
+                await db[collection_name].create_indexes(TENANT_INDEXES)
             return True
         except Exception:
             return False
@@ -25,46 +35,153 @@ class OrgRepository:
         """Check if a collection exists."""
         try:
             db = await get_org_database(collection_name)
-            collections = await db.list_collection_names()
+            collections = await db.list_collection_names(filter={"name": collection_name})
             return collection_name in collections
         except Exception:
             return False
     
     @staticmethod
-    async def migrate_collection(old_collection_name: str, new_collection_name: str) -> bool:
+    async def find_existing_collections(collection_names: List[str]) -> List[str]:
+        """Return which of the given collections exist, in one listCollections call."""
+        db = await get_org_database("")
+        return await db.list_collection_names(filter={"name": {"$in": collection_names}})
+    
+    @staticmethod
+    async def migrate_collection(
+        old_collection_name: str,
+        new_collection_name: str,
+        progress_callback: Optional[Callable[[Dict], Awaitable[None]]] = None,
+        cutover: Optional[Callable[[], Awaitable[None]]] = None
+    ) -> bool:
         """
-        Migrate all documents from old collection to new collection.
+        Move an organization collection to a new name.
+        Tries a server-side renameCollection (metadata only, keeps indexes),
+        then an online copy (TenantMigrator) that starts with a server-side
+        $out snapshot and falls back to copying batches through the API
+        process. The copy carries over secondary indexes and leaves the old
+        collection in place for the caller to drop. An interrupted copy is
+        resumed, and progress_callback receives its checkpoints.
+        cutover must point writers at the new collection. It is awaited
+        once the new collection has caught up (right after a rename), and
+        writes that reached the old collection before it are replayed, so
+        the old collection can be dropped once this returns.
         Returns True if successful, False otherwise.
         """
         try:
-            db = await get_org_database(old_collection_name)
-            
             # Check if old collection exists
             if not await OrgRepository.collection_exists(old_collection_name):
                 return True  # Nothing to migrate
             
-            # Get all documents from old collection
-            old_collection = db[old_collection_name]
-            cursor = old_collection.find({})
-            documents = []
-            async for doc in cursor:
-                documents.append(doc)
-            
-            # If no documents, just create the new collection
-            if not documents:
-                await OrgRepository.create_collection(new_collection_name)
+            db = await get_org_database(old_collection_name)
+            migrator = TenantMigrator(db[old_collection_name], db[new_collection_name])
+            checkpoint = await MigrationRepository.get_checkpoint(migrator.migration_id)
+            if checkpoint and checkpoint.get("status") != "completed":
+                await OrgRepository.copy_collection(
+                    old_collection_name, new_collection_name, progress_callback, cutover
+                )
                 return True
             
-            # Insert all documents into new collection
-            new_collection = db[new_collection_name]
-            if documents:
-                await new_collection.insert_many(documents)
+            # Never overwrite an existing collection
+            if await OrgRepository.collection_exists(new_collection_name):
+                logger.error(f"Migration error: target collection '{new_collection_name}' already exists")
+                return False
             
+            if await OrgRepository.rename_collection(old_collection_name, new_collection_name):
+                if cutover is not None:
+                    await cutover()
+                return True
+            
+            await OrgRepository.copy_collection(
+                old_collection_name, new_collection_name, progress_callback, cutover
+            )
             return True
         except Exception as e:
-            print(f"Migration error: {e}")
+            logger.error(f"Migration error: {e}")
+            return False
+    
+    @staticmethod
+    async def migration_completed(old_collection_name: str, new_collection_name: str) -> bool:
+        """Whether the latest copy of one collection into the other ran to completion."""
+        db = await get_org_database(old_collection_name)
+        migrator = TenantMigrator(db[old_collection_name], db[new_collection_name])
+        checkpoint = await MigrationRepository.get_checkpoint(migrator.migration_id)
+        return bool(checkpoint) and checkpoint.get("status") == "completed"
+    
+    @staticmethod
+    async def rename_collection(old_collection_name: str, new_collection_name: str) -> bool:
+        """
+        Rename a collection with renameCollection, entirely on the server.
+        Returns False if the deployment cannot rename it (e.g. sharded
+        collections on older servers).
+        """
+        try:
+            db = await get_org_database(old_collection_name)
+            await db[old_collection_name].rename(new_collection_name)
+            return True
+        except OperationFailure as e:
+            logger.warning(f"renameCollection unavailable for '{old_collection_name}': {e}")
+            return False
+    
+    @staticmethod
+    async def copy_collection_server_side(old_collection_name: str, new_collection_name: str) -> bool:
+        """
+        Copy all documents with an aggregation $out stage, so no documents
+        pass through the API process. Indexes are not copied. The copy is a
+        snapshot: writes made while it runs are not included, so it is only
+        used as the first step of a TenantMigrator, which replays them.
+        """
+        try:
+            db = await get_org_database(old_collection_name)
+            cursor = await resolve_cursor(db[old_collection_name].aggregate([{"$out": new_collection_name}]))
+            async for _ in cursor:
+                pass
+            return True
+        except OperationFailure as e:
+            logger.warning(f"$out copy unavailable for '{old_collection_name}': {e}")
             return False
     
+    @staticmethod
+    async def copy_collection(
+        old_collection_name: str,
+        new_collection_name: str,
+        progress_callback: Optional[Callable[[Dict], Awaitable[None]]] = None,
+        cutover: Optional[Callable[[], Awaitable[None]]] = None
+    ) -> None:
+        """
+        Copy all documents online with change-stream catch-up: a server-side
+        $out snapshot where the deployment supports it, otherwise bounded
+        batches through the API process. Secondary indexes are copied
+        before cutover, which the migrator awaits once the new collection
+        has caught up.
+        """
+        db = await get_org_database(old_collection_name)
+        
+        # Make sure the new collection exists even if the old one is empty
+        if not await OrgRepository.collection_exists(new_collection_name):
+            await db.create_collection(new_collection_name)
+        
+        async def switch():
+            await OrgRepository.copy_indexes(old_collection_name, new_collection_name)
+            if cutover is not None:
+                await cutover()
+        
+        async def snapshot():
+            return await OrgRepository.copy_collection_server_side(old_collection_name, new_collection_name)
+        
+        migrator = TenantMigrator(
+            db[old_collection_name],
+            db[new_collection_name],
+            progress_callback=progress_callback,
+            snapshot=snapshot
+        )
+        await migrator.run(cutover=switch)
+    
+    @staticmethod
+    async def copy_indexes(old_collection_name: str, new_collection_name: str) -> None:
+        """Recreate the secondary indexes of one collection on another."""
+        db = await get_org_database(old_collection_name)
+        await copy_indexes(db[old_collection_name], db[new_collection_name])
+    
     @staticmethod
     async def drop_collection(collection_name: str) -> bool:
         """Drop an organization collection."""
@@ -85,14 +202,47 @@ class OrgRepository:
         except Exception:
             return 0
     
+    @staticmethod
+    async def get_estimated_document_count(collection_name: str) -> int:
+        """Get the document count from collection metadata (no scan)."""
+        db = await get_org_database(collection_name)
+        return await db[collection_name].estimated_document_count()
+    
+    @staticmethod
+    async def get_collection_stats(collection_name: str) -> Dict[str, int]:
+        """
+        Get document count and storage/index sizes in bytes from $collStats.
+        Per-shard results are summed for sharded collections.
+        """
+        db = await get_org_database(collection_name)
+        cursor = await resolve_cursor(
+            db[collection_name].aggregate([{"$collStats": {"storageStats": {}}}])
+        )
+        stats = {"documents": 0, "size": 0, "storage_size": 0, "index_size": 0}
+        async for shard in cursor:
+            storage = shard.get("storageStats", {})
+            stats["documents"] += storage.get("count", 0)
+            stats["size"] += storage.get("size", 0)
+            stats["storage_size"] += storage.get("storageSize", 0)
+            stats["index_size"] += storage.get("totalIndexSize", 0)
+        return stats
+    
     @staticmethod
     async def list_collections() -> List[str]:
-        """List all organization collections (for management)."""
+        """
+        List the collections of live organizations (for management).
+        Deleted organizations' collections parked in the trash and
+        unassigned collections in the pool are left out.
+        """
         try:
             db = await get_org_database("")
             collections = await db.list_collection_names()
-            # Filter to only org_* collections
-            return [c for c in collections if c.startswith("org_")]
+            pooled = set(await CollectionPoolRepository.list_collection_names())
+            trash_prefix = trash_collection_name("")
+            return [
+                c for c in collections
+                if c.startswith("org_") and not c.startswith(trash_prefix) and c not in pooled
+            ]
         except Exception:
             return []
 
@@ -0,0 +1,46 @@
+from typing import Dict, List, Optional
+from datetime import datetime
+from app.db.mongo import get_master_database
+from app.utils.timing import timed_methods
+
+
+@timed_methods
+class CollectionPoolRepository:
+    """Repository for the pool of pre-created, unassigned tenant collections."""
+    
+    @staticmethod
+    async def get_pool_collection():
+        """Get the collection_pool collection from master DB."""
+        db = await get_master_database()
+        return db.collection_pool
+    
+    @staticmethod
+    async def add(collection_name: str, tenant_id: str) -> None:
+        """Register a created, empty tenant collection as available."""
+        collection = await CollectionPoolRepository.get_pool_collection()
+        await collection.insert_one({
+            "_id": collection_name,
+            "tenant_id": tenant_id,
+            "created_at": datetime.utcnow()
+        })
+    
+    @staticmethod
+    async def claim() -> Optional[Dict]:
+        """
+        Atomically take the oldest available collection out of the pool.
+        Returns its entry (_id is the collection name), or None if the pool is empty.
+        """
+        collection = await CollectionPoolRepository.get_pool_collection()
+        return await collection.find_one_and_delete({}, sort=[("created_at", 1)])
+    
+    @staticmethod
+    async def count() -> int:
+        """Number of available collections."""
+        collection = await CollectionPoolRepository.get_pool_collection()
+        return await collection.count_documents({})
+    
+    @staticmethod
+    async def list_collection_names() -> List[str]:
+        """Names of the available collections."""
+        collection = await CollectionPoolRepository.get_pool_collection()
+        return [entry["_id"] async for entry in collection.find({}, {"_id": 1})]
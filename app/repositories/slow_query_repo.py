@@ -0,0 +1,37 @@
+from typing import Dict, List
+from pymongo.errors import CollectionInvalid
+from app.db.mongo import get_master_database, get_mongo_client
+from app.db.monitoring import SLOW_QUERY_COLLECTION
+from app.utils.timing import timed_methods
+
+
+@timed_methods
+class SlowQueryRepository:
+    """Repository for the capped collection of slow-query records."""
+    
+    @staticmethod
+    async def get_slow_queries_collection():
+        """Get the slow_queries collection from master DB."""
+        db = await get_master_database()
+        return db[SLOW_QUERY_COLLECTION]
+    
+    @staticmethod
+    async def ensure_collection(size_bytes: int) -> None:
+        """Create the capped collection unless it already exists."""
+        db = await get_master_database()
+        try:
+            await db.create_collection(SLOW_QUERY_COLLECTION, capped=True, size=size_bytes)
+        except CollectionInvalid:
+            pass
+    
+    @staticmethod
+    async def insert_records(records: List[Dict]) -> None:
+        """Append slow-query records."""
+        collection = await SlowQueryRepository.get_slow_queries_collection()
+        await collection.insert_many(records, ordered=False)
+    
+    @staticmethod
+    async def explain(database_name: str, command: Dict) -> Dict:
+        """Run a command under explain with executionStats verbosity."""
+        client = await get_mongo_client()
+        return await client[database_name].command({"explain": command, "verbosity": "executionStats"})
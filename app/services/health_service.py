@@ -0,0 +1,85 @@
+import asyncio
+import time
+from typing import Dict, Optional
+from app.core.config import settings
+from app.db.mongo import get_mongo_client
+from app.repositories.master_repo import MasterRepository
+
+# An organization key that never exists; looking it up exercises the
+# organization_key index without returning data.
+_PROBE_ORGANIZATION_NAME = "__readiness_probe__"
+
+
+class HealthService:
+    """Service layer for liveness/readiness probes."""
+    
+    _last_result: Optional[Dict] = None
+    _last_checked: float = 0.0
+    _in_flight: Optional[asyncio.Future] = None
+    
+    @staticmethod
+    async def _timed_check(coro) -> Dict:
+        """Run one dependency check with a deadline and measure its latency."""
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(coro, timeout=settings.readiness_timeout_seconds)
+        except asyncio.TimeoutError:
+            return {
+                "status": "error",
+                "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+                "error": f"timed out after {settings.readiness_timeout_seconds}s"
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+                "error": str(e)
+            }
+        
+        latency_ms = round((time.perf_counter() - start) * 1000, 2)
+        slow = latency_ms > settings.readiness_latency_threshold_ms
+        return {"status": "slow" if slow else "ok", "latency_ms": latency_ms}
+    
+    @staticmethod
+    async def _probe() -> Dict:
+        client = await get_mongo_client()
+        checks = {
+            "mongo_ping": await HealthService._timed_check(client.admin.command("ping")),
+            "master_query": await HealthService._timed_check(
+                MasterRepository.find_organization_by_name(_PROBE_ORGANIZATION_NAME)
+            )
+        }
+        ready = all(check["status"] == "ok" for check in checks.values())
+        return {
+            "status": "ready" if ready else "not_ready",
+            "latency_threshold_ms": settings.readiness_latency_threshold_ms,
+            "checks": checks
+        }
+    
+    @staticmethod
+    async def check_readiness() -> Dict:
+        """
+        Return the readiness of this worker's dependencies. Results are
+        reused for readiness_cache_seconds, and concurrent callers share a
+        single in-flight probe, so frequent probing adds no load.
+        """
+        now = time.monotonic()
+        if (
+            HealthService._last_result is not None
+            and now - HealthService._last_checked < settings.readiness_cache_seconds
+        ):
+            return HealthService._last_result
+        
+        if HealthService._in_flight is None:
+            HealthService._in_flight = asyncio.ensure_future(HealthService._probe())
+        in_flight = HealthService._in_flight
+        try:
+            result = await asyncio.shield(in_flight)
+        finally:
+            if HealthService._in_flight is in_flight and in_flight.done():
+                HealthService._in_flight = None
+        
+        if HealthService._last_result is not result:
+            HealthService._last_result = result
+            HealthService._last_checked = time.monotonic()
+        return result
@@ -0,0 +1,248 @@
+import asyncio
+import logging
+import os
+import socket
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+from app.core.config import settings
+from app.repositories.job_repo import JobRepository
+from app.repositories.master_repo import MasterRepository
+from app.services.org_service import OrgService
+from app.auth.password import hash_password_async
+from app.utils.helpers import normalize_organization_name
+
+logger = logging.getLogger(__name__)
+
+# Migration checkpoint fields exposed as job progress
+PROGRESS_FIELDS = ("status", "copied", "total_estimate", "replayed", "docs_per_sec", "eta_seconds")
+
+
+# Handlers may run again after an attempt that did its work but died before
+# the job was marked completed, so they look the organization up by record
+# ID and treat work that is already done as success.
+
+async def _find_job_organization(params: Dict) -> Optional[Dict]:
+    # Jobs queued before organization_id was recorded only carry the name
+    if "organization_id" in params:
+        return await MasterRepository.find_organization_by_id(params["organization_id"])
+    return await MasterRepository.find_organization_by_name(params["organization_name"])
+
+
+async def _update_organization(params: Dict, report: Callable[[Dict], Awaitable[None]]) -> Dict:
+    org = await _find_job_organization(params)
+    if not org or org.get("deleted_at"):
+        raise ValueError(f"Organization '{params['organization_name']}' not found")
+    
+    new_organization_name = params.get("new_organization_name")
+    if new_organization_name and (
+        normalize_organization_name(new_organization_name)
+        == normalize_organization_name(org["organization_name"])
+    ):
+        # Renamed by an earlier attempt; email and password are safe to reapply
+        new_organization_name = None
+    
+    org = await OrgService.update_organization(
+        org["organization_name"],
+        new_organization_name,
+        params.get("email"),
+        hashed_password=params.get("hashed_password"),
+        progress_callback=report
+    )
+    return {"organization_name": org["organization_name"], "collection_name": org["collection_name"]}
+
+
+async def _delete_organization(params: Dict, report: Callable[[Dict], Awaitable[None]]) -> Dict:
+    org = await _find_job_organization(params)
+    if "organization_id" in params:
+        if org is None:
+            # Deleted and already reclaimed
+            return {"deleted": True}
+        if org.get("deleted_at"):
+            # Tombstoned by an earlier attempt, which may have stopped before
+            # detaching the admin when transactions are unavailable
+            await MasterRepository.detach_admin(org["admin"]["admin_id"], org["organization_name"])
+            return {"deleted": True}
+    if org is None:
+        raise ValueError(f"Organization '{params['organization_name']}' not found")
+    
+    deleted = await OrgService.delete_organization(org["organization_name"])
+    return {"deleted": deleted}
+
+
+# Job type -> handler(params, report). A handler raises ValueError for
+# failures that a retry cannot fix; any other exception is retried.
+JOB_HANDLERS: Dict[str, Callable[[Dict, Callable[[Dict], Awaitable[None]]], Awaitable[Any]]] = {
+    "update_organization": _update_organization,
+    "delete_organization": _delete_organization,
+}
+
+
+class JobConflict(ValueError):
+    """Raised when an organization already has a queued or running job."""
+
+
+class JobService:
+    """Service layer for submitting and inspecting background jobs."""
+    
+    _worker_tasks: List[asyncio.Task] = []
+    
+    @staticmethod
+    async def _submit(job_type: str, params: Dict, organization_name: str, admin_id: str) -> Dict:
+        try:
+            return await JobRepository.create_job(job_type, params, organization_name, admin_id)
+        except DuplicateKeyError:
+            raise JobConflict(f"Another operation on organization '{organization_name}' is already in progress")
+    
+    @staticmethod
+    async def submit_update_organization(
+        organization_name: str,
+        admin_id: str,
+        new_organization_name: Optional[str] = None,
+        email: Optional[str] = None,
+        password: Optional[str] = None
+    ) -> Dict:
+        """
+        Queue an organization update. Checks that can fail fast run here;
+        the password is hashed up front so it is never stored in the job.
+        """
+        org = await MasterRepository.find_organization_by_name(organization_name)
+        if not org:
+            raise ValueError(f"Organization '{organization_name}' not found")
+        if new_organization_name and new_organization_name.lower() != organization_name.lower():
+            if await MasterRepository.find_organization_by_name(new_organization_name):
+                raise ValueError(f"Organization '{new_organization_name}' already exists")
+        
+        params = {
+            "organization_id": org["_id"],
+            "organization_name": organization_name,
+            "new_organization_name": new_organization_name,
+            "email": email
+        }
+        if password:
+            params["hashed_password"] = await hash_password_async(password)
+        return await JobService._submit("update_organization", params, organization_name, admin_id)
+    
+    @staticmethod
+    async def submit_delete_organization(organization_name: str, admin_id: str) -> Dict:
+        """Queue an organization delete."""
+        org = await MasterRepository.find_organization_by_name(organization_name)
+        if not org:
+            raise ValueError(f"Organization '{organization_name}' not found")
+        return await JobService._submit(
+            "delete_organization",
+            {"organization_id": org["_id"], "organization_name": organization_name},
+            organization_name,
+            admin_id
+        )
+    
+    @staticmethod
+    async def get_job(job_id: str, admin_id: str) -> Dict:
+        """Get a job submitted by this admin."""
+        job = await JobRepository.get_job(job_id)
+        if not job or job.get("admin_id") != admin_id:
+            raise ValueError(f"Job '{job_id}' not found")
+        return job
+    
+    @staticmethod
+    def start_workers(count: Optional[int] = None) -> None:
+        """
+        Start in-process job workers. Without jobs_async_enabled no jobs are
+        submitted, so none are started unless count is given explicitly.
+        """
+        if count is None:
+            count = settings.job_workers if settings.jobs_async_enabled else 0
+        for _ in range(count - len(JobService._worker_tasks)):
+            JobService._worker_tasks.append(asyncio.create_task(JobWorker().run()))
+    
+    @staticmethod
+    async def stop_workers() -> None:
+        """Cancel in-process job workers; their running jobs are handed back to the queue."""
+        tasks, JobService._worker_tasks = JobService._worker_tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class JobWorker:
+    """
+    Runs queued jobs one at a time.
+    
+    While a handler runs, the worker renews the job's lease every third of
+    job_lease_seconds and saves its progress. If a worker dies, its lease
+    expires and another worker claims the job again, up to job_max_attempts
+    attempts. A worker that finds its lease taken over cancels its handler.
+    """
+    
+    def __init__(self, worker_id: Optional[str] = None):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{ObjectId()}"
+    
+    async def run(self) -> None:
+        """Poll for jobs until cancelled."""
+        while True:
+            try:
+                claimed = await self.run_once()
+            except Exception as e:
+                logger.error(f"Job worker {self.worker_id} failed to process a job: {e}")
+                claimed = False
+            if not claimed:
+                await asyncio.sleep(settings.job_poll_interval_seconds)
+    
+    async def run_once(self) -> bool:
+        """Claim and run one job. Returns False if there was nothing to do."""
+        job = await JobRepository.claim_job(self.worker_id, settings.job_lease_seconds)
+        if job is None:
+            return False
+        await self._run(job)
+        return True
+    
+    async def _finish(self, job: Dict, status: str, **fields) -> None:
+        if not await JobRepository.finish_job(job["_id"], self.worker_id, status, **fields):
+            logger.warning(f"Job {job['_id']} was taken over before it finished on {self.worker_id}")
+    
+    async def _run(self, job: Dict) -> None:
+        handler = JOB_HANDLERS.get(job["type"])
+        if handler is None:
+            await self._finish(job, "failed", error=f"Unknown job type '{job['type']}'")
+            return
+        if job["attempts"] > settings.job_max_attempts:
+            await self._finish(job, "failed", error=f"Gave up after {settings.job_max_attempts} attempts")
+            return
+        
+        progress = dict(job.get("progress") or {})
+        
+        async def report(checkpoint: Dict) -> None:
+            progress.update({k: checkpoint[k] for k in PROGRESS_FIELDS if k in checkpoint})
+        
+        logger.info(f"Running job {job['_id']} ({job['type']}), attempt {job['attempts']}")
+        task = asyncio.create_task(handler(job["params"], report))
+        try:
+            while not task.done():
+                await asyncio.wait({task}, timeout=settings.job_lease_seconds / 3)
+                if task.done():
+                    break
+                renewed = await JobRepository.renew_lease(
+                    job["_id"], self.worker_id, settings.job_lease_seconds, progress
+                )
+                if not renewed:
+                    logger.warning(f"Lost the lease on job {job['_id']}; abandoning it")
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+                    return
+            result = task.result()
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back rather than wait for the lease to expire
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await self._finish(job, "queued", error="Worker shut down", progress=progress)
+            raise
+        except ValueError as e:
+            await self._finish(job, "failed", error=str(e), progress=progress)
+            return
+        except Exception as e:
+            retry = job["attempts"] < settings.job_max_attempts
+            logger.error(f"Job {job['_id']} failed: {e}")
+            await self._finish(job, "queued" if retry else "failed", error=str(e), progress=progress)
+            return
+        
+        await self._finish(job, "completed", result=result, progress=progress)
@@ -1,13 +1,67 @@
-from typing import Optional, Dict
-from datetime import datetime
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Dict, Tuple
+from datetime import datetime, timedelta
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 from app.repositories.master_repo import MasterRepository
 from app.repositories.org_repo import OrgRepository
-from app.utils.helpers import sanitize_organization_name, validate_collection_name
-from app.auth.password import hash_password, verify_password
+from app.db.mongo import start_transaction
+from app.services.pool_service import CollectionPoolService
+from app.utils.helpers import (
+    sanitize_organization_name, validate_collection_name,
+    normalize_organization_name, encode_page_cursor, decode_page_cursor,
+    tenant_collection_name, trash_collection_name
+)
+from app.auth.password import hash_password_async, verify_password_async, password_hash_workers
+from app.core.config import settings
+from app.utils.admission import AdmissionController
+from app.utils.timing import timed_methods
 from app.models.schemas import OrgMetadata, AdminInfo
 
 
+# Bounds concurrent password checks on login so a burst of logins cannot
+# monopolize every core; excess logins fail fast with AdmissionRejected.
+login_admission = AdmissionController(
+    "login",
+    max_concurrency=settings.login_max_concurrency or password_hash_workers(),
+    max_queue=settings.login_max_queue,
+    queue_timeout_seconds=settings.login_queue_timeout_seconds,
+    retry_after_seconds=settings.login_retry_after_seconds
+)
+
+
+# Fields of an organization record that /org/list can return
+ORG_LIST_FIELDS = ("organization_name", "collection_name", "admin", "created_at")
+
+
+def _list_projection(fields: Optional[List[str]]) -> Dict:
+    """Build the projection for organization listings; organization_key is the page cursor."""
+    fields = fields or list(ORG_LIST_FIELDS)
+    unknown = sorted(set(fields) - set(ORG_LIST_FIELDS))
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    projection = {field: 1 for field in fields}
+    projection["organization_key"] = 1
+    return projection
+
+
+def _new_tenant_collection(organization_name: str) -> Tuple[Optional[str], str]:
+    """Pick the tenant ID (None for name-derived) and collection name of a new organization."""
+    if settings.tenant_collection_naming == "id":
+        tenant_id = str(ObjectId())
+        return tenant_id, tenant_collection_name(tenant_id)
+    return None, sanitize_organization_name(organization_name)
+
+
+def _duplicate_key_message(error: DuplicateKeyError, organization_name: str, email: str) -> str:
+    """Translate a unique index violation into a client-facing message."""
+    key_pattern = (error.details or {}).get("keyPattern", {})
+    if "email" in key_pattern:
+        return f"Admin email '{email.lower()}' is already registered"
+    return f"Organization '{organization_name}' already exists"
+
+
+@timed_methods
 class OrgService:
     """Service layer for organization business logic."""
     
@@ -17,16 +71,21 @@ class OrgService:
         if existing:
             raise ValueError(f"Organization '{organization_name}' already exists")
         
-        collection_name = sanitize_organization_name(organization_name)
+        tenant_id, collection_name = _new_tenant_collection(organization_name)
         
         if not validate_collection_name(collection_name):
             raise ValueError(f"Invalid collection name generated: {collection_name}")
         
-        if await OrgRepository.collection_exists(collection_name):
-            raise ValueError(f"Collection '{collection_name}' already exists")
-        
         admin_id = str(ObjectId())
-        hashed_password = hash_password(password)
+        hashed_password = await hash_password_async(password)
+        
+        # Prefer a pre-created collection from the pool; fall back to
+        # creating one inline when the pool is disabled or empty
+        pooled_collection = await CollectionPoolService.claim()
+        if pooled_collection:
+            tenant_id, collection_name = pooled_collection["tenant_id"], pooled_collection["_id"]
+        elif await OrgRepository.collection_exists(collection_name):
+            raise ValueError(f"Collection '{collection_name}' already exists")
         
         admin_data = {
             "_id": ObjectId(admin_id),
@@ -46,39 +105,224 @@ class OrgService:
             },
             "created_at": datetime.utcnow()
         }
+        if tenant_id:
+            org_data["tenant_id"] = tenant_id
         
+        # In a transaction the two inserts commit or abort together. Without
+        # one, a failed organization insert is compensated by record ID so a
+        # concurrent create of the same name never removes the records of
+        # the organization that won the race.
         try:
-            await MasterRepository.create_admin(admin_data)
-            org_record = await MasterRepository.create_organization(org_data)
-            
-            collection_created = await OrgRepository.create_collection(collection_name)
-            if not collection_created:
-                await MasterRepository.delete_organization(organization_name)
-                await MasterRepository.delete_admin_by_org(organization_name)
-                raise RuntimeError("Failed to create organization collection")
-            
-            return org_record
+            async with start_transaction() as session:
+                await MasterRepository.create_admin(admin_data, session=session)
+                try:
+                    org_record = await MasterRepository.create_organization(org_data, session=session)
+                except Exception:
+                    if session is None:
+                        await MasterRepository.delete_admin(admin_id)
+                    raise
         except Exception as e:
-            await MasterRepository.delete_organization(organization_name)
-            await MasterRepository.delete_admin_by_org(organization_name)
-            raise e
+            if pooled_collection:
+                await CollectionPoolService.release(pooled_collection)
+            if isinstance(e, DuplicateKeyError):
+                raise ValueError(_duplicate_key_message(e, organization_name, email))
+            raise
+        
+        # Collection DDL stays outside the transaction
+        collection_created = bool(pooled_collection) or await OrgRepository.create_collection(collection_name)
+        if not collection_created:
+            async with start_transaction() as session:
+                await MasterRepository.delete_organization_by_id(org_record["_id"], session=session)
+                await MasterRepository.delete_admin(admin_id, session=session)
+            raise RuntimeError("Failed to create organization collection")
+        
+        # Drop any cached "not found" for the new name
+        MasterRepository.invalidate_organization_cache(organization_name)
+        
+        return org_record
+    
+    @staticmethod
+    async def bulk_create_organizations(items: List[Dict]) -> List[Dict]:
+        """
+        Create many organizations with a fixed number of master round trips
+        regardless of batch size. Each item is a dict with organization_name,
+        email and password. Returns one result per item, in order, with
+        status "created" (and the organization record) or "failed" (and an
+        error); items fail independently.
+        """
+        if len(items) > settings.org_bulk_create_max_items:
+            raise ValueError(f"At most {settings.org_bulk_create_max_items} organizations per request")
+        
+        results = [
+            {"index": i, "organization_name": item["organization_name"], "status": "pending"}
+            for i, item in enumerate(items)
+        ]
+        
+        def fail(i: int, error: str):
+            results[i]["status"] = "failed"
+            results[i]["error"] = error
+        
+        def pending() -> List[int]:
+            return [r["index"] for r in results if r["status"] == "pending"]
+        
+        # Validate and reject duplicates within the batch
+        collection_names, tenant_ids = {}, {}
+        seen_keys, seen_emails, seen_collections = set(), set(), set()
+        for i, item in enumerate(items):
+            key = normalize_organization_name(item["organization_name"])
+            email = item["email"].lower()
+            tenant_ids[i], collection_name = _new_tenant_collection(item["organization_name"])
+            collection_names[i] = collection_name
+            if not validate_collection_name(collection_name):
+                fail(i, f"Invalid collection name generated: {collection_name}")
+            elif key in seen_keys:
+                fail(i, f"Organization '{item['organization_name']}' appears more than once in the request")
+            elif email in seen_emails:
+                fail(i, f"Admin email '{email}' appears more than once in the request")
+            elif collection_name in seen_collections:
+                fail(i, f"Collection '{collection_name}' would be shared with another organization in the request")
+            seen_keys.add(key)
+            seen_emails.add(email)
+            seen_collections.add(collection_name)
+        
+        # Uniqueness against existing data: one $in query per collection
+        candidates = pending()
+        taken_keys, taken_emails, taken_collections = await asyncio.gather(
+            MasterRepository.find_existing_organization_keys(
+                [items[i]["organization_name"] for i in candidates]
+            ),
+            MasterRepository.find_existing_admin_emails([items[i]["email"] for i in candidates]),
+            OrgRepository.find_existing_collections([collection_names[i] for i in candidates])
+        )
+        taken_keys, taken_emails, taken_collections = set(taken_keys), set(taken_emails), set(taken_collections)
+        for i in candidates:
+            if normalize_organization_name(items[i]["organization_name"]) in taken_keys:
+                fail(i, f"Organization '{items[i]['organization_name']}' already exists")
+            elif items[i]["email"].lower() in taken_emails:
+                fail(i, f"Admin email '{items[i]['email'].lower()}' is already registered")
+            elif collection_names[i] in taken_collections:
+                fail(i, f"Collection '{collection_names[i]}' already exists")
+        
+        # Hash passwords in parallel on the password executor
+        candidates = pending()
+        hashed_passwords = await asyncio.gather(
+            *(hash_password_async(items[i]["password"]) for i in candidates)
+        )
+        
+        now = datetime.utcnow()
+        admins, orgs = {}, {}
+        for i, hashed_password in zip(candidates, hashed_passwords):
+            admin_id = ObjectId()
+            email = items[i]["email"].lower()
+            admins[i] = {
+                "_id": admin_id,
+                "admin_id": str(admin_id),
+                "email": email,
+                "password": hashed_password,
+                "organization_name": items[i]["organization_name"],
+                "created_at": now
+            }
+            orgs[i] = {
+                "_id": ObjectId(),
+                "organization_name": items[i]["organization_name"],
+                "collection_name": collection_names[i],
+                "admin": {"admin_id": str(admin_id), "email": email}
+            }
+            if tenant_ids[i]:
+                orgs[i]["tenant_id"] = tenant_ids[i]
+        
+        # Batch-insert admins, then organizations for the admins that made it
+        failures = await MasterRepository.create_admins([admins[i] for i in candidates])
+        for position, error in failures.items():
+            fail(candidates[position], f"Failed to create admin: {error}")
+        
+        candidates = pending()
+        failures = await MasterRepository.create_organizations([orgs[i] for i in candidates])
+        for position, error in failures.items():
+            fail(candidates[position], f"Failed to create organization: {error}")
+        await MasterRepository.delete_admins(
+            [admins[candidates[position]]["admin_id"] for position in failures]
+        )
+        
+        # Create tenant collections concurrently
+        candidates = pending()
+        semaphore = asyncio.Semaphore(settings.org_bulk_create_concurrency)
+        
+        async def create_collection(i: int) -> bool:
+            async with semaphore:
+                return await OrgRepository.create_collection(collection_names[i])
+        
+        created = await asyncio.gather(*(create_collection(i) for i in candidates))
+        rollback = [i for i, ok in zip(candidates, created) if not ok]
+        for i in rollback:
+            fail(i, "Failed to create organization collection")
+        await MasterRepository.delete_organizations_by_ids([orgs[i]["_id"] for i in rollback])
+        await MasterRepository.delete_admins([admins[i]["admin_id"] for i in rollback])
+        
+        for i in pending():
+            results[i]["status"] = "created"
+            results[i]["organization"] = orgs[i]
+        
+        # Drop any cached "not found" for the new names
+        MasterRepository.invalidate_organization_cache(
+            *(items[i]["organization_name"] for i in range(len(items)) if results[i]["status"] == "created")
+        )
+        return results
     
     @staticmethod
     async def get_organization(organization_name: str) -> Dict:
         """Get organization metadata."""
-        org = await MasterRepository.find_organization_by_name(organization_name)
+        org = await MasterRepository.find_organization_by_name_cached(organization_name)
         if not org:
             raise ValueError(f"Organization '{organization_name}' not found")
         return org
     
+    @staticmethod
+    async def list_organizations(
+        cursor: Optional[str],
+        limit: int,
+        fields: Optional[List[str]] = None
+    ) -> Dict:
+        """List one page of organizations; next_cursor is None on the last page."""
+        projection = _list_projection(fields)
+        after_key = decode_page_cursor(cursor) if cursor else None
+        
+        # Fetch one extra record to learn whether another page exists
+        orgs = await MasterRepository.list_organizations_page(after_key, limit + 1, projection)
+        next_cursor = None
+        if len(orgs) > limit:
+            orgs = orgs[:limit]
+            next_cursor = encode_page_cursor(orgs[-1]["organization_key"])
+        
+        return {"organizations": orgs, "next_cursor": next_cursor}
+    
+    @staticmethod
+    def stream_organizations(
+        cursor: Optional[str],
+        fields: Optional[List[str]] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Stream every organization after cursor. Arguments are validated
+        eagerly so errors surface before a response starts streaming.
+        """
+        projection = _list_projection(fields)
+        after_key = decode_page_cursor(cursor) if cursor else None
+        return MasterRepository.iter_organizations(after_key, projection)
+    
     @staticmethod
     async def update_organization(
         organization_name: str,
         new_organization_name: Optional[str] = None,
         email: Optional[str] = None,
-        password: Optional[str] = None
+        password: Optional[str] = None,
+        hashed_password: Optional[str] = None,
+        progress_callback: Optional[Callable[[Dict], Awaitable[None]]] = None
     ) -> Dict:
-        """Update organization metadata and optionally rename/migrate collection."""
+        """
+        Update organization metadata and optionally rename/migrate collection.
+        hashed_password replaces password for callers that hashed it already;
+        progress_callback receives collection migration checkpoints.
+        """
         # Get existing organization
         org = await MasterRepository.find_organization_by_name(organization_name)
         if not org:
@@ -94,25 +338,61 @@ class OrgService:
             if existing:
                 raise ValueError(f"Organization '{new_organization_name}' already exists")
             
-            # Sanitize new collection name
-            new_collection_name = sanitize_organization_name(new_organization_name)
-            old_collection_name = org["collection_name"]
-            
-            # Migrate collection
-            migration_success = await OrgRepository.migrate_collection(
-                old_collection_name,
-                new_collection_name
-            )
-            
-            if not migration_success:
-                raise RuntimeError("Failed to migrate organization collection")
-            
-            # Drop old collection
-            await OrgRepository.drop_collection(old_collection_name)
+            # Collections keyed by tenant ID keep their name; only
+            # name-derived collections have to move
+            if not org.get("tenant_id"):
+                # Sanitize new collection name
+                new_collection_name = sanitize_organization_name(new_organization_name)
+                old_collection_name = org["collection_name"]
+                
+                # A previous attempt (a retried job) may have switched the
+                # record to the new collection at cutover, or moved the
+                # collection, and stopped before updating the metadata
+                switched = old_collection_name == new_collection_name
+                if switched:
+                    old_collection_name = sanitize_organization_name(organization_name)
+                if old_collection_name == new_collection_name:
+                    already_moved = True
+                elif switched:
+                    # The migration may have failed after the cutover (in
+                    # its final replay); unless it completed, resume it
+                    # before dropping the old collection
+                    already_moved = await OrgRepository.migration_completed(
+                        old_collection_name, new_collection_name
+                    )
+                else:
+                    already_moved = (
+                        not await OrgRepository.collection_exists(old_collection_name)
+                        and await OrgRepository.collection_exists(new_collection_name)
+                    )
+                if not already_moved:
+                    async def cutover():
+                        # Writers resolve the collection from the record;
+                        # writes that reached the old one before this
+                        # switch are replayed by the migration
+                        await MasterRepository.update_organization(
+                            organization_name, {"collection_name": new_collection_name}
+                        )
+                        MasterRepository.invalidate_organization_cache(organization_name)
+                    
+                    # Migrate collection
+                    migration_success = await OrgRepository.migrate_collection(
+                        old_collection_name,
+                        new_collection_name,
+                        progress_callback,
+                        cutover
+                    )
+                    
+                    if not migration_success:
+                        raise RuntimeError("Failed to migrate organization collection")
+                
+                # Drop old collection
+                if old_collection_name != new_collection_name:
+                    await OrgRepository.drop_collection(old_collection_name)
+                update_data["collection_name"] = new_collection_name
             
             # Update organization metadata
             update_data["organization_name"] = new_organization_name
-            update_data["collection_name"] = new_collection_name
             admin_update_data["organization_name"] = new_organization_name
         
         # Handle email update
@@ -121,53 +401,176 @@ class OrgService:
             admin_update_data["email"] = email.lower()
         
         # Handle password update
-        if password:
-            hashed_password = hash_password(password)
+        if password and not hashed_password:
+            hashed_password = await hash_password_async(password)
+        if hashed_password:
             admin_update_data["password"] = hashed_password
         
-        # Update organization record
-        if update_data:
-            updated_org = await MasterRepository.update_organization(organization_name, update_data)
-            if not updated_org:
-                raise RuntimeError("Failed to update organization")
-            org = updated_org
-        
-        # Update admin record
-        if admin_update_data:
-            admin_id = org["admin"]["admin_id"]
-            updated_admin = await MasterRepository.update_admin(admin_id, admin_update_data)
-            if not updated_admin:
-                raise RuntimeError("Failed to update admin")
-        
-        # Refresh org data to get latest state
-        final_org_name = update_data.get("organization_name", organization_name)
-        if final_org_name != organization_name or update_data:
-            org = await MasterRepository.find_organization_by_name(final_org_name)
-            if not org:
-                raise RuntimeError("Failed to refresh organization data after update")
+        try:
+            # Both records change in one transaction where supported.
+            # find_one_and_update returns the post-update document, so
+            # no refresh read is needed.
+            async with start_transaction() as session:
+                if update_data:
+                    updated_org = await MasterRepository.update_organization(
+                        organization_name, update_data, session=session
+                    )
+                    if not updated_org:
+                        raise RuntimeError("Failed to update organization")
+                    org = updated_org
+                
+                if admin_update_data:
+                    admin_id = org["admin"]["admin_id"]
+                    updated_admin = await MasterRepository.update_admin(
+                        admin_id, admin_update_data, session=session
+                    )
+                    if not updated_admin:
+                        raise RuntimeError("Failed to update admin")
+        finally:
+            MasterRepository.invalidate_organization_cache(organization_name)
+            if new_organization_name:
+                MasterRepository.invalidate_organization_cache(new_organization_name)
         
         return org
     
     @staticmethod
     async def delete_organization(organization_name: str) -> bool:
-        """Delete organization and its collection."""
-        # Get organization
+        """
+        Soft-delete an organization. Its record becomes a tombstone that no
+        lookup matches, and its collection is left for the reclaimer to drop
+        after org_delete_retention_seconds. A name-derived collection is
+        renamed out of the way first so the name can be reused at once.
+        """
         org = await MasterRepository.find_organization_by_name(organization_name)
         if not org:
             raise ValueError(f"Organization '{organization_name}' not found")
         
         collection_name = org["collection_name"]
+        parked_collection_name = collection_name
+        if not org.get("tenant_id"):
+            trash_name = trash_collection_name(org["_id"])
+            # The trash collection already exists if a previous attempt
+            # renamed it and stopped before writing the tombstone
+            if (
+                await OrgRepository.rename_collection(collection_name, trash_name)
+                or await OrgRepository.collection_exists(trash_name)
+            ):
+                parked_collection_name = trash_name
+        
+        purge_after = datetime.utcnow() + timedelta(seconds=settings.org_delete_retention_seconds)
+        async with start_transaction() as session:
+            tombstone = await MasterRepository.tombstone_organization(
+                org["_id"], org["organization_name"], parked_collection_name, purge_after, session=session
+            )
+            if tombstone:
+                await MasterRepository.detach_admin(
+                    org["admin"]["admin_id"], org["organization_name"], session=session
+                )
+        
+        if not tombstone:
+            # Deleted concurrently; put the collection back where it was
+            if parked_collection_name != collection_name:
+                await OrgRepository.rename_collection(parked_collection_name, collection_name)
+            raise ValueError(f"Organization '{organization_name}' not found")
+        
+        MasterRepository.invalidate_organization_cache(organization_name)
+        
+        return True
+    
+    @staticmethod
+    async def undelete_organization(organization_name: str) -> Dict:
+        """Restore the most recently deleted organization with this name."""
+        tombstones = await MasterRepository.find_deleted_organizations(organization_name)
+        if not tombstones:
+            raise ValueError(f"No deleted organization '{organization_name}' to restore")
+        org = tombstones[0]
+        
+        if await MasterRepository.find_organization_by_name(organization_name):
+            raise ValueError(f"Organization '{organization_name}' already exists")
+        
+        parked_collection_name = org["collection_name"]
+        collection_name = parked_collection_name
+        if parked_collection_name == trash_collection_name(org["_id"]):
+            collection_name = sanitize_organization_name(org["organization_name"])
+            if await OrgRepository.collection_exists(collection_name):
+                raise ValueError(f"Collection '{collection_name}' already exists")
+            if not await OrgRepository.rename_collection(parked_collection_name, collection_name):
+                raise RuntimeError(f"Failed to restore collection '{parked_collection_name}'")
+        
+        try:
+            restored = await MasterRepository.restore_organization(org["_id"], collection_name)
+        except DuplicateKeyError:
+            restored = None
+        if not restored:
+            if collection_name != parked_collection_name:
+                await OrgRepository.rename_collection(collection_name, parked_collection_name)
+            raise ValueError(
+                f"Organization '{organization_name}' cannot be restored: "
+                "its name was taken or it is being reclaimed"
+            )
+        
+        await MasterRepository.reattach_admin(org["admin"]["admin_id"])
+        MasterRepository.invalidate_organization_cache(organization_name)
+        return restored
+    
+    @staticmethod
+    async def migrate_to_tenant_id(org: Dict) -> Optional[Dict]:
+        """
+        Move a name-derived tenant collection to a collection keyed by a new
+        tenant ID, after which renames are metadata-only. The ID is reserved
+        on the record first, so re-running after a crash resumes the same
+        migration. Returns the updated record, or None if the organization
+        was deleted meanwhile.
+        """
+        tenant_id = await MasterRepository.reserve_tenant_id(org["_id"], str(ObjectId()))
+        if tenant_id is None:
+            return None
+        
+        old_collection_name = org["collection_name"]
+        new_collection_name = tenant_collection_name(tenant_id)
         
-        # Drop collection
-        await OrgRepository.drop_collection(collection_name)
+        # A previous run may have renamed the collection and stopped before
+        # updating the record
+        already_moved = (
+            await OrgRepository.collection_exists(new_collection_name)
+            and not await OrgRepository.collection_exists(old_collection_name)
+        )
+        switched = {}
         
-        # Delete admin
-        await MasterRepository.delete_admin_by_org(organization_name)
+        async def cutover():
+            # Writers follow the record to the new collection; writes that
+            # reached the old one before this are replayed by the migration
+            switched["org"] = await MasterRepository.set_tenant_id(
+                org["_id"], old_collection_name, tenant_id, new_collection_name
+            )
+            MasterRepository.invalidate_organization_cache(org["organization_name"])
+        
+        if already_moved:
+            await cutover()
+        else:
+            migration_success = await OrgRepository.migrate_collection(
+                old_collection_name,
+                new_collection_name,
+                cutover=cutover
+            )
+            if not migration_success:
+                raise RuntimeError(f"Failed to migrate collection '{old_collection_name}'")
+            if "org" not in switched:
+                # The old collection was gone, so nothing was migrated
+                await cutover()
         
-        # Delete organization
-        deleted = await MasterRepository.delete_organization(organization_name)
+        updated_org = switched["org"]
+        if not updated_org:
+            if await MasterRepository.find_organization_by_id(org["_id"]) is None:
+                await OrgRepository.drop_collection(new_collection_name)
+                return None
+            raise RuntimeError(
+                f"Organization '{org['organization_name']}' changed during migration; "
+                f"'{new_collection_name}' was left in place"
+            )
         
-        return deleted
+        await OrgRepository.drop_collection(old_collection_name)
+        return updated_org
     
     @staticmethod
     async def authenticate_admin(email: str, password: str) -> Optional[Dict]:
@@ -176,12 +579,19 @@ class OrgService:
         if not admin:
             return None
         
-        if not verify_password(password, admin["password"]):
+        async with login_admission.slot():
+            password_valid = await verify_password_async(password, admin["password"])
+        if not password_valid:
+            return None
+        
+        # Admins of deleted organizations are detached; a new organization
+        # may have taken the name since, and it belongs to its own admin
+        if not admin.get("organization_key") or "deleted_organization_key" in admin:
             return None
         
         # Get organization info
-        org = await MasterRepository.find_organization_by_name(admin["organization_name"])
-        if not org:
+        org = await MasterRepository.find_organization_by_name_cached(admin["organization_name"])
+        if not org or org["admin"]["admin_id"] != admin["admin_id"]:
             return None
         
         return {
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+from typing import Dict, Optional
+from bson import ObjectId
+from app.core.config import settings
+from app.repositories.org_repo import OrgRepository
+from app.repositories.pool_repo import CollectionPoolRepository
+from app.utils.helpers import tenant_collection_name
+
+logger = logging.getLogger(__name__)
+
+
+class CollectionPoolService:
+    """
+    Keeps up to tenant_pool_size empty, indexed tenant collections ready,
+    so signup claims one instead of running DDL on the request path.
+    Pooled collections are keyed by a tenant ID, like collections created
+    under the "id" naming scheme, whatever tenant_collection_naming is.
+    
+    Every worker refills independently, so the pool can briefly overshoot
+    its size by a few collections; that is harmless. A crash between creating
+    a collection and registering it leaves an unused org_t_* collection.
+    """
+    
+    _refill_task: Optional[asyncio.Task] = None
+    
+    @staticmethod
+    def enabled() -> bool:
+        return settings.tenant_pool_size > 0
+    
+    @staticmethod
+    async def claim() -> Optional[Dict]:
+        """
+        Take a collection out of the pool. Returns its pool entry, with the
+        collection name as _id and its tenant_id, or None if the pool is
+        disabled or empty.
+        """
+        if not CollectionPoolService.enabled():
+            return None
+        try:
+            return await CollectionPoolRepository.claim()
+        except Exception as e:
+            logger.error(f"Failed to claim pooled collection: {e}")
+            return None
+    
+    @staticmethod
+    async def release(entry: Dict) -> None:
+        """Return a claimed collection that ended up unused."""
+        try:
+            await CollectionPoolRepository.add(entry["_id"], entry["tenant_id"])
+        except Exception as e:
+            logger.error(f"Failed to return '{entry['_id']}' to the pool: {e}")
+    
+    @staticmethod
+    async def refill() -> int:
+        """Create collections until the pool is full. Returns how many were added."""
+        missing = settings.tenant_pool_size - await CollectionPoolRepository.count()
+        added = 0
+        for _ in range(max(missing, 0)):
+            tenant_id = str(ObjectId())
+            collection_name = tenant_collection_name(tenant_id)
+            if not await OrgRepository.create_collection(collection_name):
+                logger.error(f"Failed to create pooled collection '{collection_name}'")
+                break
+            await CollectionPoolRepository.add(collection_name, tenant_id)
+            added += 1
+        if added:
+            logger.info(f"Added {added} collection(s) to the tenant collection pool")
+        return added
+    
+    @staticmethod
+    async def _refill_loop() -> None:
+        while True:
+            try:
+                await CollectionPoolService.refill()
+            except Exception as e:
+                logger.error(f"Tenant collection pool refill failed: {e}")
+            await asyncio.sleep(settings.tenant_pool_refill_interval_seconds)
+    
+    @staticmethod
+    def start() -> None:
+        """Start the background refill task when the pool is enabled."""
+        if CollectionPoolService.enabled() and CollectionPoolService._refill_task is None:
+            CollectionPoolService._refill_task = asyncio.create_task(CollectionPoolService._refill_loop())
+    
+    @staticmethod
+    async def stop() -> None:
+        """Cancel the background refill task."""
+        task = CollectionPoolService._refill_task
+        CollectionPoolService._refill_task = None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
@@ -0,0 +1,70 @@
+import asyncio
+import logging
+from typing import Optional
+from app.core.config import settings
+from app.repositories.master_repo import MasterRepository
+from app.repositories.org_repo import OrgRepository
+
+logger = logging.getLogger(__name__)
+
+# How long a reclaimer owns a tombstone before another may retry it
+RECLAIM_LEASE_SECONDS = 300.0
+
+
+class ReclaimService:
+    """
+    Purges soft-deleted organizations whose retention window has passed:
+    drops the tenant collection, then deletes the admin and the tombstone.
+    Runs a bounded batch per interval with a pause between drops, so
+    reclaiming space never competes hard with live traffic.
+    """
+    
+    _task: Optional[asyncio.Task] = None
+    
+    @staticmethod
+    async def reclaim(limit: Optional[int] = None) -> int:
+        """Purge up to limit expired tombstones (all of them if limit is 0). Returns how many."""
+        limit = settings.org_reclaim_batch_size if limit is None else limit
+        reclaimed = 0
+        while not limit or reclaimed < limit:
+            org = await MasterRepository.claim_expired_tombstone(RECLAIM_LEASE_SECONDS)
+            if not org:
+                break
+            if not await OrgRepository.drop_collection(org["collection_name"]):
+                # Retried by whichever reclaimer claims it after the lease expires
+                logger.error(f"Failed to drop '{org['collection_name']}' of deleted organization {org['_id']}")
+                continue
+            await MasterRepository.delete_admin(org["admin"]["admin_id"])
+            await MasterRepository.delete_organization_by_id(org["_id"])
+            reclaimed += 1
+            logger.info(f"Reclaimed deleted organization '{org['organization_name']}' ({org['collection_name']})")
+            if settings.org_reclaim_pause_seconds > 0:
+                await asyncio.sleep(settings.org_reclaim_pause_seconds)
+        return reclaimed
+    
+    @staticmethod
+    async def _reclaim_loop() -> None:
+        while True:
+            try:
+                await ReclaimService.reclaim()
+            except Exception as e:
+                logger.error(f"Reclaiming deleted organizations failed: {e}")
+            await asyncio.sleep(settings.org_reclaim_interval_seconds)
+    
+    @staticmethod
+    def start() -> None:
+        """Start the background reclaimer when enabled."""
+        if settings.org_reclaimer_enabled and ReclaimService._task is None:
+            ReclaimService._task = asyncio.create_task(ReclaimService._reclaim_loop())
+    
+    @staticmethod
+    async def stop() -> None:
+        """Cancel the background reclaimer."""
+        task = ReclaimService._task
+        ReclaimService._task = None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
@@ -0,0 +1,142 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, List, Optional
+from app.core.config import settings
+from app.db.indexes import plan_stages
+from app.db.monitoring import collection_label, slow_query_listener
+from app.repositories.slow_query_repo import SlowQueryRepository
+
+logger = logging.getLogger(__name__)
+
+# How often queued slow-query records are explained and written out
+FLUSH_INTERVAL_SECONDS = 1.0
+
+
+def summarize_explain(explain: Dict) -> Dict:
+    """
+    Reduce executionStats explain output to the plan stages and counters.
+    The parsed query and index bounds are left out since they carry the
+    literal values that the record's shape redacts.
+    """
+    if explain.get("stages"):
+        # aggregate: the query planner output sits under the first stage
+        explain = explain["stages"][0].get("$cursor", explain)
+    stages = plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {}))
+    stats = explain.get("executionStats", {})
+    return {
+        "stages": stages,
+        "collscan": "COLLSCAN" in stages,
+        "n_returned": stats.get("nReturned"),
+        "keys_examined": stats.get("totalKeysExamined"),
+        "docs_examined": stats.get("totalDocsExamined"),
+        "execution_time_ms": stats.get("executionTimeMillis")
+    }
+
+
+class SlowQueryService:
+    """
+    Writes the records queued by SlowQueryListener to the JSONL file at
+    slow_query_log_path, or to the capped slow_queries collection. The
+    first slow command of each query shape is explained, then at most once
+    per slow_query_explain_interval_seconds, one explain at a time, so a
+    burst of slow queries cannot turn into a burst of explains.
+    """
+    
+    _task: Optional[asyncio.Task] = None
+    _last_explained: Dict[str, float] = {}
+    _collection_ready = False
+    
+    @staticmethod
+    def enabled() -> bool:
+        return settings.slow_query_threshold_ms > 0
+    
+    @staticmethod
+    def _should_explain(record: Dict) -> bool:
+        if not settings.slow_query_explain_enabled:
+            return False
+        key = f"{record['database']}.{collection_label(record['collection'])}:{record['command']}:{record['shape']}"
+        now = time.monotonic()
+        last = SlowQueryService._last_explained.get(key)
+        if last is not None and now - last < settings.slow_query_explain_interval_seconds:
+            return False
+        if len(SlowQueryService._last_explained) >= 10000:
+            SlowQueryService._last_explained.clear()
+        SlowQueryService._last_explained[key] = now
+        return True
+    
+    @staticmethod
+    async def _explain(record: Dict, command: Optional[Dict]) -> None:
+        if command is None or not SlowQueryService._should_explain(record):
+            return
+        try:
+            explain = await SlowQueryRepository.explain(record["database"], command)
+            record["explain"] = summarize_explain(explain)
+        except Exception as e:
+            record["explain_error"] = str(e)
+    
+    @staticmethod
+    def _append_to_file(path: str, records: List[Dict]) -> None:
+        with open(path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, default=str) + "\n")
+    
+    @staticmethod
+    async def _write(records: List[Dict]) -> None:
+        if settings.slow_query_log_path:
+            await asyncio.to_thread(SlowQueryService._append_to_file, settings.slow_query_log_path, records)
+            return
+        if not SlowQueryService._collection_ready:
+            await SlowQueryRepository.ensure_collection(settings.slow_query_collection_size_bytes)
+            SlowQueryService._collection_ready = True
+        await SlowQueryRepository.insert_records(records)
+    
+    @staticmethod
+    async def flush() -> int:
+        """Explain and write every queued record. Returns how many were written."""
+        pending = slow_query_listener.records
+        records = []
+        while pending:
+            record = pending.popleft()
+            # Stored as canonical JSON: field names such as "$in" are not
+            # valid in every server version's documents, and it doubles as
+            # the grouping key
+            record["shape"] = json.dumps(record["shape"], sort_keys=True, default=str)
+            await SlowQueryService._explain(record, record.pop("_explain"))
+            records.append(record)
+        if records:
+            await SlowQueryService._write(records)
+        return len(records)
+    
+    @staticmethod
+    async def _flush_loop() -> None:
+        while True:
+            try:
+                await SlowQueryService.flush()
+            except Exception as e:
+                logger.error(f"Writing slow-query records failed: {e}")
+            await asyncio.sleep(FLUSH_INTERVAL_SECONDS)
+    
+    @staticmethod
+    def start() -> None:
+        """Start writing slow-query records when the log is enabled."""
+        if SlowQueryService.enabled() and SlowQueryService._task is None:
+            SlowQueryService._task = asyncio.create_task(SlowQueryService._flush_loop())
+    
+    @staticmethod
+    async def stop() -> None:
+        """Cancel the writer and write what is still queued."""
+        task = SlowQueryService._task
+        SlowQueryService._task = None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        try:
+            await SlowQueryService.flush()
+        except Exception as e:
+            logger.error(f"Writing slow-query records failed: {e}")
@@ -1,3 +1,5 @@
+import base64
+import binascii
 import re
 from typing import Optional
 
@@ -40,6 +42,25 @@ def sanitize_organization_name(name: str) -> str:
     return sanitized
 
 
+def tenant_collection_name(tenant_id: str) -> str:
+    """Build the collection name of a tenant keyed by its immutable tenant ID."""
+    return f"org_t_{tenant_id}"
+
+
+def trash_collection_name(org_id: str) -> str:
+    """Build the name a deleted organization's collection is parked under until reclaimed."""
+    return f"org_trash_{org_id}"
+
+
+def normalize_organization_name(name: str) -> str:
+    """
+    Build the normalized lookup key for an organization name.
+    Organization names are unique case-insensitively, so lookups compare
+    this key with exact equality instead of a case-insensitive regex.
+    """
+    return name.lower()
+
+
 def validate_collection_name(name: str) -> bool:
     """Validate if a collection name is valid for MongoDB."""
     if not name or len(name) == 0:
@@ -55,3 +76,17 @@ def validate_collection_name(name: str) -> bool:
     
     return True
 
+
+
+def encode_page_cursor(organization_key: str) -> str:
+    """Encode the last organization_key of a page as an opaque cursor."""
+    return base64.urlsafe_b64encode(organization_key.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_page_cursor(cursor: str) -> str:
+    """Decode a cursor produced by encode_page_cursor. Raises ValueError if malformed."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8')
+    except (binascii.Error, UnicodeError):
+        raise ValueError("Invalid cursor")
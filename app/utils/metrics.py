@@ -0,0 +1,254 @@
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Latency buckets in seconds, from sub-millisecond cache hits to slow migrations
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], labelvalues: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with optional labels. Safe to update from any thread."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0.0)
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for labelvalues, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}"
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed buckets and optional labels.
+    observe() is a bisect and three additions under a lock.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labelvalues -> [per-bucket counts (+Inf last), sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, *labelvalues: str) -> None:
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            entry = self._values.get(labelvalues)
+            if entry is None:
+                entry = self._values[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += seconds
+            entry[2] += 1
+
+    def count(self, *labelvalues: str) -> int:
+        entry = self._values.get(labelvalues)
+        return entry[2] if entry else 0
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = [(labelvalues, list(entry[0]), entry[1], entry[2]) for labelvalues, entry in self._values.items()]
+        for labelvalues, counts, total, count in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labelvalues, le)} {cumulative}"
+            labels = _format_labels(self.labelnames, labelvalues)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+class CallbackMetric:
+    """Gauge or counter whose samples are read from other objects at scrape time."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        metric_type: str,
+        labelnames: Sequence[str],
+        callback: Callable[[], Dict[Tuple[str, ...], float]]
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.type = metric_type
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+
+    def samples(self) -> Iterable[str]:
+        for labelvalues, value in self.callback().items():
+            yield f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}"
+
+
+class Registry:
+    """Set of metrics rendered together in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: List = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and status code.",
+    ("method", "route", "status")
+))
+mongodb_command_duration = registry.register(Histogram(
+    "mongodb_command_duration_seconds",
+    "MongoDB command latency by command and collection.",
+    ("command", "collection")
+))
+mongodb_command_failures = registry.register(Counter(
+    "mongodb_command_failures_total",
+    "MongoDB commands that returned an error.",
+    ("command", "collection")
+))
+mongodb_pool_checkout_duration = registry.register(Histogram(
+    "mongodb_pool_checkout_seconds",
+    "Time spent waiting to check a connection out of the MongoDB pool."
+))
+mongodb_pool_checkout_failures = registry.register(Counter(
+    "mongodb_pool_checkout_failures_total",
+    "Failed MongoDB connection checkouts by reason.",
+    ("reason",)
+))
+password_hash_duration = registry.register(Histogram(
+    "password_hash_seconds",
+    "bcrypt time on the password executor by operation (hash or verify).",
+    ("operation",)
+))
+jwt_verify_duration = registry.register(Histogram(
+    "jwt_verify_seconds",
+    "Token verification time by token cache result (hit or miss).",
+    ("cache",)
+))
+
+
+# Caches and admission controllers exposed at scrape time, by name
+_caches: Dict[str, object] = {}
+_admission_controllers: Dict[str, object] = {}
+
+
+def register_cache(name: str, cache) -> None:
+    """Expose a TTLCache's counters and size as cache_* metrics."""
+    _caches[name] = cache
+
+
+def register_admission_controller(name: str, controller) -> None:
+    """Expose an AdmissionController's occupancy and shed counts as admission_* metrics."""
+    _admission_controllers[name] = controller
+
+
+def _cache_samples(read: Callable[[object], float]) -> Callable[[], Dict[Tuple[str, ...], float]]:
+    return lambda: {(name,): read(cache) for name, cache in list(_caches.items())}
+
+
+def _admission_samples(read: Callable[[object], float]) -> Callable[[], Dict[Tuple[str, ...], float]]:
+    return lambda: {(name,): read(controller) for name, controller in list(_admission_controllers.items())}
+
+
+registry.register(CallbackMetric(
+    "cache_hits_total", "Cache hits.", "counter", ("cache",), _cache_samples(lambda c: c.hits)
+))
+registry.register(CallbackMetric(
+    "cache_misses_total", "Cache misses.", "counter", ("cache",), _cache_samples(lambda c: c.misses)
+))
+registry.register(CallbackMetric(
+    "cache_evictions_total", "Entries evicted to stay under max_size.", "counter", ("cache",),
+    _cache_samples(lambda c: c.evictions)
+))
+registry.register(CallbackMetric(
+    "cache_expirations_total", "Entries dropped after their TTL.", "counter", ("cache",),
+    _cache_samples(lambda c: c.expirations)
+))
+registry.register(CallbackMetric(
+    "cache_entries", "Entries currently cached.", "gauge", ("cache",), _cache_samples(len)
+))
+registry.register(CallbackMetric(
+    "admission_in_flight", "Callers holding a slot.", "gauge", ("controller",),
+    _admission_samples(lambda a: a.in_flight)
+))
+registry.register(CallbackMetric(
+    "admission_queued", "Callers waiting for a slot.", "gauge", ("controller",),
+    _admission_samples(lambda a: a.queued)
+))
+registry.register(CallbackMetric(
+    "admission_shed_total", "Callers rejected because the queue was full or the wait timed out.", "counter",
+    ("controller",), _admission_samples(lambda a: a.shed_queue_full + a.shed_timeout)
+))
+
+
+class Timer:
+    """Context manager observing the elapsed time of its block on a histogram."""
+
+    __slots__ = ("histogram", "labelvalues", "start")
+
+    def __init__(self, histogram: Histogram, *labelvalues: str):
+        self.histogram = histogram
+        self.labelvalues = labelvalues
+        self.start = 0.0
+
+    def __enter__(self) -> "Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.histogram.observe(time.perf_counter() - self.start, *self.labelvalues)
@@ -0,0 +1,190 @@
+import asyncio
+import json
+import os
+import secrets
+import sys
+import threading
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Stack roots for samples taken while the profiled request was not running
+IDLE_STACK = "<event loop idle>"
+OTHER_TASKS_ROOT = "<other tasks>"
+
+
+def _path_prefixes() -> List[str]:
+    prefixes = {os.getcwd()} | {path for path in sys.path if path and os.path.isdir(path)}
+    return sorted((os.path.join(prefix, "") for prefix in prefixes), key=len, reverse=True)
+
+
+def _short_path(path: str, prefixes: List[str]) -> str:
+    for prefix in prefixes:
+        if path.startswith(prefix):
+            return path[len(prefix):]
+    return path
+
+
+class StackSampler(threading.Thread):
+    """
+    Samples the event loop thread's stack every interval and counts each
+    distinct stack in collapsed form (root;...;leaf), the input format of
+    flamegraph.pl and speedscope. Samples taken while another task holds
+    the loop are rooted under OTHER_TASKS_ROOT, and samples taken while
+    the loop waits for I/O are counted as IDLE_STACK.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, task: Optional[asyncio.Task], interval_seconds: float):
+        super().__init__(name="request-profiler", daemon=True)
+        self.loop = loop
+        self.task = task
+        self.interval_seconds = interval_seconds
+        self.loop_thread_id = threading.get_ident()
+        self.stacks: Dict[str, int] = {}
+        self.samples = 0
+        self._stop_event = threading.Event()
+        self._prefixes = _path_prefixes()
+        self._frame_names: Dict[object, str] = {}
+
+    def _frame_name(self, code) -> str:
+        name = self._frame_names.get(code)
+        if name is None:
+            name = f"{code.co_name} ({_short_path(code.co_filename, self._prefixes)}:{code.co_firstlineno})"
+            self._frame_names[code] = name
+        return name
+
+    def _sample(self) -> None:
+        frame = sys._current_frames().get(self.loop_thread_id)
+        if frame is None:
+            return
+        running = asyncio.current_task(self.loop)
+        if running is None:
+            stack = IDLE_STACK
+        else:
+            names = []
+            while frame is not None:
+                names.append(self._frame_name(frame.f_code))
+                frame = frame.f_back
+            if running is not self.task:
+                names.append(OTHER_TASKS_ROOT)
+            stack = ";".join(reversed(names))
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+        self.samples += 1
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval_seconds):
+            self._sample()
+
+    def stop(self) -> None:
+        """Ask the thread to stop after its current sample; join() waits for it."""
+        self._stop_event.set()
+
+
+class RequestProfile:
+    """
+    Profiles the request running in the current task: a StackSampler and,
+    optionally, the allocations made while it runs (tracemalloc traces the
+    whole process, so concurrent requests' allocations are included).
+    """
+
+    def __init__(self, interval_seconds: float, trace_memory: bool):
+        self.id = f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}-{secrets.token_hex(4)}"
+        self.created_at = datetime.utcnow()
+        self.sampler = StackSampler(asyncio.get_running_loop(), asyncio.current_task(), interval_seconds)
+        self.trace_memory = trace_memory
+        self.allocations: List[Dict] = []
+        self._started_tracemalloc = False
+
+    def start(self) -> None:
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.sampler.start()
+
+    def stop(self) -> None:
+        """Stop sampling. Does not block; finish() does the rest off the event loop."""
+        self.sampler.stop()
+
+    def finish(self, top_allocations: int = 20) -> None:
+        """
+        Wait for the sampler thread and collect the top allocation sites.
+        Snapshotting and sorting tracemalloc statistics can take a while, so
+        this runs on a worker thread (write_profile calls it).
+        """
+        self.sampler.join()
+        if self._started_tracemalloc:
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            prefixes = _path_prefixes()
+            self.allocations = [
+                {
+                    "location": f"{_short_path(stat.traceback[0].filename, prefixes)}:{stat.traceback[0].lineno}",
+                    "size_bytes": stat.size,
+                    "count": stat.count
+                }
+                for stat in snapshot.statistics("lineno")[:top_allocations]
+            ]
+
+
+def write_profile(output_dir: str, profile: RequestProfile, metadata: Dict) -> None:
+    """
+    Finish the profile, then write <id>.collapsed (stack counts) and
+    <id>.json (request and summary) to output_dir. Blocking; run it on a
+    worker thread.
+    """
+    profile.finish()
+    os.makedirs(output_dir, exist_ok=True)
+    base = os.path.join(output_dir, profile.id)
+    with open(base + ".collapsed", "w", encoding="utf-8") as f:
+        for stack, count in sorted(profile.sampler.stacks.items()):
+            f.write(f"{stack} {count}\n")
+    document = {
+        "id": profile.id,
+        "created_at": profile.created_at.isoformat(),
+        **metadata,
+        "samples": profile.sampler.samples,
+        "interval_ms": profile.sampler.interval_seconds * 1000,
+        "allocations": profile.allocations
+    }
+    with open(base + ".json", "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+
+
+def list_profiles(output_dir: str) -> List[Dict]:
+    """Metadata of every profile in output_dir, newest first."""
+    if not os.path.isdir(output_dir):
+        return []
+    profiles = []
+    for name in os.listdir(output_dir):
+        if name.endswith(".json"):
+            with open(os.path.join(output_dir, name), encoding="utf-8") as f:
+                profiles.append(json.load(f))
+    return sorted(profiles, key=lambda profile: profile["created_at"], reverse=True)
+
+
+def load_stacks(output_dir: str, profile_id: str) -> Dict[str, int]:
+    """Read a profile's collapsed stacks."""
+    stacks = {}
+    with open(os.path.join(output_dir, profile_id + ".collapsed"), encoding="utf-8") as f:
+        for line in f:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            stacks[stack] = stacks.get(stack, 0) + int(count)
+    return stacks
+
+
+def summarize_stacks(stacks: Dict[str, int], top: int = 15) -> Dict[str, List]:
+    """
+    The frames with the most samples on top of the stack (self) and
+    anywhere in it (total), as (frame, samples) pairs.
+    """
+    self_counts: Dict[str, int] = {}
+    total_counts: Dict[str, int] = {}
+    for stack, count in stacks.items():
+        frames = stack.split(";")
+        self_counts[frames[-1]] = self_counts.get(frames[-1], 0) + count
+        for frame in set(frames):
+            total_counts[frame] = total_counts.get(frame, 0) + count
+    return {
+        "self": sorted(self_counts.items(), key=lambda item: -item[1])[:top],
+        "total": sorted(total_counts.items(), key=lambda item: -item[1])[:top]
+    }
@@ -0,0 +1,126 @@
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+from app.utils.tracing import current_span, start_span
+
+# Per-request accumulator: phase name -> [total seconds, calls]. None outside
+# a request handled by ServerTimingMiddleware. When there is no accumulator,
+# no sampled trace and no operation tracking, timed callables call straight
+# through.
+_request_timings: ContextVar[Optional[Dict[str, List[float]]]] = ContextVar("request_timings", default=None)
+
+# Name of the innermost timed callable running in this context, tracked only
+# once enable_operation_tracking() has been called (the slow-query log uses
+# it to attribute MongoDB commands to repository methods)
+_current_operation: ContextVar[Optional[str]] = ContextVar("current_operation", default=None)
+_track_operations = False
+
+
+def enable_operation_tracking() -> None:
+    """Make timed callables record themselves as the current operation."""
+    global _track_operations
+    _track_operations = True
+
+
+def current_operation() -> Optional[str]:
+    """The innermost timed callable running in this context, if tracked."""
+    return _current_operation.get()
+
+
+def start_request_timings() -> Dict[str, List[float]]:
+    """Begin collecting timings for the current request and return the accumulator."""
+    timings: Dict[str, List[float]] = {}
+    _request_timings.set(timings)
+    return timings
+
+
+def record_timing(name: str, seconds: float) -> None:
+    """Add one call of the named phase to the current request, if any."""
+    timings = _request_timings.get()
+    if timings is None:
+        return
+    entry = timings.get(name)
+    if entry is None:
+        timings[name] = [seconds, 1]
+    else:
+        entry[0] += seconds
+        entry[1] += 1
+
+
+def timed(name: str) -> Callable:
+    """
+    Decorator recording each call of a function or coroutine function as
+    the named phase of the current request, as a span of its trace when
+    the request is sampled and, with operation tracking enabled, as the
+    current operation while it runs.
+    """
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                timings = _request_timings.get()
+                if timings is None and not _track_operations and current_span() is None:
+                    return await func(*args, **kwargs)
+                token = _current_operation.set(name) if _track_operations else None
+                start = time.perf_counter()
+                try:
+                    with start_span(name):
+                        return await func(*args, **kwargs)
+                finally:
+                    if token is not None:
+                        _current_operation.reset(token)
+                    if timings is not None:
+                        record_timing(name, time.perf_counter() - start)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            timings = _request_timings.get()
+            if timings is None and not _track_operations and current_span() is None:
+                return func(*args, **kwargs)
+            token = _current_operation.set(name) if _track_operations else None
+            start = time.perf_counter()
+            try:
+                with start_span(name):
+                    return func(*args, **kwargs)
+            finally:
+                if token is not None:
+                    _current_operation.reset(token)
+                if timings is not None:
+                    record_timing(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def timed_methods(cls):
+    """
+    Class decorator applying timed() to every coroutine method, named
+    "<Class>.<method>". Static methods stay static; async generators and
+    plain functions are left alone.
+    """
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith("__"):
+            continue
+        func = value.__func__ if isinstance(value, (staticmethod, classmethod)) else value
+        if not inspect.iscoroutinefunction(func):
+            continue
+        wrapped = timed(f"{cls.__name__}.{attr}")(func)
+        if isinstance(value, staticmethod):
+            wrapped = staticmethod(wrapped)
+        elif isinstance(value, classmethod):
+            wrapped = classmethod(wrapped)
+        setattr(cls, attr, wrapped)
+    return cls
+
+
+def format_server_timing(timings: Dict[str, List[float]], total_seconds: float) -> str:
+    """Render timings as a Server-Timing header value, slowest phase first."""
+    entries = [f"total;dur={total_seconds * 1000:.1f}"]
+    for name, (seconds, calls) in sorted(timings.items(), key=lambda item: -item[1][0]):
+        entry = f"{name};dur={seconds * 1000:.1f}"
+        if calls > 1:
+            entry += f';desc="{int(calls)} calls"'
+        entries.append(entry)
+    return ", ".join(entries)
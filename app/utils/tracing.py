@@ -0,0 +1,265 @@
+import asyncio
+import json
+import logging
+import random
+import re
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# OTLP span kinds
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+
+# OTLP status codes
+STATUS_UNSET = 0
+STATUS_ERROR = 2
+
+_TRACEPARENT = re.compile(r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})(-.*)?$")
+
+# Span of the innermost traced call in this context; None when the request
+# is not sampled (or outside a request), in which case nothing is recorded
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed operation of a trace."""
+
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_id", "kind",
+        "start_ns", "end_ns", "attributes", "status_code", "status_message"
+    )
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], kind: int):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _random_id(64)
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes: Dict[str, Any] = {}
+        self.status_code = STATUS_UNSET
+        self.status_message = ""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, message: str) -> None:
+        self.status_code = STATUS_ERROR
+        self.status_message = message
+
+    def to_otlp(self) -> Dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": self.status_code}
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+
+def _random_id(bits: int) -> str:
+    value = 0
+    while not value:
+        value = random.getrandbits(bits)
+    return f"{value:0{bits // 4}x}"
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict:
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """
+    Parse a W3C traceparent header into (trace_id, parent span_id, sampled).
+    Returns None if the header is missing or invalid.
+    """
+    if not header:
+        return None
+    match = _TRACEPARENT.match(header.strip().lower())
+    if match is None:
+        return None
+    version, trace_id, parent_id, flags, rest = match.groups()
+    if version == "ff" or (version == "00" and rest):
+        return None
+    if trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+    return trace_id, parent_id, bool(int(flags, 16) & 1)
+
+
+def current_span() -> Optional[Span]:
+    """The innermost span of the current context, if the request is sampled."""
+    return _current_span.get()
+
+
+@contextmanager
+def _activate(span: Span) -> Iterator[Span]:
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        # HTTP errors below 500 (HTTPException) are responses, not failures
+        if getattr(e, "status_code", 500) >= 500:
+            span.set_error(f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end_ns = time.time_ns()
+        span_exporter.export(span)
+
+
+def start_root_span(
+    name: str,
+    traceparent: Optional[str],
+    sample_rate: float,
+    kind: int = SPAN_KIND_SERVER
+):
+    """
+    Context manager starting the top span of a request, continuing the
+    trace of a valid traceparent. A traceparent's sampled flag decides
+    whether the request is recorded; otherwise sample_rate does. Yields
+    None for requests that are not sampled.
+    """
+    parent = parse_traceparent(traceparent)
+    if parent is not None:
+        trace_id, parent_id, sampled = parent
+    else:
+        trace_id, parent_id, sampled = _random_id(128), None, random.random() < sample_rate
+    if not sampled:
+        return _unsampled()
+    return _activate(Span(name, trace_id, parent_id, kind))
+
+
+@contextmanager
+def _unsampled() -> Iterator[None]:
+    yield None
+
+
+def start_span(name: str, kind: int = SPAN_KIND_INTERNAL):
+    """Context manager starting a child of the current span; a no-op yielding None without one."""
+    parent = _current_span.get()
+    if parent is None:
+        return _unsampled()
+    return _activate(Span(name, parent.trace_id, parent.span_id, kind))
+
+
+class BatchSpanExporter:
+    """
+    Collects finished spans and writes them in batches to a file, one OTLP
+    JSON ExportTraceServiceRequest per line (the format of the
+    OpenTelemetry Collector's file exporter). export() only appends to a
+    bounded deque, dropping the span when it is full; the file is written
+    from a background task through a worker thread, so exporting never
+    blocks the event loop.
+    """
+
+    def __init__(self):
+        self.path = ""
+        self.service_name = ""
+        self.batch_size = 512
+        self.interval_seconds = 5.0
+        self.dropped = 0
+        self._spans: Deque[Span] = deque()
+        self._max_queue_size = 2048
+        self._task: Optional[asyncio.Task] = None
+
+    def configure(
+        self,
+        path: str,
+        service_name: str,
+        batch_size: int,
+        interval_seconds: float,
+        max_queue_size: int
+    ) -> None:
+        self.path = path
+        self.service_name = service_name
+        self.batch_size = max(batch_size, 1)
+        self.interval_seconds = interval_seconds
+        self._max_queue_size = max_queue_size
+
+    def export(self, span: Span) -> None:
+        """Queue a finished span."""
+        if len(self._spans) >= self._max_queue_size:
+            self.dropped += 1
+            return
+        self._spans.append(span)
+
+    def _request(self, spans: List[Span]) -> Dict:
+        return {"resourceSpans": [{
+            "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+            "scopeSpans": [{
+                "scope": {"name": "app"},
+                "spans": [span.to_otlp() for span in spans]
+            }]
+        }]}
+
+    def _write(self, batches: List[List[Span]]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            for batch in batches:
+                f.write(json.dumps(self._request(batch), separators=(",", ":")) + "\n")
+
+    async def flush(self) -> int:
+        """Write every queued span. Returns how many were written."""
+        batches = []
+        written = 0
+        while self._spans:
+            batch = [self._spans.popleft() for _ in range(min(self.batch_size, len(self._spans)))]
+            batches.append(batch)
+            written += len(batch)
+        if batches and self.path:
+            # Serialized on the worker thread too, to keep it off the event loop
+            await asyncio.to_thread(self._write, batches)
+        return written
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Exporting spans failed: {e}")
+
+    def start(self) -> None:
+        """Start the background flush task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Cancel the flush task and write the remaining spans."""
+        task = self._task
+        self._task = None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Exporting spans failed: {e}")
+
+
+span_exporter = BatchSpanExporter()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Per-operation latency and CPU cost of the repository calls on Motor vs.
+PyMongo's native asyncio client. Needs a running MongoDB (MONGODB_URL);
+works in a throwaway database that is dropped at the end.
+Usage: python benchmarks/bench_mongo_drivers.py [operations_per_call] [concurrency]
+"""
+import asyncio
+import statistics
+import sys
+import os
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+
+settings.mongodb_db_name = "org_master_bench"
+
+from app.db.mongo import get_mongo_client, close_mongo_connection
+from app.repositories.master_repo import MasterRepository
+
+ORG_NAME = "BenchOrg"
+ADMIN_EMAIL = "admin@benchorg.com"
+
+
+async def _seed():
+    await MasterRepository.create_admin({
+        "admin_id": "bench",
+        "email": ADMIN_EMAIL,
+        "password": "x",
+        "organization_name": ORG_NAME
+    })
+    await MasterRepository.create_organization({
+        "organization_name": ORG_NAME,
+        "collection_name": "org_benchorg",
+        "admin": {"admin_id": "bench", "email": ADMIN_EMAIL}
+    })
+
+
+CALLS = {
+    "find_organization_by_name": lambda: MasterRepository.find_organization_by_name(ORG_NAME),
+    "find_admin_by_email": lambda: MasterRepository.find_admin_by_email(ADMIN_EMAIL),
+    "find_admin_by_org": lambda: MasterRepository.find_admin_by_org(ORG_NAME),
+    "update_organization": lambda: MasterRepository.update_organization(ORG_NAME, {"bench": 1}),
+}
+
+
+async def _run_call(call, operations: int, concurrency: int):
+    latencies = []
+    
+    async def worker(count: int):
+        for _ in range(count):
+            start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - start)
+    
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    per_worker = operations // concurrency
+    await asyncio.gather(*(worker(per_worker) for _ in range(concurrency)))
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    
+    latencies.sort()
+    done = len(latencies)
+    return {
+        "ops_per_sec": done / wall,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(done * 0.99) - 1] * 1000,
+        "cpu_us_per_op": cpu / done * 1e6,
+    }
+
+
+async def bench_driver(driver: str, operations: int, concurrency: int):
+    settings.mongodb_driver = driver
+    client = await get_mongo_client()
+    await client.drop_database(settings.mongodb_db_name)
+    await _seed()
+    
+    for name, call in CALLS.items():
+        # Warm the pool and code paths before measuring
+        await _run_call(call, concurrency, concurrency)
+        result = await _run_call(call, operations, concurrency)
+        print(f"{driver:<8} {name:<28} {result['ops_per_sec']:>9.0f} {result['p50_ms']:>9.2f} "
+              f"{result['p99_ms']:>9.2f} {result['cpu_us_per_op']:>12.1f}")
+    
+    await client.drop_database(settings.mongodb_db_name)
+    await close_mongo_connection()
+
+
+async def main():
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    
+    print(f"\n{operations} operations per call, concurrency {concurrency}\n")
+    print(f"{'Driver':<8} {'Call':<28} {'ops/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'CPU us/op':>12}")
+    print("-" * 80)
+    for driver in ("motor", "pymongo"):
+        await bench_driver(driver, operations, concurrency)
+    print()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
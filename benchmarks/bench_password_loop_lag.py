@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Event-loop lag under concurrent logins, with bcrypt on the loop vs. offloaded.
+Usage: python benchmarks/bench_password_loop_lag.py [concurrent_logins] [rounds]
+
+A ticker coroutine sleeps 5 ms in a loop and records how late it wakes up;
+that lateness is the delay every other request on the worker would see.
+"""
+import asyncio
+import statistics
+import sys
+import os
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.auth.password import (
+    hash_password, verify_password, verify_password_async, shutdown_password_executor
+)
+
+TICK_SECONDS = 0.005
+
+
+async def _ticker(stop: asyncio.Event, lags: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(time.perf_counter() - start - TICK_SECONDS)
+
+
+async def _sync_login(hashed: str):
+    # What the handlers did before: bcrypt directly inside the coroutine
+    verify_password("securepass123", hashed)
+
+
+async def _async_login(hashed: str):
+    await verify_password_async("securepass123", hashed)
+
+
+async def run_case(login, hashed: str, concurrency: int, rounds: int):
+    stop = asyncio.Event()
+    lags = []
+    ticker = asyncio.create_task(_ticker(stop, lags))
+    await asyncio.sleep(0.05)
+    
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(*(login(hashed) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    
+    stop.set()
+    await ticker
+    lags_ms = sorted(lag * 1000 for lag in lags)
+    p99 = lags_ms[int(len(lags_ms) * 0.99) - 1] if lags_ms else 0.0
+    return {
+        "logins_per_sec": concurrency * rounds / elapsed,
+        "lag_p50_ms": statistics.median(lags_ms) if lags_ms else 0.0,
+        "lag_p99_ms": p99,
+        "lag_max_ms": lags_ms[-1] if lags_ms else 0.0,
+    }
+
+
+async def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    hashed = hash_password("securepass123")
+    
+    print(f"\n{concurrency} concurrent logins x {rounds} rounds, CPU count {os.cpu_count()}\n")
+    print(f"{'Mode':<22} {'logins/s':>10} {'lag p50 ms':>12} {'lag p99 ms':>12} {'lag max ms':>12}")
+    print("-" * 72)
+    for name, login in (("bcrypt on event loop", _sync_login), ("bcrypt on executor", _async_login)):
+        result = await run_case(login, hashed, concurrency, rounds)
+        print(f"{name:<22} {result['logins_per_sec']:>10.1f} {result['lag_p50_ms']:>12.2f} "
+              f"{result['lag_p99_ms']:>12.2f} {result['lag_max_ms']:>12.2f}")
+    print()
+    shutdown_password_executor()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Cost of verify_token with and without the verified-token cache.
+Usage: python benchmarks/bench_verify_token.py [iterations] [distinct_tokens]
+"""
+import sys
+import os
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.auth.jwt_handler import create_access_token, decode_token, verify_token, token_cache
+
+
+def _measure(verify, tokens, iterations: int) -> float:
+    """Return mean microseconds per call."""
+    start = time.perf_counter()
+    for i in range(iterations):
+        verify(tokens[i % len(tokens)])
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    distinct = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    tokens = [
+        create_access_token({
+            "admin_id": f"{i:024x}",
+            "organization_name": f"Org{i}",
+            "email": f"admin{i}@example.com"
+        })
+        for i in range(distinct)
+    ]
+    
+    token_cache.clear()
+    uncached = _measure(decode_token, tokens, iterations)
+    cached = _measure(verify_token, tokens, iterations)
+    
+    print(f"\n{iterations} verifications over {distinct} distinct token(s)\n")
+    print(f"{'Mode':<20} {'us/call':>10}")
+    print("-" * 32)
+    print(f"{'jose decode':<20} {uncached:>10.2f}")
+    print(f"{'cached verify':<20} {cached:>10.2f}")
+    print(f"\nSpeedup: {uncached / cached:.1f}x  cache: {token_cache.stats()}\n")
+
+
+if __name__ == "__main__":
+    main()
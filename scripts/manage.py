@@ -3,33 +3,67 @@
 Management CLI script for Organization Management Service.
 Usage: python scripts/manage.py list-orgs
        python scripts/manage.py list-admins
+       python scripts/manage.py list-collections [--mode exact|estimated|stats] [--concurrency N] [--json]
+       python scripts/manage.py backfill-org-keys
+       python scripts/manage.py check-indexes
+       python scripts/manage.py migrate-collection <source> <target> [target_db]
+       python scripts/manage.py migrations
+       python scripts/manage.py migrate-tenant-ids [--limit N] [--pause SECONDS]
+       python scripts/manage.py worker [--concurrency N]
+       python scripts/manage.py deleted-orgs
+       python scripts/manage.py undelete <organization_name>
+       python scripts/manage.py reclaim [--limit N]
+       python scripts/manage.py profiles [profile_id] [--dir DIR] [--top N]
+       python scripts/manage.py export <organizations|admins> <path> [--format ndjson|bson]
+       python scripts/manage.py import <organizations|admins> <path> [--format ndjson|bson]
+                                [--batch-size N] [--concurrency N] [--no-upsert]
 """
+import argparse
 import asyncio
+import json
 import sys
 import os
+import time
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.db.mongo import get_master_database, close_mongo_connection
+from app.db.mongo import get_master_database, get_mongo_client, close_mongo_connection
 from app.repositories.master_repo import MasterRepository
 from app.repositories.org_repo import OrgRepository
+from app.db.indexes import explain_query_shapes, missing_master_indexes
+from app.repositories.migration_repo import MigrationRepository, TenantMigrator, copy_indexes
+from app.services.org_service import OrgService
+from app.services.job_service import JobWorker
+from app.services.reclaim_service import ReclaimService
+from app.utils.profiling import list_profiles, load_stacks, summarize_stacks
+from app.core.config import settings
+import bson
+from bson import json_util
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from pymongo import InsertOne, ReplaceOne
+from pymongo.errors import BulkWriteError
+
+# Master collections that export/import operate on
+MASTER_COLLECTIONS = {
+    "organizations": MasterRepository.get_organizations_collection,
+    "admins": MasterRepository.get_admins_collection,
+}
 
 
 async def list_organizations():
     """List all organizations."""
     try:
-        orgs = await MasterRepository.list_all_organizations()
-        
-        if not orgs:
-            print("No organizations found.")
-            return
+        header_printed = False
+        count = 0
         
-        print(f"\nFound {len(orgs)} organization(s):\n")
-        print(f"{'Organization Name':<30} {'Collection Name':<30} {'Admin Email':<30} {'Created At'}")
-        print("-" * 100)
-        
-        for org in orgs:
+        async for org in MasterRepository.iter_organizations():
+            if not header_printed:
+                print(f"\n{'Organization Name':<30} {'Collection Name':<30} {'Admin Email':<30} {'Created At'}")
+                print("-" * 100)
+                header_printed = True
+            
             org_name = org.get("organization_name", "N/A")
             collection_name = org.get("collection_name", "N/A")
             admin_email = org.get("admin", {}).get("email", "N/A")
@@ -41,7 +75,13 @@ async def list_organizations():
                 created_str = created_at.strftime("%Y-%m-%d %H:%M:%S") if created_at else "N/A"
             
             print(f"{org_name:<30} {collection_name:<30} {admin_email:<30} {created_str}")
+            count += 1
         
+        if not count:
+            print("No organizations found.")
+            return
+        
+        print(f"\nFound {count} organization(s).")
         print()
     except Exception as e:
         print(f"Error listing organizations: {e}")
@@ -89,22 +129,67 @@ async def list_admins():
         await close_mongo_connection()
 
 
-async def list_collections():
-    """List all organization collections."""
+def _format_bytes(size):
+    """Format a byte count for display."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+async def _collection_stats(collection_name, mode):
+    """Gather size information for one collection in the requested mode."""
+    if mode == "stats":
+        stats = await OrgRepository.get_collection_stats(collection_name)
+    elif mode == "estimated":
+        stats = {"documents": await OrgRepository.get_estimated_document_count(collection_name)}
+    else:
+        db = await get_master_database()
+        stats = {"documents": await db[collection_name].count_documents({})}
+    return {"collection": collection_name, **stats}
+
+
+async def list_collections(mode="exact", concurrency=8, as_json=False):
+    """
+    List live organization collections with their sizes.
+    mode: exact (count_documents), estimated (collection metadata) or
+    stats ($collStats: count, data, storage and index sizes).
+    """
     try:
         collections = await OrgRepository.list_collections()
         
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def gather_one(collection_name):
+            async with semaphore:
+                try:
+                    return await _collection_stats(collection_name, mode)
+                except Exception as e:
+                    return {"collection": collection_name, "error": str(e)}
+        
+        results = await asyncio.gather(*(gather_one(name) for name in collections))
+        
+        if as_json:
+            print(json.dumps(results, indent=2))
+            return
+        
         if not collections:
             print("No organization collections found.")
             return
         
         print(f"\nFound {len(collections)} collection(s):\n")
         
-        db = await get_master_database()
-        for collection_name in collections:
-            collection = db[collection_name]
-            count = await collection.count_documents({})
-            print(f"  {collection_name:<40} ({count} documents)")
+        for result in results:
+            name = result["collection"]
+            if "error" in result:
+                print(f"  {name:<40} (error: {result['error']})")
+            elif mode == "stats":
+                print(f"  {name:<40} {result['documents']:>10} documents  "
+                      f"storage {_format_bytes(result['storage_size']):>10}  "
+                      f"indexes {_format_bytes(result['index_size']):>10}")
+            else:
+                print(f"  {name:<40} ({result['documents']} documents)")
         
         print()
     except Exception as e:
@@ -113,6 +198,384 @@ async def list_collections():
         await close_mongo_connection()
 
 
+async def backfill_organization_keys():
+    """Populate the normalized organization_key on existing records."""
+    try:
+        updated = await MasterRepository.backfill_organization_keys()
+        print(f"\nBackfilled organization_key on {updated['organizations']} organization(s) "
+              f"and {updated['admins']} admin(s).\n")
+    except Exception as e:
+        print(f"Error backfilling organization keys: {e}")
+        sys.exit(1)
+    finally:
+        await close_mongo_connection()
+
+
+async def check_indexes():
+    """Verify registered indexes exist and no repository query does a COLLSCAN."""
+    failed = False
+    try:
+        missing = await missing_master_indexes()
+        for index_name in missing:
+            print(f"  MISSING  {index_name}")
+        failed = bool(missing)
+        
+        print(f"\n{'Query':<30} {'Collection':<15} {'Plan'}")
+        print("-" * 80)
+        for result in await explain_query_shapes():
+            plan = " <- ".join(result["stages"])
+            marker = "  <-- COLLSCAN" if result["collscan"] else ""
+            print(f"{result['name']:<30} {result['collection']:<15} {plan}{marker}")
+            failed = failed or result["collscan"]
+        print()
+    except Exception as e:
+        print(f"Error checking indexes: {e}")
+        failed = True
+    finally:
+        await close_mongo_connection()
+    
+    if failed:
+        print("Index check FAILED.")
+        sys.exit(1)
+    print("Index check passed.")
+
+
+def _print_migration_progress(checkpoint):
+    """Print one progress line for a migration checkpoint."""
+    total = checkpoint.get("total_estimate") or 0
+    copied = checkpoint.get("copied", 0)
+    percent = f"{100 * copied / total:.1f}%" if total else "-"
+    rate = checkpoint.get("docs_per_sec")
+    eta = checkpoint.get("eta_seconds")
+    rate_str = f"{rate} docs/s" if rate is not None else "-"
+    eta_str = f"{eta:.0f}s" if eta is not None else "-"
+    print(f"  {checkpoint.get('status', 'N/A'):<12} {copied:>10}/{total:<10} {percent:>7} "
+          f"{rate_str:>14}  ETA {eta_str}")
+
+
+async def migrate_collection(source_name, target_name, target_db_name=None):
+    """Copy a tenant collection online (resumes an interrupted run)."""
+    try:
+        client = await get_mongo_client()
+        source_db = await get_master_database()
+        target_db = client[target_db_name] if target_db_name else source_db
+        
+        async def report(checkpoint):
+            _print_migration_progress(checkpoint)
+        
+        migrator = TenantMigrator(
+            source_db[source_name],
+            target_db[target_name],
+            progress_callback=report
+        )
+        print(f"\nMigrating {migrator.migration_id}\n")
+        await migrator.run()
+        await copy_indexes(source_db[source_name], target_db[target_name])
+        print("\nMigration completed.\n")
+    except Exception as e:
+        print(f"Error migrating collection: {e}")
+        sys.exit(1)
+    finally:
+        await close_mongo_connection()
+
+
+async def list_migrations():
+    """Show progress of tenant collection migrations."""
+    try:
+        migrations = await MigrationRepository.list_migrations()
+        
+        if not migrations:
+            print("No migrations found.")
+            return
+        
+        print(f"\nFound {len(migrations)} migration(s):\n")
+        for checkpoint in migrations:
+            print(f"{checkpoint['_id']}")
+            _print_migration_progress(checkpoint)
+            if checkpoint.get("error"):
+                print(f"  error: {checkpoint['error']}")
+        print()
+    except Exception as e:
+        print(f"Error listing migrations: {e}")
+    finally:
+        await close_mongo_connection()
+
+
+async def migrate_tenant_ids(limit=None, pause=0.0):
+    """Move name-derived tenant collections to ID-keyed collections, one tenant at a time."""
+    migrated = failed = 0
+    try:
+        async for org in MasterRepository.iter_organizations_without_tenant_id():
+            if limit is not None and migrated + failed >= limit:
+                break
+            try:
+                updated = await OrgService.migrate_to_tenant_id(org)
+            except Exception as e:
+                print(f"  FAILED   {org['organization_name']}: {e}")
+                failed += 1
+                continue
+            if updated:
+                print(f"  migrated {org['organization_name']}: {org['collection_name']} -> "
+                      f"{updated['collection_name']}")
+                migrated += 1
+            # Leave headroom for live traffic between tenants
+            if pause:
+                await asyncio.sleep(pause)
+        print(f"\nMigrated {migrated} organization(s), {failed} failed.\n")
+    except Exception as e:
+        print(f"Error migrating tenant IDs: {e}")
+        failed += 1
+    finally:
+        await close_mongo_connection()
+    
+    if failed:
+        sys.exit(1)
+
+
+async def run_workers(concurrency=1):
+    """Run background job workers until interrupted."""
+    workers = [JobWorker() for _ in range(concurrency)]
+    print(f"\nRunning {concurrency} job worker(s); press Ctrl+C to stop.\n")
+    tasks = [asyncio.create_task(worker.run()) for worker in workers]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        # Cancelled workers hand their running jobs back to the queue
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await close_mongo_connection()
+
+
+async def list_deleted_organizations():
+    """List soft-deleted organizations awaiting reclamation."""
+    try:
+        orgs = await MasterRepository.find_deleted_organizations()
+        
+        if not orgs:
+            print("No deleted organizations.")
+            return
+        
+        print(f"\nFound {len(orgs)} deleted organization(s):\n")
+        print(f"{'Organization Name':<30} {'Collection':<40} {'Deleted At':<20} {'Purge After'}")
+        print("-" * 110)
+        for org in orgs:
+            print(f"{org.get('organization_name', 'N/A'):<30} {org.get('collection_name', 'N/A'):<40} "
+                  f"{org['deleted_at'].strftime('%Y-%m-%d %H:%M:%S'):<20} "
+                  f"{org['purge_after'].strftime('%Y-%m-%d %H:%M:%S')}")
+        print()
+    except Exception as e:
+        print(f"Error listing deleted organizations: {e}")
+    finally:
+        await close_mongo_connection()
+
+
+async def undelete_organization(organization_name):
+    """Restore a soft-deleted organization that has not been reclaimed yet."""
+    try:
+        org = await OrgService.undelete_organization(organization_name)
+        print(f"\nRestored '{org['organization_name']}' ({org['collection_name']}).\n")
+    except Exception as e:
+        print(f"Error restoring organization: {e}")
+        sys.exit(1)
+    finally:
+        await close_mongo_connection()
+
+
+async def reclaim_deleted_organizations(limit=0):
+    """Purge deleted organizations past their retention window now."""
+    try:
+        reclaimed = await ReclaimService.reclaim(limit)
+        print(f"\nReclaimed {reclaimed} deleted organization(s).\n")
+    except Exception as e:
+        print(f"Error reclaiming deleted organizations: {e}")
+        sys.exit(1)
+    finally:
+        await close_mongo_connection()
+
+
+def show_profiles(output_dir, profile_id=None, top=15):
+    """List request profiles, or summarize one of them."""
+    profiles = list_profiles(output_dir)
+    if profile_id is None:
+        if not profiles:
+            print(f"No profiles in {output_dir}.")
+            return
+        print(f"\n{'Profile ID':<26} {'Request':<40} {'Status':<7} {'Duration':>10} {'Samples':>8}  Trigger")
+        print("-" * 105)
+        for profile in profiles:
+            request = f"{profile['method']} {profile.get('route') or profile['path']}"
+            print(f"{profile['id']:<26} {request:<40} {profile['status']:<7} "
+                  f"{profile['duration_ms']:>8.1f}ms {profile['samples']:>8}  {profile['trigger']}")
+        print()
+        return
+    
+    profile = next((p for p in profiles if p["id"] == profile_id), None)
+    if profile is None:
+        print(f"Profile not found: {profile_id}")
+        sys.exit(1)
+    
+    samples = max(profile["samples"], 1)
+    summary = summarize_stacks(load_stacks(output_dir, profile_id), top)
+    print(f"\n{profile['method']} {profile['path']} -> {profile['status']} in {profile['duration_ms']:.1f} ms, "
+          f"{profile['samples']} samples every {profile['interval_ms']:g} ms")
+    for title, key in (("Self time", "self"), ("Total time", "total")):
+        print(f"\n{title}:")
+        for frame, count in summary[key]:
+            print(f"  {count / samples:>6.1%}  {frame}")
+    if profile["allocations"]:
+        print("\nAllocations:")
+        for allocation in profile["allocations"][:top]:
+            print(f"  {_format_bytes(allocation['size_bytes']):>10}  {allocation['count']:>7}  {allocation['location']}")
+    print(f"\nFlamegraph input: {os.path.join(output_dir, profile_id + '.collapsed')}\n")
+
+
+def _file_format(path, file_format):
+    """Use the explicit format, else infer it from the file extension."""
+    if file_format:
+        return file_format
+    return "bson" if path.endswith(".bson") else "ndjson"
+
+
+async def export_collection(collection_name, path, file_format=None, batch_size=1000):
+    """
+    Stream a master collection to NDJSON (canonical Extended JSON, so types
+    round-trip) or concatenated BSON, holding one cursor batch in memory.
+    """
+    try:
+        file_format = _file_format(path, file_format)
+        collection = await MASTER_COLLECTIONS[collection_name]()
+        start = time.perf_counter()
+        count = 0
+        
+        if file_format == "bson":
+            # Raw documents are written as received, without decoding
+            raw_collection = collection.with_options(
+                codec_options=CodecOptions(document_class=RawBSONDocument)
+            )
+            with open(path, "wb") as f:
+                async for doc in raw_collection.find({}).batch_size(batch_size):
+                    f.write(doc.raw)
+                    count += 1
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                async for doc in collection.find({}).batch_size(batch_size):
+                    f.write(json_util.dumps(doc, json_options=json_util.CANONICAL_JSON_OPTIONS))
+                    f.write("\n")
+                    count += 1
+        
+        elapsed = time.perf_counter() - start
+        rate = count / elapsed if elapsed else 0
+        print(f"\nExported {count} document(s) from {collection_name} to {path} "
+              f"({file_format}) in {elapsed:.1f}s ({rate:.0f} docs/s)\n")
+    except Exception as e:
+        print(f"Error exporting {collection_name}: {e}")
+        sys.exit(1)
+    finally:
+        await close_mongo_connection()
+
+
+def _read_documents(path, file_format):
+    """Yield documents from an export file one at a time."""
+    if file_format == "bson":
+        with open(path, "rb") as f:
+            yield from bson.decode_file_iter(f)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json_util.loads(line)
+
+
+async def import_collection(
+    collection_name,
+    path,
+    file_format=None,
+    batch_size=1000,
+    concurrency=4,
+    upsert=True
+):
+    """
+    Load an export file into a master collection with unordered bulk_write
+    batches, at most `concurrency` in flight. With upsert, documents replace
+    existing ones with the same _id; otherwise they are inserted and
+    duplicates are reported as errors.
+    """
+    try:
+        file_format = _file_format(path, file_format)
+        collection = await MASTER_COLLECTIONS[collection_name]()
+        totals = {"read": 0, "inserted": 0, "upserted": 0, "matched": 0, "modified": 0, "errors": 0}
+        start = time.perf_counter()
+        
+        async def write_batch(operations):
+            try:
+                result = await collection.bulk_write(operations, ordered=False)
+            except BulkWriteError as e:
+                result_doc = e.details
+                totals["errors"] += len(result_doc.get("writeErrors", []))
+                totals["inserted"] += result_doc.get("nInserted", 0)
+                totals["upserted"] += result_doc.get("nUpserted", 0)
+                totals["matched"] += result_doc.get("nMatched", 0)
+                totals["modified"] += result_doc.get("nModified", 0)
+                return
+            totals["inserted"] += result.inserted_count
+            totals["upserted"] += result.upserted_count
+            totals["matched"] += result.matched_count
+            totals["modified"] += result.modified_count
+        
+        # Any other failure fails the whole batch; count its documents as errors
+        batch_sizes = {}
+        
+        def collect(done):
+            for task in done:
+                size = batch_sizes.pop(task)
+                try:
+                    task.result()
+                except Exception as e:
+                    totals["errors"] += size
+                    print(f"Batch of {size} documents failed: {e}")
+        
+        def submit(operations):
+            task = asyncio.ensure_future(write_batch(operations))
+            batch_sizes[task] = len(operations)
+            pending.add(task)
+        
+        pending = set()
+        operations = []
+        for doc in _read_documents(path, file_format):
+            totals["read"] += 1
+            if upsert:
+                operations.append(ReplaceOne({"_id": doc["_id"]}, doc, upsert=True))
+            else:
+                operations.append(InsertOne(doc))
+            
+            if len(operations) >= batch_size:
+                submit(operations)
+                operations = []
+                if len(pending) >= concurrency:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    collect(done)
+        
+        if operations:
+            submit(operations)
+        if pending:
+            done, _ = await asyncio.wait(pending)
+            collect(done)
+        
+        elapsed = time.perf_counter() - start
+        rate = totals["read"] / elapsed if elapsed else 0
+        print(f"\nImported {path} into {collection_name} in {elapsed:.1f}s ({rate:.0f} docs/s)")
+        print(f"  read {totals['read']}, inserted {totals['inserted']}, upserted {totals['upserted']}, "
+              f"matched {totals['matched']}, modified {totals['modified']}, errors {totals['errors']}\n")
+        if totals["errors"]:
+            sys.exit(1)
+    except Exception as e:
+        print(f"Error importing {collection_name}: {e}")
+        sys.exit(1)
+    finally:
+        await close_mongo_connection()
+
+
 def main():
     """Main CLI entry point."""
     if len(sys.argv) < 2:
@@ -121,6 +584,19 @@ def main():
         print("  list-orgs      - List all organizations")
         print("  list-admins    - List all admin accounts")
         print("  list-collections - List all organization collections")
+        print("                   [--mode exact|estimated|stats] [--concurrency N] [--json]")
+        print("  backfill-org-keys - Add normalized lookup keys to existing records")
+        print("  check-indexes  - Fail if an index is missing or a query does a COLLSCAN")
+        print("  migrate-collection <source> <target> [target_db] - Online copy of a tenant collection")
+        print("  migrations     - Show tenant migration progress")
+        print("  migrate-tenant-ids [--limit N] [--pause SECONDS] - Key existing tenant collections by tenant ID")
+        print("  worker [--concurrency N] - Run background jobs (renames and deletes)")
+        print("  deleted-orgs   - List soft-deleted organizations awaiting reclamation")
+        print("  undelete <organization_name> - Restore a soft-deleted organization")
+        print("  reclaim [--limit N] - Purge deleted organizations past their retention window")
+        print("  profiles [profile_id] [--dir DIR] [--top N] - List request profiles, or summarize one")
+        print("  export <organizations|admins> <path> - Stream a master collection to NDJSON/BSON")
+        print("  import <organizations|admins> <path> - Bulk load an export file (upsert by _id)")
         sys.exit(1)
     
     command = sys.argv[1]
@@ -130,7 +606,79 @@ def main():
     elif command == "list-admins":
         asyncio.run(list_admins())
     elif command == "list-collections":
-        asyncio.run(list_collections())
+        parser = argparse.ArgumentParser(prog="manage.py list-collections")
+        parser.add_argument("--mode", choices=["exact", "estimated", "stats"], default="exact",
+                            help="exact: count_documents; estimated: metadata count; stats: $collStats sizes")
+        parser.add_argument("--concurrency", type=int, default=8,
+                            help="collections queried at the same time")
+        parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+        args = parser.parse_args(sys.argv[2:])
+        asyncio.run(list_collections(args.mode, max(args.concurrency, 1), args.json))
+    elif command == "backfill-org-keys":
+        asyncio.run(backfill_organization_keys())
+    elif command == "check-indexes":
+        asyncio.run(check_indexes())
+    elif command == "migrate-collection":
+        if len(sys.argv) < 4:
+            print("Usage: python scripts/manage.py migrate-collection <source> <target> [target_db]")
+            sys.exit(1)
+        asyncio.run(migrate_collection(*sys.argv[2:5]))
+    elif command == "migrations":
+        asyncio.run(list_migrations())
+    elif command == "migrate-tenant-ids":
+        parser = argparse.ArgumentParser(prog="manage.py migrate-tenant-ids")
+        parser.add_argument("--limit", type=int, help="stop after this many organizations")
+        parser.add_argument("--pause", type=float, default=0.0,
+                            help="seconds to wait between organizations")
+        args = parser.parse_args(sys.argv[2:])
+        asyncio.run(migrate_tenant_ids(args.limit, max(args.pause, 0.0)))
+    elif command == "worker":
+        parser = argparse.ArgumentParser(prog="manage.py worker")
+        parser.add_argument("--concurrency", type=int, default=1, help="jobs run at the same time")
+        args = parser.parse_args(sys.argv[2:])
+        try:
+            asyncio.run(run_workers(max(args.concurrency, 1)))
+        except KeyboardInterrupt:
+            pass
+    elif command == "deleted-orgs":
+        asyncio.run(list_deleted_organizations())
+    elif command == "undelete":
+        if len(sys.argv) < 3:
+            print("Usage: python scripts/manage.py undelete <organization_name>")
+            sys.exit(1)
+        asyncio.run(undelete_organization(sys.argv[2]))
+    elif command == "reclaim":
+        parser = argparse.ArgumentParser(prog="manage.py reclaim")
+        parser.add_argument("--limit", type=int, default=0, help="stop after this many (default: all)")
+        args = parser.parse_args(sys.argv[2:])
+        asyncio.run(reclaim_deleted_organizations(max(args.limit, 0)))
+    elif command == "profiles":
+        parser = argparse.ArgumentParser(prog="manage.py profiles")
+        parser.add_argument("profile_id", nargs="?", help="summarize this profile instead of listing")
+        parser.add_argument("--dir", default=settings.profiling_output_dir, help="profile directory")
+        parser.add_argument("--top", type=int, default=15, help="frames and allocations shown")
+        args = parser.parse_args(sys.argv[2:])
+        show_profiles(args.dir, args.profile_id, max(args.top, 1))
+    elif command in ("export", "import"):
+        parser = argparse.ArgumentParser(prog=f"manage.py {command}")
+        parser.add_argument("collection", choices=sorted(MASTER_COLLECTIONS))
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["ndjson", "bson"],
+                            help="file format (default: from extension, .bson or NDJSON)")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        if command == "import":
+            parser.add_argument("--concurrency", type=int, default=4,
+                                help="bulk_write batches in flight at once")
+            parser.add_argument("--no-upsert", action="store_true",
+                                help="insert only; existing _ids are reported as errors")
+        args = parser.parse_args(sys.argv[2:])
+        if command == "export":
+            asyncio.run(export_collection(args.collection, args.path, args.format, args.batch_size))
+        else:
+            asyncio.run(import_collection(
+                args.collection, args.path, args.format, args.batch_size,
+                max(args.concurrency, 1), not args.no_upsert
+            ))
     else:
         print(f"Unknown command: {command}")
         sys.exit(1)
@@ -4,6 +4,7 @@ from fastapi.testclient import TestClient
 from app.main import create_app
 from app.db.mongo import get_master_database, close_mongo_connection
 from app.repositories.org_repo import OrgRepository
+from app.repositories.master_repo import organization_cache
 import os
 
 
@@ -31,6 +32,8 @@ def client(test_app):
 @pytest.fixture(scope="function", autouse=True)
 def clean_db():
     """Clean test database before and after each test."""
+    organization_cache.clear()
+    
     # Clean before test
     async def _clean():
         db = await get_master_database()
@@ -47,4 +50,5 @@ def clean_db():
     yield
     # Clean after test
     asyncio.run(_clean())
+    organization_cache.clear()
 
@@ -0,0 +1,62 @@
+import asyncio
+import pytest
+from app.utils.admission import AdmissionController, AdmissionRejected
+
+
+def test_admission_sheds_when_queue_full():
+    """Test that callers beyond concurrency + queue are rejected immediately."""
+    async def scenario():
+        controller = AdmissionController("test", max_concurrency=1, max_queue=1, queue_timeout_seconds=5)
+        release = asyncio.Event()
+        
+        async def hold():
+            async with controller.slot():
+                await release.wait()
+        
+        holder = asyncio.create_task(hold())
+        waiter = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        assert controller.in_flight == 1
+        assert controller.queued == 1
+        
+        with pytest.raises(AdmissionRejected):
+            async with controller.slot():
+                pass
+        
+        release.set()
+        await asyncio.gather(holder, waiter)
+        return controller.stats()
+    
+    stats = asyncio.run(scenario())
+    assert stats["shed_queue_full"] == 1
+    assert stats["admitted"] == 2
+    assert stats["in_flight"] == 0
+
+
+def test_admission_queue_timeout():
+    """Test that a queued caller is rejected after the queue deadline."""
+    async def scenario():
+        controller = AdmissionController("test", max_concurrency=1, max_queue=4, queue_timeout_seconds=0.01)
+        release = asyncio.Event()
+        
+        async def hold():
+            async with controller.slot():
+                await release.wait()
+        
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected):
+            async with controller.slot():
+                pass
+        
+        release.set()
+        await holder
+        
+        # The slot is free again once the holder is done
+        async with controller.slot():
+            pass
+        return controller.stats()
+    
+    stats = asyncio.run(scenario())
+    assert stats["shed_timeout"] == 1
+    assert stats["in_flight"] == 0
@@ -1,5 +1,8 @@
+import time
 import pytest
+from datetime import timedelta
 from fastapi import status
+from app.auth.jwt_handler import create_access_token, verify_token
 
 
 def test_login_success(client, clean_db):
@@ -67,3 +70,18 @@ def test_login_invalid_password(client, clean_db):
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
     assert "invalid" in response.json()["detail"].lower()
 
+
+
+def test_cached_token_expires_with_token(clean_db):
+    """Test that a cached verification is not served past the token's exp."""
+    token = create_access_token(
+        {"admin_id": "a1", "organization_name": "TestOrg", "email": "admin@testorg.com"},
+        expires_delta=timedelta(seconds=1)
+    )
+    
+    assert verify_token(token)["organization_name"] == "TestOrg"
+    assert verify_token(token)["organization_name"] == "TestOrg"
+    
+    # jose compares exp at whole-second resolution
+    time.sleep(2.1)
+    assert verify_token(token) is None
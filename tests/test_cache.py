@@ -0,0 +1,89 @@
+import time
+import asyncio
+from datetime import datetime
+import pytest
+from fastapi import status
+from app.core.config import settings
+from app.utils.cache import TTLCache, MISSING
+from app.repositories.master_repo import MasterRepository, organization_cache
+
+
+def test_ttl_cache_lru_eviction():
+    """Test that the least recently used entry is evicted at max_size."""
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_expiry_and_stale_fill():
+    """Test TTL expiry and that invalidation discards in-flight fills."""
+    cache = TTLCache(max_size=10, ttl_seconds=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is MISSING
+    
+    generation = cache.generation
+    cache.invalidate("b")
+    cache.set("b", "stale", generation=generation)
+    assert cache.get("b") is MISSING
+
+
+def test_get_org_served_from_cache(client, clean_db):
+    """Test that repeated /org/get calls hit the cache and writes invalidate it."""
+    client.post(
+        "/org/create",
+        json={
+            "organization_name": "TestOrg",
+            "email": "admin@testorg.com",
+            "password": "securepass123"
+        }
+    )
+    
+    client.get("/org/get?organization_name=TestOrg")
+    hits_before = organization_cache.hits
+    response = client.get("/org/get?organization_name=testorg")
+    assert response.status_code == status.HTTP_200_OK
+    assert organization_cache.hits == hits_before + 1
+    
+    token = client.post(
+        "/admin/login",
+        json={"email": "admin@testorg.com", "password": "securepass123"}
+    ).json()["access_token"]
+    client.put(
+        "/org/update",
+        json={"organization_name": "TestOrg", "email": "new@testorg.com"},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    
+    response = client.get("/org/get?organization_name=TestOrg")
+    assert response.json()["organization"]["admin"]["email"] == "new@testorg.com"
+
+
+def test_org_cache_misses_expire_quickly(client, clean_db, monkeypatch):
+    """Test that a cached miss does not hide an organization created by another worker for the full TTL."""
+    monkeypatch.setattr(settings, "org_cache_negative_ttl_seconds", 0.01)
+    
+    assert client.get("/org/get?organization_name=TestOrg").status_code == status.HTTP_404_NOT_FOUND
+    
+    # Another worker creates the organization; this process's cache is not invalidated
+    async def create_elsewhere():
+        collection = await MasterRepository.get_organizations_collection()
+        await collection.insert_one({
+            "organization_name": "TestOrg",
+            "organization_key": "testorg",
+            "collection_name": "org_testorg",
+            "admin": {"admin_id": "0" * 24, "email": "admin@testorg.com"},
+            "created_at": datetime.utcnow()
+        })
+    
+    asyncio.run(create_elsewhere())
+    time.sleep(0.02)
+    
+    assert client.get("/org/get?organization_name=TestOrg").status_code == status.HTTP_200_OK
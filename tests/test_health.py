@@ -0,0 +1,22 @@
+import pytest
+from fastapi import status
+
+
+def test_liveness(client):
+    """Test that liveness does not depend on MongoDB."""
+    response = client.get("/health/live")
+    
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["status"] == "alive"
+
+
+def test_readiness_reports_latencies(client):
+    """Test that readiness checks MongoDB and reports per-dependency latency."""
+    response = client.get("/health/ready")
+    
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["status"] == "ready"
+    for check in ("mongo_ping", "master_query"):
+        assert data["checks"][check]["status"] == "ok"
+        assert data["checks"][check]["latency_ms"] >= 0
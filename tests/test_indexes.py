@@ -0,0 +1,31 @@
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+
+def test_duplicate_admin_email_rejected(test_app, clean_db):
+    """Test that the unique email index applied at startup rejects reuse."""
+    with TestClient(test_app) as client:
+        client.post(
+            "/org/create",
+            json={
+                "organization_name": "TestOrg1",
+                "email": "admin@testorg.com",
+                "password": "securepass123"
+            }
+        )
+        
+        response = client.post(
+            "/org/create",
+            json={
+                "organization_name": "TestOrg2",
+                "email": "Admin@TestOrg.com",
+                "password": "securepass123"
+            }
+        )
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "already registered" in response.json()["detail"].lower()
+        
+        get_response = client.get("/org/get?organization_name=TestOrg2")
+        assert get_response.status_code == status.HTTP_404_NOT_FOUND
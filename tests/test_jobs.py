@@ -0,0 +1,168 @@
+import pytest
+import asyncio
+from datetime import datetime
+from fastapi import status
+from app.core.config import settings
+from app.db.indexes import ensure_master_indexes
+from app.repositories.job_repo import JobRepository
+from app.repositories.master_repo import MasterRepository
+from app.services.job_service import JobService, JobWorker
+from app.services.org_service import OrgService
+
+
+def _create_and_login(client, organization_name, email):
+    client.post(
+        "/org/create",
+        json={
+            "organization_name": organization_name,
+            "email": email,
+            "password": "securepass123"
+        }
+    )
+    login_response = client.post(
+        "/admin/login",
+        json={"email": email, "password": "securepass123"}
+    )
+    return {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+
+def test_rename_runs_as_job(client, clean_db, monkeypatch):
+    """Test that a rename returns 202 and completes on a worker."""
+    monkeypatch.setattr(settings, "jobs_async_enabled", True)
+    headers = _create_and_login(client, "OldOrg", "admin@oldorg.com")
+    
+    response = client.put(
+        "/org/update",
+        json={"organization_name": "OldOrg", "new_organization_name": "NewOrg"},
+        headers=headers
+    )
+    
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    job_id = response.json()["job_id"]
+    assert response.json()["status_url"] == f"/jobs/{job_id}"
+    
+    job_response = client.get(f"/jobs/{job_id}", headers=headers)
+    assert job_response.status_code == status.HTTP_200_OK
+    assert job_response.json()["status"] == "queued"
+    
+    assert asyncio.run(JobWorker().run_once()) is True
+    
+    job = client.get(f"/jobs/{job_id}", headers=headers).json()
+    assert job["status"] == "completed"
+    assert job["attempts"] == 1
+    assert job["result"]["organization_name"] == "NewOrg"
+    assert client.get("/org/get?organization_name=NewOrg").status_code == status.HTTP_200_OK
+
+
+def test_one_active_job_per_organization(client, clean_db, monkeypatch):
+    """Test that a second heavy operation is rejected while one is pending."""
+    monkeypatch.setattr(settings, "jobs_async_enabled", True)
+    asyncio.run(ensure_master_indexes())
+    headers = _create_and_login(client, "TestOrg", "admin@testorg.com")
+    
+    first = client.request(
+        "DELETE", "/org/delete", json={"organization_name": "TestOrg"}, headers=headers
+    )
+    second = client.request(
+        "DELETE", "/org/delete", json={"organization_name": "TestOrg"}, headers=headers
+    )
+    
+    assert first.status_code == status.HTTP_202_ACCEPTED
+    assert second.status_code == status.HTTP_409_CONFLICT
+    assert "already in progress" in second.json()["detail"]
+
+
+def test_job_hidden_from_other_admins(client, clean_db, monkeypatch):
+    """Test that an admin cannot read another admin's job."""
+    monkeypatch.setattr(settings, "jobs_async_enabled", True)
+    headers = _create_and_login(client, "OrgA", "admin@orga.com")
+    other_headers = _create_and_login(client, "OrgB", "admin@orgb.com")
+    
+    response = client.request(
+        "DELETE", "/org/delete", json={"organization_name": "OrgA"}, headers=headers
+    )
+    job_id = response.json()["job_id"]
+    
+    assert client.get(f"/jobs/{job_id}", headers=other_headers).status_code == status.HTTP_404_NOT_FOUND
+    assert client.get("/jobs/not-an-id", headers=headers).status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_expired_lease_is_reclaimed(clean_db):
+    """Test that a job whose worker stopped renewing its lease is claimed again."""
+    async def scenario():
+        job = await JobRepository.create_job("delete_organization", {}, "TestOrg", "admin")
+        first = await JobRepository.claim_job("worker-a", lease_seconds=-1)
+        second = await JobRepository.claim_job("worker-b", lease_seconds=60)
+        third = await JobRepository.claim_job("worker-c", lease_seconds=60)
+        stale_renewal = await JobRepository.renew_lease(job["_id"], "worker-a", 60)
+        return first, second, third, stale_renewal
+    
+    first, second, third, stale_renewal = asyncio.run(scenario())
+    assert first["worker_id"] == "worker-a"
+    assert second["_id"] == first["_id"]
+    assert second["attempts"] == 2
+    assert third is None
+    assert stale_renewal is False
+
+
+def test_no_workers_without_async_jobs(monkeypatch):
+    """Test that API processes do not poll for jobs unless async jobs are enabled."""
+    monkeypatch.setattr(settings, "jobs_async_enabled", False)
+    
+    async def scenario():
+        JobService.start_workers()
+        started = len(JobService._worker_tasks)
+        await JobService.stop_workers()
+        return started
+    
+    assert asyncio.run(scenario()) == 0
+
+
+def test_rename_job_replayed_after_partial_success(client, clean_db, monkeypatch):
+    """Test that a rename job whose work was already done completes on retry."""
+    monkeypatch.setattr(settings, "jobs_async_enabled", True)
+    headers = _create_and_login(client, "OldOrg", "admin@oldorg.com")
+    response = client.put(
+        "/org/update",
+        json={"organization_name": "OldOrg", "new_organization_name": "NewOrg"},
+        headers=headers
+    )
+    job_id = response.json()["job_id"]
+    
+    # An earlier attempt renamed the organization but died before finishing the job
+    asyncio.run(OrgService.update_organization("OldOrg", "NewOrg"))
+    assert asyncio.run(JobWorker().run_once()) is True
+    
+    job = client.get(f"/jobs/{job_id}", headers=headers).json()
+    assert job["status"] == "completed"
+    assert job["result"]["organization_name"] == "NewOrg"
+
+
+def test_delete_job_replayed_after_partial_success(client, clean_db, monkeypatch):
+    """Test that a delete job completes on retry after its tombstone was written."""
+    monkeypatch.setattr(settings, "jobs_async_enabled", True)
+    headers = _create_and_login(client, "TestOrg", "admin@testorg.com")
+    response = client.request(
+        "DELETE", "/org/delete", json={"organization_name": "TestOrg"}, headers=headers
+    )
+    job_id = response.json()["job_id"]
+    
+    # An earlier attempt wrote the tombstone but stopped before detaching
+    # the admin (no transaction) and before finishing the job
+    async def tombstone_only():
+        org = await MasterRepository.find_organization_by_name("TestOrg")
+        await MasterRepository.tombstone_organization(
+            org["_id"], org["organization_name"], org["collection_name"], datetime.utcnow()
+        )
+    
+    asyncio.run(tombstone_only())
+    assert asyncio.run(JobWorker().run_once()) is True
+    
+    job = client.get(f"/jobs/{job_id}", headers=headers).json()
+    assert job["status"] == "completed"
+    assert job["result"] == {"deleted": True}
+    login_response = client.post(
+        "/admin/login",
+        json={"email": "admin@testorg.com", "password": "securepass123"}
+    )
+    assert login_response.status_code == status.HTTP_401_UNAUTHORIZED
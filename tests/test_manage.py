@@ -0,0 +1,55 @@
+import pytest
+import asyncio
+from bson import json_util
+from pymongo.errors import AutoReconnect
+from app.repositories.master_repo import MasterRepository
+from scripts.manage import import_collection
+
+
+def _write_export(path, count):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            f.write(json_util.dumps({"_id": f"org{i}", "organization_name": f"Org{i}"}) + "\n")
+
+
+def test_import_collection(clean_db, tmp_path):
+    """Test that an export file is loaded in batches."""
+    path = str(tmp_path / "organizations.ndjson")
+    _write_export(path, 5)
+    
+    asyncio.run(import_collection("organizations", path, batch_size=2, concurrency=2))
+    
+    async def count():
+        collection = await MasterRepository.get_organizations_collection()
+        return await collection.count_documents({})
+    
+    assert asyncio.run(count()) == 5
+
+
+def test_import_collection_fails_on_batch_error(clean_db, tmp_path, monkeypatch, capsys):
+    """Test that a batch failing with an error other than BulkWriteError fails the import."""
+    path = str(tmp_path / "organizations.ndjson")
+    _write_export(path, 5)
+    
+    async def collection_type():
+        return type(await MasterRepository.get_organizations_collection())
+    
+    collection_class = asyncio.run(collection_type())
+    bulk_write = collection_class.bulk_write
+    calls = {"count": 0}
+    
+    async def flaky_bulk_write(self, operations, **kwargs):
+        calls["count"] += 1
+        if calls["count"] == 2:
+            raise AutoReconnect("connection reset")
+        return await bulk_write(self, operations, **kwargs)
+    
+    monkeypatch.setattr(collection_class, "bulk_write", flaky_bulk_write)
+    
+    with pytest.raises(SystemExit) as exc_info:
+        asyncio.run(import_collection("organizations", path, batch_size=2, concurrency=2))
+    
+    assert exc_info.value.code == 1
+    output = capsys.readouterr().out
+    assert "connection reset" in output
+    assert "errors 2" in output
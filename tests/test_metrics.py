@@ -0,0 +1,62 @@
+import pytest
+from types import SimpleNamespace
+from fastapi import status
+from app.db.monitoring import MetricsCommandListener, TENANT_COLLECTION_LABEL
+from app.utils.metrics import Histogram, mongodb_command_duration
+
+
+def test_metrics_endpoint_reports_route_templates(client):
+    """Test that request latency is labelled by route template, not raw path."""
+    client.post(
+        "/org/create",
+        json={
+            "organization_name": "metrics_org",
+            "email": "admin@metrics.com",
+            "password": "securepass123"
+        }
+    )
+    client.get("/no/such/path")
+    
+    response = client.get("/metrics")
+    
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'http_request_duration_seconds_bucket{method="POST",route="/org/create",status="201"' in body
+    assert 'route="unmatched",status="404"' in body
+    assert "/no/such/path" not in body
+    assert 'cache_hits_total{cache="organization"}' in body
+    assert 'admission_in_flight{controller="login"}' in body
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test the Prometheus rendering of a histogram."""
+    histogram = Histogram("test_seconds", "Test.", ("op",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "a")
+    histogram.observe(0.5, "a")
+    histogram.observe(5.0, "a")
+    
+    lines = list(histogram.samples())
+    
+    assert 'test_seconds_bucket{op="a",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{op="a",le="1"} 2' in lines
+    assert 'test_seconds_bucket{op="a",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{op="a"} 3' in lines
+
+
+def test_command_listener_groups_tenant_collections():
+    """Test that tenant collections share one label and master collections keep theirs."""
+    listener = MetricsCommandListener()
+    before_tenant = mongodb_command_duration.count("find", TENANT_COLLECTION_LABEL)
+    before_master = mongodb_command_duration.count("find", "organizations")
+    
+    for request_id, collection in enumerate(["org_t_1", "org_acme", "organizations"]):
+        listener.started(SimpleNamespace(
+            command_name="find", command={"find": collection}, request_id=request_id, connection_id=("h", 1)
+        ))
+        listener.succeeded(SimpleNamespace(
+            command_name="find", request_id=request_id, connection_id=("h", 1), duration_micros=1500
+        ))
+    
+    assert mongodb_command_duration.count("find", TENANT_COLLECTION_LABEL) == before_tenant + 2
+    assert mongodb_command_duration.count("find", "organizations") == before_master + 1
@@ -0,0 +1,277 @@
+import pytest
+import asyncio
+from pymongo.errors import OperationFailure
+from app.core.config import settings
+from app.db.mongo import get_org_database
+from app.repositories.migration_repo import MigrationRepository, TenantMigrator, copy_indexes
+from app.repositories.org_repo import OrgRepository
+
+
+class FakeChangeStream:
+    """Change stream whose events the test queues by hand."""
+    
+    def __init__(self, events=None):
+        self.events = list(events or [])
+        self.resume_token = {"_data": "0"}
+        self.closed = False
+    
+    def watch(self, **kwargs):
+        return self
+    
+    async def try_next(self):
+        if not self.events:
+            return None
+        event = self.events.pop(0)
+        self.resume_token = {"_data": str(int(self.resume_token["_data"]) + 1)}
+        return event
+    
+    async def close(self):
+        self.closed = True
+
+
+def _no_change_streams(*args, **kwargs):
+    raise OperationFailure("The $changeStream stage is only supported on replica sets", code=40573)
+
+
+async def _collections(count):
+    db = await get_org_database("")
+    await db.org_source.insert_many([{"_id": i, "value": i} for i in range(count)])
+    return db.org_source, db.org_target
+
+
+def test_migrator_resumes_from_checkpoint(clean_db):
+    """Test that an interrupted migration continues after its last checkpointed batch."""
+    async def migrate():
+        source, target = await _collections(25)
+        source.watch = _no_change_streams
+        
+        first = TenantMigrator(source, target, batch_size=10)
+        original_bulk_write = target.bulk_write
+        calls = {"count": 0}
+        
+        async def failing_bulk_write(operations, **kwargs):
+            calls["count"] += 1
+            if calls["count"] == 2:
+                raise RuntimeError("connection lost")
+            return await original_bulk_write(operations, **kwargs)
+        
+        target.bulk_write = failing_bulk_write
+        with pytest.raises(RuntimeError):
+            await first.run()
+        interrupted = await MigrationRepository.get_checkpoint(first.migration_id)
+        
+        target.bulk_write = original_bulk_write
+        second = TenantMigrator(source, target, batch_size=10)
+        return interrupted, await second.run(), await target.count_documents({})
+    
+    interrupted, completed, target_count = asyncio.run(migrate())
+    assert interrupted["status"] == "failed"
+    assert interrupted["copied"] == 10
+    assert interrupted["last_id"] == 9
+    assert completed["status"] == "completed"
+    assert completed["copied"] == 25
+    assert target_count == 25
+
+
+def test_migrator_replays_changes(clean_db):
+    """Test that inserts, updates and deletes made during a migration reach the target."""
+    async def migrate():
+        source, target = await _collections(5)
+        # An insert that landed after the stream opened, before the copy
+        await source.insert_one({"_id": 5, "value": 5})
+        stream = FakeChangeStream([
+            {"operationType": "insert", "documentKey": {"_id": 5}, "fullDocument": {"_id": 5, "value": 5}}
+        ])
+        source.watch = stream.watch
+        
+        async def cutover():
+            # Writes that reached the source before writers were switched
+            await source.insert_one({"_id": 6, "value": 6})
+            await source.update_one({"_id": 1}, {"$set": {"value": 100}})
+            await source.delete_one({"_id": 2})
+            stream.events.extend([
+                {"operationType": "insert", "documentKey": {"_id": 6}, "fullDocument": {"_id": 6, "value": 6}},
+                {"operationType": "update", "documentKey": {"_id": 1}, "fullDocument": {"_id": 1, "value": 100}},
+                {"operationType": "delete", "documentKey": {"_id": 2}}
+            ])
+        
+        checkpoint = await TenantMigrator(source, target, batch_size=2).run(cutover=cutover)
+        documents = await target.find({}).sort("_id", 1).to_list(None)
+        return checkpoint, documents, stream
+    
+    checkpoint, documents, stream = asyncio.run(migrate())
+    assert checkpoint["status"] == "completed"
+    assert checkpoint["replayed"] == 4
+    assert documents == [
+        {"_id": 0, "value": 0},
+        {"_id": 1, "value": 100},
+        {"_id": 3, "value": 3},
+        {"_id": 4, "value": 4},
+        {"_id": 5, "value": 5},
+        {"_id": 6, "value": 6}
+    ]
+    assert stream.closed
+
+
+def test_migrator_fails_when_source_dropped(clean_db):
+    """Test that a migration stops if its source collection is dropped."""
+    async def migrate():
+        source, target = await _collections(3)
+        source.watch = FakeChangeStream([{"operationType": "drop"}]).watch
+        migrator = TenantMigrator(source, target)
+        with pytest.raises(RuntimeError):
+            await migrator.run()
+        return await MigrationRepository.get_checkpoint(migrator.migration_id)
+    
+    assert asyncio.run(migrate())["status"] == "failed"
+
+
+def test_copy_indexes(clean_db):
+    """Test that secondary indexes are recreated on the target with their options."""
+    async def copy():
+        source, target = await _collections(1)
+        await source.create_index("value", name="value_unique", unique=True)
+        await target.insert_one({"_id": 0, "value": 0})
+        await copy_indexes(source, target)
+        return await target.index_information()
+    
+    indexes = asyncio.run(copy())
+    assert set(indexes) == {"_id_", "value_unique"}
+    assert list(indexes["value_unique"]["key"]) == [("value", 1)]
+    assert indexes["value_unique"]["unique"] is True
+
+
+def _patch_watch(monkeypatch, collection, watch):
+    """Replace watch() on the driver's collection class (sources are created inside the repository)."""
+    monkeypatch.setattr(type(collection), "watch", watch, raising=False)
+
+
+def test_rename_collection(clean_db):
+    """Test that renameCollection moves documents and indexes."""
+    async def rename():
+        source, _ = await _collections(3)
+        await source.create_index("value", name="value_1")
+        renamed = await OrgRepository.rename_collection("org_source", "org_target")
+        db = await get_org_database("")
+        names = await db.list_collection_names()
+        return renamed, names, await db.org_target.index_information(), await db.org_target.count_documents({})
+    
+    renamed, names, indexes, count = asyncio.run(rename())
+    assert renamed is True
+    assert "org_source" not in names
+    assert "value_1" in indexes
+    assert count == 3
+
+
+def test_copy_collection_server_side(clean_db):
+    """Test that the $out copy duplicates the documents and leaves the source in place."""
+    async def copy():
+        source, target = await _collections(3)
+        copied = await OrgRepository.copy_collection_server_side("org_source", "org_target")
+        return copied, await source.count_documents({}), await target.find({}).sort("_id", 1).to_list(None)
+    
+    copied, source_count, documents = asyncio.run(copy())
+    assert copied is True
+    assert source_count == 3
+    assert documents == [{"_id": i, "value": i} for i in range(3)]
+
+
+def test_org_copy_indexes(clean_db):
+    """Test that OrgRepository.copy_indexes recreates secondary indexes by collection name."""
+    async def copy():
+        source, target = await _collections(1)
+        await source.create_index("value", name="value_1")
+        await target.insert_one({"_id": 0})
+        await OrgRepository.copy_indexes("org_source", "org_target")
+        return await target.index_information()
+    
+    assert "value_1" in asyncio.run(copy())
+
+
+def test_migrate_collection_renames_first(clean_db, monkeypatch):
+    """Test that a collection that can be renamed is not copied."""
+    cutovers = []
+    
+    async def copy_collection(*args, **kwargs):
+        raise AssertionError("copy_collection should not run")
+    
+    async def cutover():
+        cutovers.append("cutover")
+    
+    monkeypatch.setattr(OrgRepository, "copy_collection", copy_collection)
+    
+    async def migrate():
+        await _collections(3)
+        migrated = await OrgRepository.migrate_collection("org_source", "org_target", cutover=cutover)
+        return migrated, await OrgRepository.get_collection_document_count("org_target")
+    
+    assert asyncio.run(migrate()) == (True, 3)
+    assert cutovers == ["cutover"]
+
+
+def test_migrate_collection_falls_back_to_snapshot(clean_db, monkeypatch):
+    """Test that without renameCollection the $out snapshot is used and writes made during it are replayed."""
+    stream = FakeChangeStream()
+    cutovers = []
+    copy_collection_server_side = OrgRepository.copy_collection_server_side
+    
+    async def unavailable(*args, **kwargs):
+        return False
+    
+    async def snapshot_with_concurrent_write(old_collection_name, new_collection_name):
+        copied = await copy_collection_server_side(old_collection_name, new_collection_name)
+        db = await get_org_database(old_collection_name)
+        await db[old_collection_name].insert_one({"_id": 3, "value": 3})
+        stream.events.append(
+            {"operationType": "insert", "documentKey": {"_id": 3}, "fullDocument": {"_id": 3, "value": 3}}
+        )
+        return copied
+    
+    async def cutover():
+        cutovers.append("cutover")
+    
+    monkeypatch.setattr(OrgRepository, "rename_collection", unavailable)
+    monkeypatch.setattr(OrgRepository, "copy_collection_server_side", snapshot_with_concurrent_write)
+    
+    async def migrate():
+        source, target = await _collections(3)
+        await source.create_index("value", name="value_1")
+        _patch_watch(monkeypatch, source, stream.watch)
+        migrated = await OrgRepository.migrate_collection("org_source", "org_target", cutover=cutover)
+        return migrated, await target.count_documents({}), await target.index_information()
+    
+    migrated, count, indexes = asyncio.run(migrate())
+    assert migrated is True
+    assert count == 4
+    assert "value_1" in indexes
+    assert cutovers == ["cutover"]
+
+
+def test_migrate_collection_falls_back_to_batches(clean_db, monkeypatch):
+    """Test that without renameCollection or $out the documents are copied in batches."""
+    cutovers = []
+    
+    async def unavailable(*args, **kwargs):
+        return False
+    
+    async def cutover():
+        cutovers.append("cutover")
+    
+    monkeypatch.setattr(OrgRepository, "rename_collection", unavailable)
+    monkeypatch.setattr(OrgRepository, "copy_collection_server_side", unavailable)
+    monkeypatch.setattr(settings, "migration_batch_size", 2)
+    
+    async def migrate():
+        source, target = await _collections(5)
+        _patch_watch(monkeypatch, source, _no_change_streams)
+        migrated = await OrgRepository.migrate_collection("org_source", "org_target", cutover=cutover)
+        migrator = TenantMigrator(source, target)
+        checkpoint = await MigrationRepository.get_checkpoint(migrator.migration_id)
+        return migrated, await target.count_documents({}), checkpoint
+    
+    migrated, count, checkpoint = asyncio.run(migrate())
+    assert migrated is True
+    assert count == 5
+    assert checkpoint["status"] == "completed"
+    assert checkpoint["last_id"] == 4
+    assert cutovers == ["cutover"]
@@ -0,0 +1,70 @@
+import pytest
+import asyncio
+from pymongo import AsyncMongoClient
+from app.core.config import settings
+from app.db import mongo
+from app.db.mongo import close_mongo_connection, get_mongo_client, start_transaction
+from app.repositories.master_repo import MasterRepository
+from app.repositories.org_repo import OrgRepository
+
+
+@pytest.fixture
+def pymongo_driver(monkeypatch):
+    """Use PyMongo's native asyncio client; each test closes it on its own event loop."""
+    asyncio.run(close_mongo_connection())
+    monkeypatch.setattr(settings, "mongodb_driver", "pymongo")
+    yield
+
+
+def test_pymongo_client_close(clean_db, pymongo_driver):
+    """Test that the native client is created and its coroutine close() is awaited."""
+    async def run():
+        client = await get_mongo_client()
+        assert isinstance(client, AsyncMongoClient)
+        await close_mongo_connection()
+        return mongo._client
+    
+    assert asyncio.run(run()) is None
+
+
+def test_pymongo_start_transaction(clean_db, pymongo_driver, monkeypatch):
+    """Test that start_transaction opens a session and transaction with the native client."""
+    async def supported():
+        return True
+    
+    monkeypatch.setattr(mongo, "transactions_supported", supported)
+    
+    async def run():
+        try:
+            async with start_transaction() as session:
+                return session is not None and session.in_transaction
+        finally:
+            await close_mongo_connection()
+    
+    assert asyncio.run(run()) is True
+
+
+def test_pymongo_repositories(clean_db, pymongo_driver):
+    """Test repository calls that resolve coroutine cursors (aggregate, list_indexes) with the native client."""
+    async def run():
+        try:
+            assert await OrgRepository.create_collection("org_driver")
+            db = await mongo.get_org_database("org_driver")
+            await db["org_driver"].insert_many([{"_id": i, "value": i} for i in range(3)])
+            await db["org_driver"].create_index("value", name="value_1")
+            
+            assert await OrgRepository.copy_collection_server_side("org_driver", "org_driver_copy")
+            await OrgRepository.copy_indexes("org_driver", "org_driver_copy")
+            copy_indexes = await db["org_driver_copy"].index_information()
+            stats = await OrgRepository.get_collection_stats("org_driver_copy")
+            collections = await OrgRepository.list_collections()
+            missing_org = await MasterRepository.find_organization_by_name("Missing")
+            return copy_indexes, stats, collections, missing_org
+        finally:
+            await close_mongo_connection()
+    
+    copy_indexes, stats, collections, missing_org = asyncio.run(run())
+    assert "value_1" in copy_indexes
+    assert stats["documents"] == 3
+    assert {"org_driver", "org_driver_copy"} <= set(collections)
+    assert missing_org is None
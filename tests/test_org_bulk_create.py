@@ -0,0 +1,64 @@
+import pytest
+from fastapi import status
+
+
+def test_bulk_create_success(client, clean_db):
+    """Test creating several organizations in one request."""
+    response = client.post(
+        "/org/bulk-create",
+        json={
+            "organizations": [
+                {"organization_name": f"BulkOrg{i}", "email": f"admin{i}@bulk.com", "password": "securepass123"}
+                for i in range(3)
+            ]
+        }
+    )
+    
+    assert response.status_code == status.HTTP_201_CREATED
+    data = response.json()
+    assert data["created"] == 3
+    assert data["failed"] == 0
+    assert [r["organization"]["organization_name"] for r in data["results"]] == ["BulkOrg0", "BulkOrg1", "BulkOrg2"]
+    
+    get_response = client.get("/org/get?organization_name=BulkOrg1")
+    assert get_response.status_code == status.HTTP_200_OK
+    
+    login_response = client.post(
+        "/admin/login",
+        json={"email": "admin2@bulk.com", "password": "securepass123"}
+    )
+    assert login_response.status_code == status.HTTP_200_OK
+
+
+def test_bulk_create_partial_failure(client, clean_db):
+    """Test per-item failures for existing and in-batch duplicates."""
+    client.post(
+        "/org/create",
+        json={
+            "organization_name": "Existing",
+            "email": "admin@existing.com",
+            "password": "securepass123"
+        }
+    )
+    
+    response = client.post(
+        "/org/bulk-create",
+        json={
+            "organizations": [
+                {"organization_name": "existing", "email": "a@new.com", "password": "securepass123"},
+                {"organization_name": "Fresh", "email": "b@new.com", "password": "securepass123"},
+                {"organization_name": "FRESH", "email": "c@new.com", "password": "securepass123"},
+                {"organization_name": "Other", "email": "admin@existing.com", "password": "securepass123"}
+            ]
+        }
+    )
+    
+    assert response.status_code == status.HTTP_207_MULTI_STATUS
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == ["failed", "created", "failed", "failed"]
+    assert "already exists" in results[0]["error"]
+    assert "more than once" in results[2]["error"]
+    assert "already registered" in results[3]["error"]
+    
+    get_response = client.get("/org/get?organization_name=Other")
+    assert get_response.status_code == status.HTTP_404_NOT_FOUND
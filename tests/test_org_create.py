@@ -1,5 +1,9 @@
 import pytest
+import asyncio
 from fastapi import status
+from app.core.config import settings
+from app.repositories.pool_repo import CollectionPoolRepository
+from app.services.pool_service import CollectionPoolService
 
 
 def test_create_org_success(client, clean_db):
@@ -72,3 +76,41 @@ def test_create_org_case_insensitive_duplicate(client, clean_db):
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     assert "already exists" in response.json()["detail"].lower()
 
+
+
+def test_create_org_claims_pooled_collection(client, clean_db, monkeypatch):
+    """Test that organization creation claims a pre-created collection when the pool is enabled."""
+    monkeypatch.setattr(settings, "tenant_pool_size", 2)
+    assert asyncio.run(CollectionPoolService.refill()) == 2
+    
+    response = client.post(
+        "/org/create",
+        json={
+            "organization_name": "PooledOrg",
+            "email": "admin@pooledorg.com",
+            "password": "securepass123"
+        }
+    )
+    
+    assert response.status_code == status.HTTP_201_CREATED
+    collection_name = response.json()["organization"]["collection_name"]
+    assert collection_name.startswith("org_t_")
+    assert asyncio.run(CollectionPoolRepository.count()) == 1
+    assert asyncio.run(CollectionPoolService.refill()) == 1
+
+
+def test_create_org_pool_empty_falls_back(client, clean_db, monkeypatch):
+    """Test that organization creation creates the collection inline when the pool is empty."""
+    monkeypatch.setattr(settings, "tenant_pool_size", 2)
+    
+    response = client.post(
+        "/org/create",
+        json={
+            "organization_name": "InlineOrg",
+            "email": "admin@inlineorg.com",
+            "password": "securepass123"
+        }
+    )
+    
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["organization"]["collection_name"] == "org_inlineorg"
@@ -1,5 +1,12 @@
 import pytest
+import asyncio
 from fastapi import status
+from app.core.config import settings
+from app.repositories.master_repo import MasterRepository
+from app.repositories.org_repo import OrgRepository
+from app.services.org_service import OrgService
+from app.services.pool_service import CollectionPoolService
+from app.services.reclaim_service import ReclaimService
 
 
 def test_delete_org_unauthorized(client, clean_db):
@@ -101,3 +108,155 @@ def test_delete_org_wrong_admin(client, clean_db):
     
     assert response.status_code == status.HTTP_403_FORBIDDEN
 
+
+
+def _create_login_and_delete(client, organization_name, email):
+    client.post(
+        "/org/create",
+        json={
+            "organization_name": organization_name,
+            "email": email,
+            "password": "securepass123"
+        }
+    )
+    login_response = client.post(
+        "/admin/login",
+        json={"email": email, "password": "securepass123"}
+    )
+    token = login_response.json()["access_token"]
+    response = client.request(
+        "DELETE",
+        "/org/delete",
+        json={"organization_name": organization_name},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_delete_org_frees_name(client, clean_db):
+    """Test that a deleted organization's name can be reused before it is reclaimed."""
+    _create_login_and_delete(client, "TestOrg", "admin@testorg.com")
+    
+    tombstones = asyncio.run(MasterRepository.find_deleted_organizations("TestOrg"))
+    assert len(tombstones) == 1
+    assert tombstones[0]["collection_name"].startswith("org_trash_")
+    
+    response = client.post(
+        "/org/create",
+        json={
+            "organization_name": "TestOrg",
+            "email": "new-admin@testorg.com",
+            "password": "securepass123"
+        }
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["organization"]["collection_name"] == "org_testorg"
+
+
+def test_list_collections_skips_trash_and_pool(client, clean_db, monkeypatch):
+    """Test that deleted organizations' and pooled collections are not listed as live."""
+    client.post(
+        "/org/create",
+        json={
+            "organization_name": "KeptOrg",
+            "email": "admin@keptorg.com",
+            "password": "securepass123"
+        }
+    )
+    _create_login_and_delete(client, "TestOrg", "admin@testorg.com")
+    monkeypatch.setattr(settings, "tenant_pool_size", 1)
+    assert asyncio.run(CollectionPoolService.refill()) == 1
+    
+    assert asyncio.run(OrgRepository.list_collections()) == ["org_keptorg"]
+
+
+def test_deleted_org_admin_cannot_access_reused_name(client, clean_db):
+    """Test that the admin of a deleted organization cannot take over a new one with its name."""
+    client.post(
+        "/org/create",
+        json={
+            "organization_name": "TestOrg",
+            "email": "admin@testorg.com",
+            "password": "securepass123"
+        }
+    )
+    login_response = client.post(
+        "/admin/login",
+        json={"email": "admin@testorg.com", "password": "securepass123"}
+    )
+    old_token = login_response.json()["access_token"]
+    response = client.request(
+        "DELETE",
+        "/org/delete",
+        json={"organization_name": "TestOrg"},
+        headers={"Authorization": f"Bearer {old_token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    
+    response = client.post(
+        "/org/create",
+        json={
+            "organization_name": "TestOrg",
+            "email": "new-admin@testorg.com",
+            "password": "securepass123"
+        }
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    
+    login_response = client.post(
+        "/admin/login",
+        json={"email": "admin@testorg.com", "password": "securepass123"}
+    )
+    assert login_response.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    response = client.put(
+        "/org/update",
+        json={"organization_name": "TestOrg", "email": "attacker@example.com"},
+        headers={"Authorization": f"Bearer {old_token}"}
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    
+    response = client.request(
+        "DELETE",
+        "/org/delete",
+        json={"organization_name": "TestOrg"},
+        headers={"Authorization": f"Bearer {old_token}"}
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    
+    login_response = client.post(
+        "/admin/login",
+        json={"email": "new-admin@testorg.com", "password": "securepass123"}
+    )
+    assert login_response.status_code == status.HTTP_200_OK
+
+
+def test_undelete_org(client, clean_db, monkeypatch):
+    """Test restoring a deleted organization within the retention window."""
+    monkeypatch.setattr(settings, "org_delete_retention_seconds", 3600)
+    _create_login_and_delete(client, "TestOrg", "admin@testorg.com")
+    
+    assert asyncio.run(ReclaimService.reclaim()) == 0
+    restored = asyncio.run(OrgService.undelete_organization("TestOrg"))
+    
+    assert restored["collection_name"] == "org_testorg"
+    assert asyncio.run(OrgRepository.collection_exists("org_testorg"))
+    assert client.get("/org/get?organization_name=TestOrg").status_code == status.HTTP_200_OK
+    login_response = client.post(
+        "/admin/login",
+        json={"email": "admin@testorg.com", "password": "securepass123"}
+    )
+    assert login_response.status_code == status.HTTP_200_OK
+
+
+def test_reclaim_deleted_org(client, clean_db, monkeypatch):
+    """Test that the reclaimer drops the collection and purges the records."""
+    monkeypatch.setattr(settings, "org_reclaim_pause_seconds", 0)
+    _create_login_and_delete(client, "TestOrg", "admin@testorg.com")
+    collection_name = asyncio.run(MasterRepository.find_deleted_organizations("TestOrg"))[0]["collection_name"]
+    
+    assert asyncio.run(ReclaimService.reclaim()) == 1
+    
+    assert asyncio.run(MasterRepository.find_deleted_organizations("TestOrg")) == []
+    assert asyncio.run(MasterRepository.find_admin_by_email("admin@testorg.com")) is None
+    assert not asyncio.run(OrgRepository.collection_exists(collection_name))
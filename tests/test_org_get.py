@@ -31,3 +31,41 @@ def test_get_org_not_found(client, clean_db):
     assert response.status_code == status.HTTP_404_NOT_FOUND
     assert "not found" in response.json()["detail"].lower()
 
+
+
+def test_get_org_case_insensitive(client, clean_db):
+    """Test that organization lookup ignores case."""
+    client.post(
+        "/org/create",
+        json={
+            "organization_name": "TestOrg",
+            "email": "admin@testorg.com",
+            "password": "securepass123"
+        }
+    )
+    
+    response = client.get("/org/get?organization_name=TESTORG")
+    
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["organization"]["organization_name"] == "TestOrg"
+
+
+def test_get_org_name_is_not_a_pattern(client, clean_db):
+    """Test that regex metacharacters in names are matched literally."""
+    client.post(
+        "/org/create",
+        json={
+            "organization_name": "Test.Org",
+            "email": "admin@testorg.com",
+            "password": "securepass123"
+        }
+    )
+    
+    response = client.get("/org/get?organization_name=TestXOrg")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    
+    response = client.get("/org/get?organization_name=.*")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    
+    response = client.get("/org/get?organization_name=test.org")
+    assert response.status_code == status.HTTP_200_OK
@@ -0,0 +1,103 @@
+import json
+import pytest
+from fastapi import status
+from app.core.config import settings
+
+
+OPERATOR_TOKEN = "operator-secret"
+
+
+@pytest.fixture
+def operator_headers(monkeypatch):
+    monkeypatch.setattr(settings, "operator_token", OPERATOR_TOKEN)
+    return {"X-Operator-Token": OPERATOR_TOKEN}
+
+
+def _create_orgs(client, names):
+    for i, name in enumerate(names):
+        client.post(
+            "/org/create",
+            json={
+                "organization_name": name,
+                "email": f"admin{i}@test.com",
+                "password": "securepass123"
+            }
+        )
+
+
+def test_list_orgs_unauthorized(client, clean_db, operator_headers):
+    """Test listing organizations without authentication."""
+    response = client.get("/org/list")
+    
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_list_orgs_rejects_tenant_token(client, clean_db, operator_headers):
+    """Test that a tenant admin's token cannot list other tenants or their admins."""
+    _create_orgs(client, ["OrgA", "OrgB"])
+    login_response = client.post(
+        "/admin/login",
+        json={"email": "admin0@test.com", "password": "securepass123"}
+    )
+    tenant_headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    
+    response = client.get("/org/list?fields=admin", headers=tenant_headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert "admin1@test.com" not in response.text
+    
+    response = client.get(
+        "/org/list?fields=admin",
+        headers={**tenant_headers, "X-Operator-Token": "wrong"}
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert "admin1@test.com" not in response.text
+
+
+def test_list_orgs_disabled_without_operator_token(client, clean_db):
+    """Test that listing is disabled until an operator token is configured."""
+    response = client.get("/org/list", headers={"X-Operator-Token": ""})
+    
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_list_orgs_paginates(client, clean_db, operator_headers):
+    """Test keyset pagination walks every organization once, in name order."""
+    _create_orgs(client, ["Charlie", "alpha", "Bravo"])
+    headers = operator_headers
+    
+    first_page = client.get("/org/list?limit=2", headers=headers)
+    assert first_page.status_code == status.HTTP_200_OK
+    data = first_page.json()
+    assert [o["organization_name"] for o in data["organizations"]] == ["alpha", "Bravo"]
+    assert data["next_cursor"]
+    
+    second_page = client.get(f"/org/list?limit=2&cursor={data['next_cursor']}", headers=headers)
+    data = second_page.json()
+    assert [o["organization_name"] for o in data["organizations"]] == ["Charlie"]
+    assert "next_cursor" not in data
+
+
+def test_list_orgs_projection(client, clean_db, operator_headers):
+    """Test that fields limits the returned fields and rejects unknown ones."""
+    _create_orgs(client, ["TestOrg"])
+    headers = operator_headers
+    
+    response = client.get("/org/list?fields=organization_name", headers=headers)
+    assert response.json()["organizations"] == [{"organization_name": "TestOrg"}]
+    
+    response = client.get("/org/list?fields=password", headers=headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_list_orgs_ndjson(client, clean_db, operator_headers):
+    """Test NDJSON streaming mode."""
+    _create_orgs(client, ["OrgA", "OrgB", "OrgC"])
+    headers = operator_headers
+    
+    response = client.get("/org/list?format=ndjson&fields=organization_name,collection_name", headers=headers)
+    
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["organization_name"] for line in lines] == ["OrgA", "OrgB", "OrgC"]
+    assert all(line["collection_name"].startswith("org_") for line in lines)
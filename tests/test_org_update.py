@@ -1,5 +1,13 @@
 import pytest
+import asyncio
 from fastapi import status
+from pymongo.errors import OperationFailure
+from app.core.config import settings
+from app.db.mongo import get_org_database
+from app.repositories.master_repo import MasterRepository
+from app.repositories.migration_repo import TenantMigrator
+from app.repositories.org_repo import OrgRepository
+from app.services.org_service import OrgService
 
 
 def test_update_org_rename_success(client, clean_db):
@@ -51,6 +59,112 @@ def test_update_org_rename_success(client, clean_db):
     assert get_new_response.status_code == status.HTTP_200_OK
 
 
+def test_update_org_rename_batched_copy_cuts_over(client, clean_db, monkeypatch):
+    """Test that a rename copied in batches points the record at the new collection before dropping the old one."""
+    client.post(
+        "/org/create",
+        json={
+            "organization_name": "OldOrg",
+            "email": "admin@oldorg.com",
+            "password": "securepass123"
+        }
+    )
+    
+    async def unavailable(*args, **kwargs):
+        return False
+    
+    def no_change_streams(*args, **kwargs):
+        raise OperationFailure("The $changeStream stage is only supported on replica sets", code=40573)
+    
+    events = []
+    update_organization = MasterRepository.update_organization
+    drop_collection = OrgRepository.drop_collection
+    
+    async def record_update(organization_name, update_data, session=None):
+        events.append(("update", dict(update_data)))
+        return await update_organization(organization_name, update_data, session=session)
+    
+    async def record_drop(collection_name):
+        events.append(("drop", collection_name))
+        return await drop_collection(collection_name)
+    
+    monkeypatch.setattr(OrgRepository, "rename_collection", unavailable)
+    monkeypatch.setattr(OrgRepository, "copy_collection_server_side", unavailable)
+    monkeypatch.setattr(MasterRepository, "update_organization", record_update)
+    monkeypatch.setattr(OrgRepository, "drop_collection", record_drop)
+    
+    async def rename():
+        db = await get_org_database("org_oldorg")
+        monkeypatch.setattr(type(db["org_oldorg"]), "watch", no_change_streams, raising=False)
+        await db["org_oldorg"].insert_many([{"_id": i} for i in range(3)])
+        org = await OrgService.update_organization("OldOrg", "NewOrg")
+        return org, await db["org_neworg"].count_documents({})
+    
+    org, copied = asyncio.run(rename())
+    assert org["collection_name"] == "org_neworg"
+    assert copied == 3
+    assert not asyncio.run(OrgRepository.collection_exists("org_oldorg"))
+    assert events.index(("update", {"collection_name": "org_neworg"})) < events.index(("drop", "org_oldorg"))
+
+
+def test_update_org_rename_resumes_after_failed_cutover_replay(client, clean_db, monkeypatch):
+    """Test that a retried rename whose replay failed after the cutover resumes the copy instead of dropping the source."""
+    client.post(
+        "/org/create",
+        json={
+            "organization_name": "OldOrg",
+            "email": "admin@oldorg.com",
+            "password": "securepass123"
+        }
+    )
+    
+    async def unavailable(*args, **kwargs):
+        return False
+    
+    def no_change_streams(*args, **kwargs):
+        raise OperationFailure("The $changeStream stage is only supported on replica sets", code=40573)
+    
+    state = {"cut_over": False, "failed": False}
+    update_organization = MasterRepository.update_organization
+    replay_changes = TenantMigrator._replay_changes
+    
+    async def record_cutover(organization_name, update_data, session=None):
+        if list(update_data) == ["collection_name"]:
+            state["cut_over"] = True
+        return await update_organization(organization_name, update_data, session=session)
+    
+    async def failing_replay(self):
+        if state["cut_over"] and not state["failed"]:
+            state["failed"] = True
+            raise RuntimeError("connection lost")
+        await replay_changes(self)
+    
+    monkeypatch.setattr(OrgRepository, "rename_collection", unavailable)
+    monkeypatch.setattr(OrgRepository, "copy_collection_server_side", unavailable)
+    monkeypatch.setattr(MasterRepository, "update_organization", record_cutover)
+    monkeypatch.setattr(TenantMigrator, "_replay_changes", failing_replay)
+    
+    async def rename():
+        db = await get_org_database("org_oldorg")
+        monkeypatch.setattr(type(db["org_oldorg"]), "watch", no_change_streams, raising=False)
+        await db["org_oldorg"].insert_many([{"_id": i} for i in range(3)])
+        with pytest.raises(RuntimeError):
+            await OrgService.update_organization("OldOrg", "NewOrg")
+        source_kept = await OrgRepository.collection_exists("org_oldorg")
+        
+        # A write that reached the old collection and was never replayed
+        await db["org_oldorg"].insert_one({"_id": 3})
+        org = await OrgService.update_organization("OldOrg", "NewOrg")
+        return source_kept, org, await db["org_neworg"].count_documents({})
+    
+    source_kept, org, copied = asyncio.run(rename())
+    assert source_kept
+    assert org["collection_name"] == "org_neworg"
+    assert copied == 4
+    assert asyncio.run(OrgRepository.migration_completed("org_oldorg", "org_neworg"))
+    assert not asyncio.run(OrgRepository.collection_exists("org_oldorg"))
+
+
 def test_update_org_email(client, clean_db):
     """Test updating organization admin email."""
     # Create org
@@ -141,3 +255,65 @@ def test_update_org_password(client, clean_db):
     )
     assert new_login_response.status_code == status.HTTP_200_OK
 
+
+
+def test_update_org_rename_keeps_tenant_collection(client, clean_db, monkeypatch):
+    """Test that renaming an organization keyed by tenant ID only changes metadata."""
+    monkeypatch.setattr(settings, "tenant_collection_naming", "id")
+    create_response = client.post(
+        "/org/create",
+        json={
+            "organization_name": "OldOrg",
+            "email": "admin@oldorg.com",
+            "password": "securepass123"
+        }
+    )
+    assert create_response.status_code == status.HTTP_201_CREATED
+    collection_name = create_response.json()["organization"]["collection_name"]
+    assert collection_name.startswith("org_t_")
+    
+    login_response = client.post(
+        "/admin/login",
+        json={"email": "admin@oldorg.com", "password": "securepass123"}
+    )
+    token = login_response.json()["access_token"]
+    
+    update_response = client.put(
+        "/org/update",
+        json={"organization_name": "OldOrg", "new_organization_name": "NewOrg"},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    
+    assert update_response.status_code == status.HTTP_200_OK
+    assert update_response.json()["organization"]["organization_name"] == "NewOrg"
+    assert update_response.json()["organization"]["collection_name"] == collection_name
+    assert asyncio.run(OrgRepository.collection_exists(collection_name))
+
+
+def test_migrate_to_tenant_id(client, clean_db):
+    """Test moving a name-derived collection to an ID-keyed collection."""
+    client.post(
+        "/org/create",
+        json={
+            "organization_name": "TestOrg",
+            "email": "admin@testorg.com",
+            "password": "securepass123"
+        }
+    )
+    
+    async def migrate():
+        orgs = [org async for org in MasterRepository.iter_organizations_without_tenant_id()]
+        assert len(orgs) == 1
+        updated = await OrgService.migrate_to_tenant_id(orgs[0])
+        remaining = [org async for org in MasterRepository.iter_organizations_without_tenant_id()]
+        return updated, remaining
+    
+    updated, remaining = asyncio.run(migrate())
+    assert remaining == []
+    assert updated["collection_name"] == f"org_t_{updated['tenant_id']}"
+    assert "pending_tenant_id" not in updated
+    assert asyncio.run(OrgRepository.collection_exists(updated["collection_name"]))
+    assert not asyncio.run(OrgRepository.collection_exists("org_testorg"))
+    
+    response = client.get("/org/get?organization_name=TestOrg")
+    assert response.json()["organization"]["collection_name"] == updated["collection_name"]
@@ -0,0 +1,75 @@
+import os
+import tracemalloc
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.main import create_app
+from app.utils.profiling import list_profiles, load_stacks, summarize_stacks
+
+
+@pytest.fixture(scope="function")
+def profiled_client(monkeypatch, tmp_path):
+    """Client for an app that profiles requests carrying the profiling token."""
+    monkeypatch.setattr(settings, "profiling_enabled", True)
+    monkeypatch.setattr(settings, "profiling_token", "profile-secret")
+    monkeypatch.setattr(settings, "profiling_interval_ms", 1.0)
+    monkeypatch.setattr(settings, "profiling_output_dir", str(tmp_path))
+    return TestClient(create_app())
+
+
+def test_profile_written_for_token_header(profiled_client, clean_db, tmp_path):
+    """Test that a request with the token is profiled and the profile can be read back."""
+    response = profiled_client.post(
+        "/org/create",
+        json={
+            "organization_name": "profiled_org",
+            "email": "admin@profiled.com",
+            "password": "securepass123"
+        },
+        headers={"X-Profile-Token": "profile-secret"}
+    )
+    
+    assert response.status_code == status.HTTP_201_CREATED
+    profile_id = response.headers["x-profile-id"]
+    profiles = list_profiles(str(tmp_path))
+    assert [profile["id"] for profile in profiles] == [profile_id]
+    assert profiles[0]["route"] == "/org/create"
+    assert profiles[0]["status"] == status.HTTP_201_CREATED
+    assert profiles[0]["trigger"] == "header"
+    
+    stacks = load_stacks(str(tmp_path), profile_id)
+    assert sum(stacks.values()) == profiles[0]["samples"]
+    summary = summarize_stacks(stacks)
+    assert sum(count for _, count in summary["self"]) <= profiles[0]["samples"]
+
+
+def test_profile_records_allocations(profiled_client, tmp_path, monkeypatch):
+    """Test that tracemalloc results are written and tracing is switched off afterwards."""
+    monkeypatch.setattr(settings, "profiling_tracemalloc", True)
+    client = TestClient(create_app())
+    
+    response = client.get("/health/live", headers={"X-Profile-Token": "profile-secret"})
+    
+    assert "x-profile-id" in response.headers
+    assert list_profiles(str(tmp_path))[0]["allocations"]
+    assert not tracemalloc.is_tracing()
+
+
+def test_requests_without_token_are_not_profiled(profiled_client, tmp_path):
+    """Test that a missing or wrong token does not trigger profiling."""
+    response = profiled_client.get("/health/live")
+    assert "x-profile-id" not in response.headers
+    
+    response = profiled_client.get("/health/live", headers={"X-Profile-Token": "wrong"})
+    assert "x-profile-id" not in response.headers
+    assert os.listdir(tmp_path) == []
+
+
+def test_summarize_stacks_counts_self_and_total():
+    """Test self and inclusive sample counts from collapsed stacks."""
+    summary = summarize_stacks({"main;handler;query": 3, "main;handler": 1, "main;hash": 2})
+    
+    assert dict(summary["self"]) == {"query": 3, "handler": 1, "hash": 2}
+    assert dict(summary["total"])["main"] == 6
+    assert dict(summary["total"])["handler"] == 4
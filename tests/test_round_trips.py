@@ -0,0 +1,118 @@
+import pytest
+import asyncio
+from typing import List
+from fastapi import status
+from pymongo.monitoring import CommandListener
+from app.core.config import settings
+from app.db.mongo import (
+    close_mongo_connection, register_event_listener, unregister_event_listener,
+    transactions_supported
+)
+
+# Connection handshakes and session cleanup are not per-operation round trips
+_IGNORED_COMMANDS = {"hello", "isMaster", "ismaster", "endSessions"}
+
+
+class CommandCounter(CommandListener):
+    """Records the name of every command sent to the server."""
+    
+    def __init__(self):
+        self.commands: List[str] = []
+    
+    def started(self, event):
+        if event.command_name not in _IGNORED_COMMANDS:
+            self.commands.append(event.command_name)
+    
+    def succeeded(self, event):
+        pass
+    
+    def failed(self, event):
+        pass
+
+
+@pytest.fixture(scope="function")
+def commands():
+    """Count commands on a fresh client that has the listener attached."""
+    counter = CommandCounter()
+    register_event_listener(counter)
+    asyncio.run(close_mongo_connection())
+    yield counter
+    unregister_event_listener(counter)
+    asyncio.run(close_mongo_connection())
+
+
+def _commit():
+    """The extra round trip a transaction adds, if the deployment supports them."""
+    return ["commitTransaction"] if asyncio.run(transactions_supported()) else []
+
+
+def _create_and_login(client, organization_name, email):
+    client.post(
+        "/org/create",
+        json={
+            "organization_name": organization_name,
+            "email": email,
+            "password": "securepass123"
+        }
+    )
+    login_response = client.post(
+        "/admin/login",
+        json={"email": email, "password": "securepass123"}
+    )
+    return {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+
+def test_create_round_trips(client, clean_db, commands):
+    """Test that creating an organization takes a fixed set of round trips."""
+    commit = _commit()
+    commands.commands.clear()
+    
+    response = client.post(
+        "/org/create",
+        json={
+            "organization_name": "TestOrg",
+            "email": "admin@testorg.com",
+            "password": "securepass123"
+        }
+    )
+    
+    assert response.status_code == status.HTTP_201_CREATED
+    assert commands.commands == ["find", "listCollections", "insert", "insert"] + commit + ["create"]
+
+
+def test_rename_round_trips(client, clean_db, commands, monkeypatch):
+    """Test that a metadata-only rename takes a fixed set of round trips."""
+    monkeypatch.setattr(settings, "tenant_collection_naming", "id")
+    commit = _commit()
+    headers = _create_and_login(client, "OldOrg", "admin@oldorg.com")
+    commands.commands.clear()
+    
+    response = client.put(
+        "/org/update",
+        json={
+            "organization_name": "OldOrg",
+            "new_organization_name": "NewOrg",
+            "email": "admin@neworg.com"
+        },
+        headers=headers
+    )
+    
+    assert response.status_code == status.HTTP_200_OK
+    assert commands.commands == ["find", "find", "findAndModify", "findAndModify"] + commit
+
+
+def test_delete_round_trips(client, clean_db, commands):
+    """Test that a soft delete takes a fixed set of round trips."""
+    commit = _commit()
+    headers = _create_and_login(client, "TestOrg", "admin@testorg.com")
+    commands.commands.clear()
+    
+    response = client.request(
+        "DELETE",
+        "/org/delete",
+        json={"organization_name": "TestOrg"},
+        headers=headers
+    )
+    
+    assert response.status_code == status.HTTP_200_OK
+    assert commands.commands == ["find", "renameCollection", "findAndModify", "update"] + commit
@@ -0,0 +1,53 @@
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.main import create_app
+from app.utils.timing import format_server_timing
+
+
+@pytest.fixture(scope="function")
+def timing_client(monkeypatch):
+    """Client for an app with the Server-Timing middleware installed."""
+    monkeypatch.setattr(settings, "server_timing_enabled", True)
+    return TestClient(create_app())
+
+
+def test_server_timing_reports_phases(timing_client, clean_db):
+    """Test that service, repository and bcrypt phases appear in Server-Timing."""
+    response = timing_client.post(
+        "/org/create",
+        json={
+            "organization_name": "timing_org",
+            "email": "admin@timing.com",
+            "password": "securepass123"
+        }
+    )
+    
+    assert response.status_code == status.HTTP_201_CREATED
+    header = response.headers["server-timing"]
+    assert header.startswith("total;dur=")
+    assert "OrgService.create_organization;dur=" in header
+    assert "MasterRepository.create_organization;dur=" in header
+    assert "hash_password;dur=" in header
+    
+    response = timing_client.post(
+        "/admin/login",
+        json={"email": "admin@timing.com", "password": "securepass123"}
+    )
+    
+    assert "verify_password;dur=" in response.headers["server-timing"]
+
+
+def test_server_timing_disabled_by_default(client):
+    """Test that no Server-Timing header is sent unless enabled."""
+    response = client.get("/health/live")
+    
+    assert "server-timing" not in response.headers
+
+
+def test_format_server_timing_counts_repeated_calls():
+    """Test that repeated phases are summed and annotated with the call count."""
+    header = format_server_timing({"a": [0.002, 1], "b": [0.005, 3]}, 0.01)
+    
+    assert header == 'total;dur=10.0, b;dur=5.0;desc="3 calls", a;dur=2.0'
@@ -0,0 +1,79 @@
+import re
+import json
+import asyncio
+from types import SimpleNamespace
+from app.core.config import settings
+from app.db.monitoring import explain_command, query_shape, redact, slow_query_listener
+from app.services.slow_query_service import SlowQueryService
+from app.utils import timing
+from app.utils.timing import timed
+
+
+def _run_command(command_name, command, duration_micros, request_id=1):
+    """Feed a started/succeeded event pair to the slow-query listener."""
+    slow_query_listener.started(SimpleNamespace(
+        command_name=command_name, command=command, request_id=request_id, connection_id=("h", 1)
+    ))
+    slow_query_listener.succeeded(SimpleNamespace(
+        command_name=command_name, database_name="org_master_test", request_id=request_id,
+        connection_id=("h", 1), duration_micros=duration_micros
+    ))
+
+
+def test_redact_keeps_field_names_and_operators():
+    """Test that values are redacted but the filter shape survives."""
+    shape = redact({
+        "organization_key": "acme",
+        "status": {"$in": ["queued", "running", "done"]},
+        "email": re.compile("^admin")
+    })
+    
+    assert shape == {
+        "organization_key": "?",
+        "status": {"$in": ["?"]},
+        "email": {"$regex": "?"}
+    }
+
+
+def test_query_shape_and_explain_command():
+    """Test that only query fields are kept, and sort is not redacted."""
+    command = {
+        "find": "organizations", "filter": {"organization_key": "acme"}, "sort": {"created_at": -1},
+        "limit": 1, "lsid": {"id": "x"}, "$db": "org_master_test"
+    }
+    
+    assert query_shape("find", command) == {"filter": {"organization_key": "?"}, "sort": {"created_at": -1}, "limit": "?"}
+    assert explain_command("find", command) == {
+        "find": "organizations", "filter": {"organization_key": "acme"}, "sort": {"created_at": -1}, "limit": 1
+    }
+    assert explain_command("aggregate", {"aggregate": "orgs", "pipeline": [{"$out": "copy"}]}) is None
+    assert explain_command("insert", {"insert": "orgs", "documents": []}) is None
+
+
+def test_slow_commands_written_to_jsonl(tmp_path, monkeypatch):
+    """Test that only commands over the threshold are logged, with the calling method."""
+    log_path = tmp_path / "slow.jsonl"
+    monkeypatch.setattr(settings, "slow_query_threshold_ms", 50.0)
+    monkeypatch.setattr(settings, "slow_query_log_path", str(log_path))
+    monkeypatch.setattr(settings, "slow_query_explain_enabled", False)
+    slow_query_listener.records.clear()
+    # Module-level switch; monkeypatch restores it after the test
+    monkeypatch.setattr(timing, "_track_operations", True)
+    
+    @timed("MasterRepository.find_organization_by_name")
+    def lookup():
+        _run_command("find", {"find": "organizations", "filter": {"organization_key": "acme"}}, 80000, 1)
+    
+    lookup()
+    _run_command("find", {"find": "organizations", "filter": {"organization_key": "fast"}}, 2000, 2)
+    _run_command("insert", {"insert": "slow_queries", "documents": []}, 90000, 3)
+    
+    assert asyncio.run(SlowQueryService.flush()) == 1
+    records = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert len(records) == 1
+    record = records[0]
+    assert record["operation"] == "MasterRepository.find_organization_by_name"
+    assert record["collection"] == "organizations"
+    assert record["duration_ms"] == 80.0
+    assert json.loads(record["shape"]) == {"filter": {"organization_key": "?"}}
+    assert "acme" not in log_path.read_text()
@@ -0,0 +1,85 @@
+import json
+import asyncio
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.main import create_app
+from app.utils.tracing import parse_traceparent, span_exporter
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+@pytest.fixture(scope="function")
+def traced_client(monkeypatch, tmp_path):
+    """Client for an app with tracing on, exporting to a temporary file."""
+    monkeypatch.setattr(settings, "tracing_enabled", True)
+    monkeypatch.setattr(settings, "tracing_sample_rate", 0.0)
+    monkeypatch.setattr(settings, "tracing_export_path", "")
+    client = TestClient(create_app())
+    # Discard spans left over from other tests
+    asyncio.run(span_exporter.flush())
+    span_exporter.path = str(tmp_path / "traces.jsonl")
+    return client
+
+
+def _exported_spans():
+    asyncio.run(span_exporter.flush())
+    spans = []
+    with open(span_exporter.path) as f:
+        for line in f:
+            for resource_spans in json.loads(line)["resourceSpans"]:
+                for scope_spans in resource_spans["scopeSpans"]:
+                    spans.extend(scope_spans["spans"])
+    return spans
+
+
+def test_parse_traceparent():
+    """Test W3C traceparent parsing."""
+    assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-01") == (TRACE_ID, PARENT_ID, True)
+    assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-00") == (TRACE_ID, PARENT_ID, False)
+    assert parse_traceparent(f"00-{'0' * 32}-{PARENT_ID}-01") is None
+    assert parse_traceparent(f"ff-{TRACE_ID}-{PARENT_ID}-01") is None
+    assert parse_traceparent("garbage") is None
+    assert parse_traceparent(None) is None
+
+
+def test_sampled_request_spans_route_service_and_repository(traced_client, clean_db):
+    """Test that a sampled traceparent yields one trace from route to repository."""
+    response = traced_client.post(
+        "/org/create",
+        json={
+            "organization_name": "traced_org",
+            "email": "admin@traced.com",
+            "password": "securepass123"
+        },
+        headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"}
+    )
+    
+    assert response.status_code == status.HTTP_201_CREATED
+    spans = {span["name"]: span for span in _exported_spans()}
+    server = spans["POST /org/create"]
+    route = spans["route create_organization"]
+    service = spans["OrgService.create_organization"]
+    assert server["parentSpanId"] == PARENT_ID
+    assert route["parentSpanId"] == server["spanId"]
+    assert service["parentSpanId"] == route["spanId"]
+    assert spans["MasterRepository.create_organization"]["parentSpanId"] == service["spanId"]
+    assert {span["traceId"] for span in spans.values()} == {TRACE_ID}
+
+
+def test_unsampled_request_records_nothing(traced_client, clean_db):
+    """Test that requests are not traced when neither the parent nor the sample rate selects them."""
+    traced_client.post(
+        "/org/create",
+        json={
+            "organization_name": "untraced_org",
+            "email": "admin@untraced.com",
+            "password": "securepass123"
+        },
+        headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-00"}
+    )
+    traced_client.get("/org/get", params={"organization_name": "untraced_org"})
+    
+    assert asyncio.run(span_exporter.flush()) == 0